@@ -1,21 +1,35 @@
 #!/usr/bin/env python3
-"""Interactive helper to add a new species from Source Data into ALIENS.json and Firestore."""
+"""Interactive helper to add a new species from Source Data into ALIENS.json and Firestore.
+
+Run with ``--batch`` to ingest whole directories or globs without prompting.
+"""
 from __future__ import annotations
 
+import argparse
+import glob
 import json
-import re
 import sys
 import urllib.error
 import urllib.request
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
 
 ROOT = Path(__file__).resolve().parent
 SOURCE_ROOT = ROOT / "Source Data"
 ALIENS_PATH = ROOT / "ALIENS.json"
 import os
 
+sys.path.insert(0, str(ROOT / "scripts"))
+from firestore_values import encode, encode_fields  # noqa: E402
+from holocron_wikitext import parse_wikitext  # noqa: E402
+import metrics  # noqa: E402
+from metrics import METRICS, count, reset_worker, timed  # noqa: E402
+from name_resolver import catalog_resolver  # noqa: E402
+from species_sections import first_line, split_sections  # noqa: E402
+from species_store import SpeciesStore, slugify  # noqa: E402
+
 FIREBASE_API_KEY = os.environ.get('FIRESTORE_API_KEY', '')
 PROJECT_ID = os.environ.get('FIREBASE_PROJECT_ID', 'star-wars-d6-species')
 
@@ -29,6 +43,14 @@ ATTRIBUTE_ALIAS = {
     "TECHNICAL": "technical",
 }
 
+BATCH_SUFFIXES = {".txt", ".json"}
+# Directory walks skip these: starship page dumps live under Source Data/d6holocron/starships.
+BATCH_SKIP_DIRS = {"starships"}
+DEFAULT_SOURCES = "Star Wars REUP Section 16"
+
+# Called as ask(species_name, field, message) whenever the source text lacks a value.
+AnswerFn = Callable[[str, str, str], str]
+
 
 @dataclass
 class SpeciesRecord:
@@ -71,17 +93,23 @@ def load_source_text(file_path: Path) -> str:
     """
     Load source text from either plaintext, JSON produced by fetch-holocron, or structured JSON.
     """
+    return load_source(file_path)[0]
+
+
+def load_source(file_path: Path) -> Tuple[str, Optional[str]]:
+    """Return the source text plus the page title when the file is a fetch-holocron dump."""
     raw = file_path.read_text(encoding="utf-8")
 
     if file_path.suffix.lower() == ".json":
         try:
             payload = json.loads(raw)
         except json.JSONDecodeError:
-            return raw
+            return raw, None
 
         if isinstance(payload, dict):
             if "wikitext" in payload and isinstance(payload["wikitext"], str):
-                return payload["wikitext"]
+                title = payload.get("title")
+                return payload["wikitext"], title if isinstance(title, str) else None
             if "species" in payload and isinstance(payload["species"], list):
                 # If structured import JSON is provided, fall back to first species description
                 first = payload["species"][0] if payload["species"] else {}
@@ -93,9 +121,9 @@ def load_source_text(file_path: Path) -> str:
                     "Structured import JSON detected. Use the import function instead of Add_New_Aliens.py."
                 )
 
-        return raw
+        return raw, None
 
-    return raw
+    return raw, None
 
 
 def normalize_text(text: str) -> str:
@@ -103,11 +131,8 @@ def normalize_text(text: str) -> str:
 
 
 def extract_block(text: str, label: str, followers: List[str]) -> str:
-    pattern = re.compile(rf"{label}:\s*(.*?)(?:\n(?:{'|'.join(map(re.escape, followers))}):|\Z)", re.S | re.I)
-    match = pattern.search(text)
-    if not match:
-        return ""
-    return match.group(1).strip()
+    """Return one labeled block; prefer ``split_sections`` when reading several labels."""
+    return split_sections(text, labels=(label, *followers), followers=followers).get(label, "")
 
 
 def parse_attributes(block: str) -> Dict[str, Dict[str, str]]:
@@ -158,30 +183,12 @@ def parse_special_abilities(block: str) -> List[Dict[str, str]]:
     return [ability for ability in abilities if ability["name"]]
 
 
-def slugify(value: str) -> str:
-    return re.sub(r"[^a-z0-9]+", "-", value.lower()).strip('-')
-
-
 def to_firestore_value(value):  # noqa: ANN001
-    if value is None:
-        return {"nullValue": None}
-    if isinstance(value, bool):
-        return {"booleanValue": value}
-    if isinstance(value, int):
-        return {"integerValue": str(value)}
-    if isinstance(value, float):
-        return {"doubleValue": value}
-    if isinstance(value, str):
-        return {"stringValue": value}
-    if isinstance(value, list):
-        return {"arrayValue": {"values": [to_firestore_value(item) for item in value]}}
-    if isinstance(value, dict):
-        return {"mapValue": {"fields": {k: to_firestore_value(v) for k, v in value.items()}}}
-    raise TypeError(f"Unsupported value type: {type(value)}")
+    return encode(value)
 
 
 def upload_to_firestore(slug: str, doc: Dict) -> None:
-    body = json.dumps({"fields": to_firestore_value(doc)["mapValue"]["fields"]}).encode()
+    body = json.dumps({"fields": encode_fields(doc)}).encode()
     url = (
         f"https://firestore.googleapis.com/v1/projects/{PROJECT_ID}/databases/(default)"
         f"/documents/species/{slug}?key={FIREBASE_API_KEY}"
@@ -196,45 +203,64 @@ def upload_to_firestore(slug: str, doc: Dict) -> None:
         raise SystemExit(f"Firestore error: {exc}")
 
 
-def parse_species(text: str) -> SpeciesRecord:
+def interactive_answer(species: str, field: str, message: str) -> str:  # noqa: ARG001
+    return input(message)
+
+
+class BatchAnswers:
+    """Answer parse_species prompts from a rules file instead of stdin.
+
+    The rules file is JSON of the form
+    ``{"defaults": {field: value}, "species": {name: {field: value}}}``;
+    per-species entries win over defaults and anything unanswered falls back to
+    the parser's own default.
+    """
+
+    def __init__(self, rules: Optional[Dict] = None) -> None:
+        rules = rules or {}
+        self.defaults: Dict[str, str] = dict(rules.get("defaults") or {})
+        self.species: Dict[str, Dict[str, str]] = {
+            name.casefold(): dict(values) for name, values in (rules.get("species") or {}).items()
+        }
+
+    @classmethod
+    def from_file(cls, path: Optional[Path]) -> "BatchAnswers":
+        if path is None:
+            return cls()
+        return cls(json.loads(path.read_text(encoding="utf-8")))
+
+    def __call__(self, species: str, field: str, message: str) -> str:  # noqa: ARG002
+        value = self.species.get(species.casefold(), {}).get(field)
+        if value is None:
+            value = self.defaults.get(field, "")
+        if isinstance(value, list):
+            value = ", ".join(value)
+        return str(value)
+
+
+@timed()
+def parse_species(text: str, ask: AnswerFn = interactive_answer, name: Optional[str] = None) -> SpeciesRecord:
     lines = [line.strip() for line in text.splitlines() if line.strip()]
-    name = lines[0]
-
-    followers = [
-        "Personality",
-        "Physical Description",
-        "Homeworld",
-        "Languages",
-        "Example Names",
-        "Adventurers",
-        "Attribute Dice",
-        "Special Abilities",
-        "Story Factors",
-        "Move",
-        "Size",
-    ]
+    name = name or lines[0]
+
+    sections = split_sections(text)
 
     # Description is the body preceding the Personality section
     description_section = text.split("Personality:", 1)[0]
     description = '\n'.join([line for line in description_section.splitlines()[1:] if line.strip()])
-    personality = extract_block(text, "Personality", followers)
-    physical_description = extract_block(text, "Physical Description", followers)
-    homeworld_block = extract_block(text, "Home Planet", followers) or extract_block(text, "Homeworld", followers)
-    homeworld = ""
-    if homeworld_block:
-        homeworld = homeworld_block.splitlines()[0]
+    personality = sections.get("Personality", "")
+    physical_description = sections.get("Physical Description", "")
+    homeworld = first_line(sections.get("Home Planet") or sections.get("Homeworld", ""))
     if not homeworld:
-        homeworld = input("Homeworld not found in source. Please enter homeworld: ")
-    languages_block = extract_block(text, "Languages", followers)
-    example_block = extract_block(text, "Example Names", followers)
-    adventurers = extract_block(text, "Adventurers", followers)
-    attribute_block = extract_block(text, "Attribute Dice", followers)
-    ability_block = extract_block(text, "Special Abilities", followers)
-    story_block = extract_block(text, "Story Factors", followers)
-    move_block = extract_block(text, "Move", followers)
-    size_block = extract_block(text, "Size", followers)
-    move = move_block.splitlines()[0] if move_block else input("Move value (e.g., '10/12'): ")
-    size = size_block.splitlines()[0] if size_block else input("Size value (e.g., '1.6-1.8 meters'): ")
+        homeworld = ask(name, "homeworld", "Homeworld not found in source. Please enter homeworld: ")
+    languages_block = sections.get("Languages", "")
+    example_block = sections.get("Example Names", "")
+    adventurers = sections.get("Adventurers", "")
+    attribute_block = sections.get("Attribute Dice", "")
+    ability_block = sections.get("Special Abilities", "")
+    story_block = sections.get("Story Factors", "")
+    move = first_line(sections.get("Move", "")) or ask(name, "move", "Move value (e.g., '10/12'): ")
+    size = first_line(sections.get("Size", "")) or ask(name, "size", "Size value (e.g., '1.6-1.8 meters'): ")
 
     attribute_lines = attribute_block.splitlines()
     attribute_dice = attribute_lines[0].split(":")[-1].strip() if attribute_lines else ""
@@ -245,25 +271,26 @@ def parse_species(text: str) -> SpeciesRecord:
     story_factors: List[Dict[str, str]] = []
     for entry in story_factors_raw:
         if ':' in entry:
-            name, desc = entry.split(':', 1)
+            factor_name, desc = entry.split(':', 1)
         else:
             parts = entry.split(maxsplit=1)
-            name, desc = (parts[0], parts[1] if len(parts) > 1 else entry)
-        story_factors.append({"name": name.strip(), "description": desc.strip()})
+            factor_name, desc = (parts[0], parts[1] if len(parts) > 1 else entry)
+        story_factors.append({"name": factor_name.strip(), "description": desc.strip()})
 
-    example_names = [name.strip().strip("'") for name in example_block.replace(';', ',').split(',') if name.strip()]
+    example_names = [example.strip().strip("'") for example in example_block.replace(';', ',').split(',') if example.strip()]
 
-    languages_native = input("Native language (default from text if present): ") or (languages_block.split()[0] if languages_block else '')
-    languages_desc = languages_block or input("Languages description: ")
+    languages_native = ask(name, "languagesNative", "Native language (default from text if present): ") or (languages_block.split()[0] if languages_block else '')
+    languages_desc = languages_block or ask(name, "languagesDescription", "Languages description: ")
     if not languages_native:
-        languages_native = input("Please provide the native language: ")
+        languages_native = ask(name, "languagesNative", "Please provide the native language: ")
 
     if not attribute_dice:
-        attribute_dice = input("Attribute Dice (e.g., '12D'): ")
+        attribute_dice = ask(name, "attributeDice", "Attribute Dice (e.g., '12D'): ")
 
+    count("records_parsed")
     return SpeciesRecord(
         name=name,
-        plural=input(f"Plural form (default '{name}s'): ") or f"{name}s",
+        plural=ask(name, "plural", f"Plural form (default '{name}s'): ") or f"{name}s",
         description=description.strip(),
         personality=personality.strip(),
         physical_description=physical_description.strip(),
@@ -278,7 +305,46 @@ def parse_species(text: str) -> SpeciesRecord:
         attributes=attributes,
         special_abilities=special_abilities,
         story_factors=story_factors,
-        sources=[source.strip() for source in (input("Sources (comma separated, default 'Star Wars REUP Section 16'): ") or "Star Wars REUP Section 16").split(',') if source.strip()],
+        sources=[source.strip() for source in (ask(name, "sources", f"Sources (comma separated, default '{DEFAULT_SOURCES}'): ") or DEFAULT_SOURCES).split(',') if source.strip()],
+    )
+
+
+@timed()
+def parse_wikitext_species(wikitext: str, title: str, ask: AnswerFn = interactive_answer) -> SpeciesRecord:
+    """Parse a fetch-holocron dump with the wikitext parser, prompting only for what it could not find."""
+    parsed = parse_wikitext(wikitext, title)
+    name = parsed["name"]
+    stats = parsed["stats"]
+    languages = parsed["languages"]
+    homeworld = parsed["homeworld"] or ask(name, "homeworld", "Homeworld not found in source. Please enter homeworld: ")
+    move = stats["move"] or ask(name, "move", "Move value (e.g., '10/12'): ")
+    size = stats["size"] or ask(name, "size", "Size value (e.g., '1.6-1.8 meters'): ")
+    attribute_dice = stats["attributeDice"] or ask(name, "attributeDice", "Attribute Dice (e.g., '12D'): ")
+    languages_native = ask(name, "languagesNative", f"Native language (default '{languages['native']}'): ") or languages["native"]
+    if not languages_native:
+        languages_native = ask(name, "languagesNative", "Please provide the native language: ")
+    languages_desc = languages["description"] or ask(name, "languagesDescription", "Languages description: ")
+    default_sources = ", ".join(parsed["sources"]) or DEFAULT_SOURCES
+    sources = ask(name, "sources", f"Sources (comma separated, default '{default_sources}'): ")
+
+    return SpeciesRecord(
+        name=name,
+        plural=ask(name, "plural", f"Plural form (default '{parsed['plural']}'): ") or parsed["plural"],
+        description=parsed["description"],
+        personality=parsed["personality"],
+        physical_description=parsed["physicalDescription"],
+        homeworld=homeworld.strip(),
+        languages_native=languages_native.strip(),
+        languages_description=languages_desc.strip(),
+        example_names=parsed["exampleNames"],
+        adventurers=parsed["adventurers"],
+        move=move.strip(),
+        size=size.strip(),
+        attribute_dice=attribute_dice.strip(),
+        attributes=stats["attributes"],
+        special_abilities=parsed["specialAbilities"],
+        story_factors=parsed["storyFactors"],
+        sources=[source.strip() for source in sources.split(",") if source.strip()] if sources else parsed["sources"] or [DEFAULT_SOURCES],
     )
 
 
@@ -313,32 +379,143 @@ def species_to_dict(record: SpeciesRecord, new_id: int, slug: str) -> Dict:
     }
 
 
-def main() -> None:
-    source_file = prompt_file()
-    text = normalize_text(load_source_text(source_file))
-    record = parse_species(text)
+@dataclass
+class BatchResult:
+    path: Path
+    record: Optional[SpeciesRecord] = None
+    error: str = ""
+    metrics: Optional[dict] = None
+
+
+def collect_batch_files(targets: Iterable[str]) -> List[Path]:
+    """Expand directories and glob patterns (relative to cwd or 'Source Data') into source files."""
+    files: List[Path] = []
+    seen = set()
+    for target in targets:
+        matches = [Path(match).resolve() for match in glob.glob(target, recursive=True)]
+        if not matches:
+            matches = [Path(match) for match in glob.glob(str(SOURCE_ROOT / target), recursive=True)]
+        for match in sorted(matches):
+            if match.is_dir():
+                candidates = sorted(
+                    path for path in match.rglob("*") if not BATCH_SKIP_DIRS.intersection(path.relative_to(match).parts[:-1])
+                )
+            else:
+                candidates = [match]
+            for path in candidates:
+                if path.is_file() and path.suffix.lower() in BATCH_SUFFIXES and path not in seen:
+                    seen.add(path)
+                    files.append(path)
+    return files
+
 
-    data = json.loads(ALIENS_PATH.read_text(encoding="utf-8"))
-    races = data["races"] if isinstance(data, dict) else data
+def parse_source_file(path: Path, answers: BatchAnswers) -> BatchResult:
+    """Process-pool worker: parse one source file, capturing failures instead of raising."""
+    try:
+        raw_text, title = load_source(path)
+        text = normalize_text(raw_text)
+        if not text:
+            result = BatchResult(path, error="empty source file")
+        elif title is not None:
+            result = BatchResult(path, record=parse_wikitext_species(text, title, ask=answers))
+        else:
+            result = BatchResult(path, record=parse_species(text, ask=answers, name=title))
+    except SystemExit as exc:
+        result = BatchResult(path, error=str(exc))
+    except Exception as exc:  # noqa: BLE001
+        result = BatchResult(path, error=f"{type(exc).__name__}: {exc}")
+    result.metrics = METRICS.drain()
+    return result
+
+
+def run_batch(targets: List[str], rules_path: Optional[Path], workers: Optional[int], upload: bool, dry_run: bool) -> int:
+    files = collect_batch_files(targets)
+    if not files:
+        raise SystemExit(f"No {'/'.join(sorted(BATCH_SUFFIXES))} files matched: {' '.join(targets)}")
+
+    answers = BatchAnswers.from_file(rules_path)
+    with ProcessPoolExecutor(max_workers=workers, initializer=reset_worker) as pool:
+        results = list(pool.map(parse_source_file, files, [answers] * len(files), chunksize=8))
+    for result in results:
+        METRICS.merge(result.metrics)
+
+    store = SpeciesStore.load(ALIENS_PATH)
+    resolver = catalog_resolver(store)
+    added: List[Tuple[str, Dict]] = []
+    skipped = failed = 0
+    for result in results:
+        label = result.path.relative_to(SOURCE_ROOT) if result.path.is_relative_to(SOURCE_ROOT) else result.path
+        if result.record is None:
+            failed += 1
+            print(f"❌ {label}: {result.error}")
+            continue
+        match = resolver.resolve(result.record.name)
+        if match is not None and match.method in ("exact", "singular"):
+            skipped += 1
+            print(f"⏭️  {label}: '{result.record.name}' already exists as '{match.value.get('name')}'")
+            continue
+        if match is not None:
+            print(f"⚠️  {label}: '{result.record.name}' looks like '{match.value.get('name')}' ({match.method}, {match.confidence:.2f}); adding anyway")
+        slug = slugify(result.record.name)
+        species_dict = store.add(species_to_dict(result.record, store.allocate_id(), slug))
+        resolver.add(species_dict["name"], species_dict)
+        added.append((slug, species_dict))
+        print(f"✅ {label}: '{result.record.name}' → id {species_dict['id']}")
 
-    existing_names = {species["name"].lower(): species for species in races}
-    if record.name.lower() in existing_names:
+    print(f"\nParsed {len(files)} files: {len(added)} added, {skipped} skipped, {failed} failed.")
+
+    if added and not dry_run:
+        store.save()
+        print(f"✅ ALIENS.json updated with {len(added)} new species.")
+        if upload:
+            for slug, species_dict in added:
+                upload_to_firestore(slug, species_dict)
+            print(f"✅ Uploaded {len(added)} Firestore documents.")
+
+    return 1 if failed else 0
+
+
+def run_interactive() -> None:
+    source_file = prompt_file()
+    raw_text, title = load_source(source_file)
+    text = normalize_text(raw_text)
+    record = parse_wikitext_species(text, title) if title is not None else parse_species(text)
+
+    store = SpeciesStore.load(ALIENS_PATH)
+    if record.name in store:
         print(f"Species '{record.name}' already exists in ALIENS.json.\nAborting.")
         return
 
-    new_id = max((species.get("id", 0) for species in races), default=0) + 1
+    new_id = store.allocate_id()
     slug = slugify(record.name)
-    species_dict = species_to_dict(record, new_id, slug)
-    races.append(species_dict)
-
-    ALIENS_PATH.write_text(json.dumps({"races": races}, ensure_ascii=False, indent=2) + "\n", encoding="utf-8")
+    store.add(species_to_dict(record, new_id, slug))
+    store.save()
     print(f"✅ Added '{record.name}' to ALIENS.json with id {new_id}.")
 
     print("Uploading to Firestore…")
-    upload_to_firestore(slug, species_dict)
+    upload_to_firestore(slug, store.get(new_id))
     print(f"✅ Firestore document 'species/{slug}' updated.")
 
 
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--batch", nargs="+", metavar="PATH", help="Directories or glob patterns to ingest without prompts.")
+    parser.add_argument("--rules", type=Path, help="JSON rules file answering prompts in batch mode.")
+    parser.add_argument("--workers", type=int, default=None, help="Parser processes (default: CPU count).")
+    parser.add_argument("--upload", action="store_true", help="Upload new species to Firestore after a batch run.")
+    parser.add_argument("--dry-run", action="store_true", help="Parse and report without writing ALIENS.json.")
+    metrics.add_arguments(parser)
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    args = parse_args(argv)
+    with metrics.session("Add_New_Aliens", args.metrics, args.profile):
+        if args.batch:
+            raise SystemExit(run_batch(args.batch, args.rules, args.workers, args.upload, args.dry_run))
+        run_interactive()
+
+
 if __name__ == "__main__":
     try:
         main()
@@ -33,9 +33,41 @@ CREATE TABLE IF NOT EXISTS starships (
   sources JSON,
   pageId INTEGER,
   revisionId INTEGER,
+  -- Written by scripts/starship_pipeline.py
+  parent TEXT,
+  isVariant BOOLEAN DEFAULT FALSE,
+  variantOf VARCHAR(255),
+  lengthMeters DOUBLE PRECISION,
+  costNew BIGINT,
+  costUsed BIGINT,
+  spaceSpeed DOUBLE PRECISION,
+  atmosphereKmh INTEGER,
   createdAt TIMESTAMP DEFAULT CURRENT_TIMESTAMP
 );
 
+-- Same shape as dev/sql/import_species_mysql.js; api-php/species.php merges properties into each record
+CREATE TABLE IF NOT EXISTS species (
+  slug VARCHAR(255) PRIMARY KEY,
+  name TEXT NOT NULL,
+  classification VARCHAR(255),
+  homeworld VARCHAR(255),
+  description LONGTEXT,
+  properties JSON,
+  imageUrl TEXT,
+  createdAt TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Same columns as api/migrations/20251011_create_characters.sql; scripts/character_sheets.py fills data
+CREATE TABLE IF NOT EXISTS characters (
+  id CHAR(36) PRIMARY KEY,
+  user_id VARCHAR(255) NOT NULL,
+  name VARCHAR(255) NOT NULL,
+  species_slug VARCHAR(255),
+  data JSON,
+  created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+  updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
 -- Optional category-specific views for convenience
 CREATE VIEW IF NOT EXISTS starfighters AS
   SELECT * FROM starships WHERE category = 'starfighter';
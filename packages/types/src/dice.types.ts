@@ -0,0 +1,32 @@
+/**
+ * Precomputed D6 roll distributions written by scripts/dice_rolls.py
+ */
+
+export type DifficultyName = 'Very Easy' | 'Easy' | 'Moderate' | 'Difficult' | 'Very Difficult' | 'Heroic';
+
+export interface DiceDistribution {
+  /** Canonical dice code, e.g. "3D+2" */
+  code: string;
+  min: number;
+  /** Highest total kept before the exploding tail is truncated */
+  max: number;
+  mean: number;
+  std: number;
+  median: number;
+  /** Chance of a Wild Die complication */
+  complication: number;
+  /** P(total >= difficulty number) */
+  atLeast: Record<DifficultyName, number>;
+  /** probabilities[i] = P(total = min + i); totals past the end round to 0 */
+  probabilities: number[];
+}
+
+export interface DiceDistributionFile {
+  version: 1;
+  rules: {
+    wildDie: boolean;
+    complication: 'subtract' | 'count';
+    difficulties: Record<DifficultyName, number>;
+  };
+  distributions: Record<string, DiceDistribution>;
+}
@@ -4,3 +4,6 @@
 
 export * from './species.types';
 export * from './firestore.types';
+export * from './search.types';
+export * from './dice.types';
+export * from './matchups.types';
@@ -0,0 +1,27 @@
+/**
+ * Starship duel matrix written by scripts/starship_matchups.py
+ *
+ * The matrix file is shape[0] x shape[1] little-endian uint16 values, row =
+ * attacker; divide by `scale` for the chance the attacker lands the first
+ * damaging hit.
+ */
+
+export interface StarshipMatchupShip {
+  name: string;
+  slug: string;
+  scale: 'speeder' | 'starfighter' | 'capital';
+  weapons: number;
+  /** Row indexes of the most even opponents */
+  rivals: number[];
+  /** Row indexes of the opponents this ship is least likely to beat */
+  threats: number[];
+}
+
+export interface StarshipMatchupFile {
+  version: 1;
+  matrix: string;
+  shape: [number, number];
+  dtype: 'uint16le';
+  scale: number;
+  ships: StarshipMatchupShip[];
+}
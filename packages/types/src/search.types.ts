@@ -0,0 +1,28 @@
+/**
+ * Compiled search index written by scripts/search_index.py
+ */
+
+export interface SearchIndexDoc {
+  type: 'species' | 'starship';
+  slug: string;
+  name: string;
+  homeworld?: string;
+  attributeDice?: string;
+  category?: string;
+}
+
+/** Trie node: [children by character, best completions (doc ids) by name] */
+export type SearchTrieNode = [Record<string, number>, number[]];
+
+export interface SearchIndexFile {
+  version: 1;
+  sourceHash: string;
+  docs: SearchIndexDoc[];
+  /** Sorted vocabulary; postings[i] belongs to tokens[i] */
+  tokens: string[];
+  /** Delta-encoded ascending doc ids */
+  postings: number[][];
+  /** Flattened prefix trie rooted at node 0 */
+  trie: SearchTrieNode[];
+  sorts: Record<'name' | 'homeworld' | 'attributeDice', number[]>;
+}
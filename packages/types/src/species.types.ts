@@ -33,6 +33,14 @@ export interface NamedText {
   description: string;
 }
 
+export interface ImageVariant {
+  name: string; // "thumb" | "card" | "detail" | "full"
+  path: string; // relative to web/public, e.g. "aliens/bothan-thumb.webp"
+  width: number;
+  height: number;
+  bytes: number;
+}
+
 export interface Species {
   id?: number | string;
   name: string;
@@ -45,6 +53,7 @@ export interface Species {
   exampleNames?: string[];
   adventurers?: string;
   imageUrl?: string;
+  imageVariants?: ImageVariant[]; // narrowest first, for srcset
   stats: Stats;
   specialAbilities?: NamedText[];
   storyFactors?: NamedText[];
@@ -2,10 +2,15 @@
 """Audit ALIENS.json for missing or placeholder fields."""
 from __future__ import annotations
 
-import json
+import argparse
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Iterable, List
+from typing import Iterable, List, Optional
+
+import metrics
+from dice_codes import DiceTable
+from metrics import stage
+from species_store import SpeciesStore
 
 ALIENS_PATH = Path(__file__).resolve().parent.parent / "ALIENS.json"
 
@@ -19,12 +24,7 @@ class Issue:
 
 
 def load_species() -> Iterable[dict]:
-    raw = json.loads(ALIENS_PATH.read_text(encoding="utf-8"))
-    if isinstance(raw, dict) and "races" in raw:
-        return raw["races"]
-    if isinstance(raw, list):
-        return raw
-    raise RuntimeError("ALIENS.json must contain either top-level list or {\"races\": []}")
+    return SpeciesStore.load(ALIENS_PATH)
 
 
 def audit_species(species: dict) -> Issue:
@@ -60,8 +60,23 @@ def audit_species(species: dict) -> Issue:
     return Issue(name=name, problems=problems)
 
 
-def main() -> None:
-    issues = [issue for species in load_species() if (issue := audit_species(species))]
+def audit() -> List[Issue]:
+    with stage("load_species"):
+        species = list(load_species())
+    # Dice codes are parsed and range-checked for the whole catalog at once.
+    with stage("dice_table"):
+        dice_problems = DiceTable.from_records(species).problems()
+    issues = []
+    with stage("audit_species"):
+        for index, record in enumerate(species):
+            issue = audit_species(record)
+            issue.problems.extend(dice_problems.get(index, []))
+            if issue:
+                issues.append(issue)
+    return issues
+
+
+def report(issues: List[Issue]) -> None:
     if not issues:
         print("✅ All species records look complete.")
         return
@@ -76,5 +91,13 @@ def main() -> None:
     print(f"Total species with issues: {len(issues)}")
 
 
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    metrics.add_arguments(parser)
+    args = parser.parse_args(argv)
+    with metrics.session("audit_species_data", args.metrics, args.profile):
+        report(audit())
+
+
 if __name__ == "__main__":
     main()
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""Benchmark column scans over catalog_columns exports against loading the JSON catalog, on seeded synthetic species."""
+from __future__ import annotations
+
+import argparse
+import json
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict
+
+import numpy as np
+
+from catalog_columns import MISSING, disk_size, open_table, species_tables, write_export
+from dice_codes import ATTRIBUTES, to_pips
+from species_store import SpeciesStore
+from synthetic_data import best_of, synthetic_catalog
+
+
+def json_stats(path: Path) -> Dict[str, float]:
+    """Mean max of every attribute, the way a script does it today: load everything, walk every record."""
+    totals = {attribute: [0, 0] for attribute in ATTRIBUTES}
+    for record in SpeciesStore.load(path):
+        attributes = (record.get("stats") or {}).get("attributes") or {}
+        for attribute in ATTRIBUTES:
+            pips = to_pips((attributes.get(attribute) or {}).get("max") or "")
+            if pips >= 0:
+                totals[attribute][0] += pips
+                totals[attribute][1] += 1
+    return {attribute: total / count for attribute, (total, count) in totals.items() if count}
+
+
+def column_stats(out_dir: Path) -> Dict[str, float]:
+    table = open_table("species", out_dir, columns=[f"{attribute}_max" for attribute in ATTRIBUTES])
+    result = {}
+    for attribute in ATTRIBUTES:
+        column = table[f"{attribute}_max"]
+        valid = column != MISSING
+        if valid.any():
+            result[attribute] = float(column[valid].mean())
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--species", type=int, nargs="+", default=[1_000, 10_000, 100_000], help="Catalog sizes.")
+    parser.add_argument("--seed", type=int, default=6, help="Random seed.")
+    parser.add_argument("--repeat", type=int, default=3, help="Timing repetitions (best run is reported).")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for count in args.species:
+            records = synthetic_catalog(count, args.seed)
+            path = Path(tmp) / f"aliens-{count}.json"
+            path.write_text(json.dumps({"races": records}, ensure_ascii=False, indent=2), encoding="utf-8")
+            out_dir = Path(tmp) / f"columns-{count}"
+            start = time.perf_counter()
+            write_export(out_dir, species_tables(records))
+            build = time.perf_counter() - start
+
+            expected, actual = json_stats(path), column_stats(out_dir)
+            same = expected.keys() == actual.keys() and all(np.isclose(expected[key], actual[key]) for key in expected)
+            load = best_of(lambda: json_stats(path), args.repeat)
+            scan = best_of(lambda: column_stats(out_dir), args.repeat)
+            print(
+                f"{count} species: JSON {path.stat().st_size / 1024:.0f} KiB, columns {disk_size(out_dir) / 1024:.0f} KiB "
+                f"(export {build * 1000:.0f} ms, {'same' if same else 'DIFFERENT'} means)"
+            )
+            print(f"  JSON load + walk, mean max per attribute: {load * 1000:9.2f} ms")
+            print(f"  mmap column scan:                         {scan * 1000:9.2f} ms  ({load / scan:.0f}x)")
+
+
+if __name__ == "__main__":
+    main()
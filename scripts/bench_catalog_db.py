@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""Benchmark catalog_db queries against loading and scanning the JSON catalog on seeded synthetic species."""
+from __future__ import annotations
+
+import argparse
+import json
+import sqlite3
+import tempfile
+import time
+from pathlib import Path
+from typing import List
+
+from catalog_db import CatalogDB, load_species
+from dice_codes import to_pips
+from species_store import SpeciesStore
+from synthetic_data import best_of, synthetic_catalog
+
+SEARCH_WORD = "bioluminescent"
+
+
+def json_range_scan(path: Path, minimum: int) -> List[str]:
+    """What the scripts do today: load the whole file, then walk every record."""
+    found = []
+    for record in SpeciesStore.load(path):
+        bounds = ((record.get("stats") or {}).get("attributes") or {}).get("strength") or {}
+        if to_pips(bounds.get("max") or "") >= minimum:
+            found.append(record["name"])
+    return found
+
+
+def json_text_scan(path: Path, word: str) -> List[str]:
+    found = []
+    for record in SpeciesStore.load(path):
+        abilities = " ".join(entry.get("description", "") for entry in record.get("specialAbilities") or [])
+        if any(word in (text or "") for text in (record.get("description"), record.get("personality"), abilities)):
+            found.append(record["name"])
+    return found
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--species", type=int, nargs="+", default=[1_000, 10_000, 100_000], help="Catalog sizes.")
+    parser.add_argument("--seed", type=int, default=6, help="Random seed.")
+    parser.add_argument("--repeat", type=int, default=3, help="Timing repetitions (best run is reported).")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for count in args.species:
+            records = synthetic_catalog(count, args.seed)
+            path = Path(tmp) / f"aliens-{count}.json"
+            path.write_text(json.dumps({"races": records}), encoding="utf-8")
+            connection = sqlite3.connect(Path(tmp) / f"catalog-{count}.sqlite", isolation_level=None)
+            db = CatalogDB(connection)
+            start = time.perf_counter()
+            connection.execute("BEGIN")
+            load_species(connection, records, db.fts)
+            connection.execute("COMMIT")
+            build = time.perf_counter() - start
+
+            same = sorted(json_range_scan(path, 18)) == sorted(row["name"] for row in db.species(["strength.max>=6D"]))
+            homeworld = records[0]["homeworld"]
+            scan = best_of(lambda: json_range_scan(path, 18), args.repeat)
+            query = best_of(lambda: db.species(["strength.max>=6D"]), args.repeat)
+            point = best_of(lambda: db.species([f"homeworld={homeworld}"]), args.repeat)
+            text_scan = best_of(lambda: json_text_scan(path, SEARCH_WORD), args.repeat)
+            text_query = best_of(lambda: db.search(SEARCH_WORD, limit=20), args.repeat)
+            db.close()
+
+            print(f"{count} species (build {build * 1000:.0f} ms, {'same' if same else 'DIFFERENT'} range results)")
+            print(f"  JSON load + scan, strength.max>=6D: {scan * 1000:9.2f} ms")
+            print(f"  SQLite strength.max>=6D:            {query * 1000:9.2f} ms  ({scan / query:.0f}x)")
+            print(f"  SQLite homeworld= (indexed):        {point * 1000:9.2f} ms  ({scan / point:.0f}x)")
+            print(f"  JSON load + text scan:              {text_scan * 1000:9.2f} ms")
+            print(f"  FTS5 '{SEARCH_WORD}', top 20:     {text_query * 1000:9.2f} ms  ({text_scan / text_query:.0f}x)")
+
+
+if __name__ == "__main__":
+    main()
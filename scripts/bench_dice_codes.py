@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""Benchmark dice_codes.DiceTable against a per-record Python loop on seeded synthetic species."""
+from __future__ import annotations
+
+import argparse
+from typing import Dict, List
+
+from dice_codes import ATTRIBUTES, INVALID, PLACEHOLDER, DiceTable, to_pips
+from synthetic_data import best_of, synthetic_catalog
+
+
+def loop_problems(records: List[dict]) -> Dict[int, int]:
+    """What a straightforward implementation does: parse and check every record in turn."""
+    counts: Dict[int, int] = {}
+    for index, record in enumerate(records):
+        stats = record.get("stats") or {}
+        attributes = stats.get("attributes") or {}
+        budget = to_pips(stats.get("attributeDice") or "")
+        lows, highs = [], []
+        problems = int(budget == INVALID)
+        for attribute in ATTRIBUTES:
+            bounds = attributes.get(attribute) or {}
+            low, high = to_pips(bounds.get("min") or ""), to_pips(bounds.get("max") or "")
+            lows.append(low)
+            highs.append(high)
+            problems += (low == INVALID) + (high == INVALID)
+            if low >= 0 and high >= 0 and low > high:
+                problems += 1
+        problems += PLACEHOLDER in lows + highs
+        if budget >= 0 and min(lows + highs) >= 0:
+            problems += (budget < sum(lows)) + (budget > sum(highs))
+        if problems:
+            counts[index] = problems
+    return counts
+
+
+def table_problems(records: List[dict]) -> Dict[int, int]:
+    return {row: len(found) for row, found in DiceTable.from_records(records).problems().items()}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--species", type=int, nargs="+", default=[1_000, 10_000, 100_000], help="Catalog sizes.")
+    parser.add_argument("--seed", type=int, default=6, help="Random seed.")
+    parser.add_argument("--repeat", type=int, default=3, help="Timing repetitions (best run is reported).")
+    args = parser.parse_args()
+
+    for count in args.species:
+        records = synthetic_catalog(count, args.seed)
+        same = loop_problems(records) == table_problems(records)
+        table = DiceTable.from_records(records)
+        loop = best_of(lambda: loop_problems(records), args.repeat)
+        build = best_of(lambda: DiceTable.from_records(records), args.repeat)
+        checks = best_of(lambda: (table.problems(), table.aggregates()), args.repeat)
+        print(f"{count} species ({'same' if same else 'DIFFERENT'} problems as the loop)")
+        print(f"  per-record loop:            {loop * 1000:8.1f} ms")
+        print(f"  DiceTable build + checks:   {(build + checks) * 1000:8.1f} ms  ({loop / (build + checks):.1f}x)")
+        print(f"    checks + aggregates only: {checks * 1000:8.1f} ms  ({loop / checks:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
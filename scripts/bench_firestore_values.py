@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""Benchmark firestore_values.encode against the legacy recursive to_value encoders."""
+from __future__ import annotations
+
+import argparse
+import json
+from pathlib import Path
+from typing import Callable, Dict, List
+
+from firestore_values import decode, encode
+from import_species_firehose import build_document, load_records
+from synthetic_data import best_of
+
+ROOT = Path(__file__).resolve().parent.parent
+STARSHIP_RAW_DIR = ROOT / "Source Data" / "d6holocron" / "starships" / "raw"
+
+
+def legacy_to_value(value):
+    # Verbatim copy of the pre-refactor import_species_firehose.to_value.
+    if value is None:
+        return {"nullValue": None}
+    if isinstance(value, bool):
+        return {"booleanValue": value}
+    if isinstance(value, int):
+        return {"integerValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    if isinstance(value, str):
+        return {"stringValue": value}
+    if isinstance(value, list):
+        return {"arrayValue": {"values": [legacy_to_value(item) for item in value]}}
+    if isinstance(value, dict):
+        fields = {k: legacy_to_value(v) for k, v in value.items() if v is not None}
+        return {"mapValue": {"fields": fields}}
+    raise TypeError(f"Unsupported value type: {type(value)}")
+
+
+def load_corpus() -> Dict[str, List[dict]]:
+    species = [doc for _, doc in (build_document(record, index) for index, record in enumerate(load_records()))]
+    starships = [json.loads(path.read_text(encoding="utf-8")) for path in sorted(STARSHIP_RAW_DIR.glob("*.json"))]
+    return {"ALIENS.json": species, "starships/raw": starships}
+
+
+def time_encoder(encoder: Callable[[dict], dict], docs: List[dict], repeat: int) -> float:
+    def run() -> None:
+        for doc in docs:
+            encoder(doc)
+    return best_of(run, repeat)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=20, help="Timing repetitions (best run is reported).")
+    args = parser.parse_args()
+
+    def iterative(doc: dict) -> dict:
+        return encode(doc, drop_none=True)
+
+    for corpus, docs in load_corpus().items():
+        mismatches = sum(1 for doc in docs if json.dumps(legacy_to_value(doc)) != json.dumps(iterative(doc)))
+        round_trip = sum(
+            1 for doc in docs if decode(iterative(doc)) != {k: v for k, v in doc.items() if v is not None}
+        )
+        legacy = time_encoder(legacy_to_value, docs, args.repeat)
+        fast = time_encoder(iterative, docs, args.repeat)
+        decoded = time_encoder(decode, [iterative(doc) for doc in docs], args.repeat)
+        print(f"{corpus}: {len(docs)} docs")
+        print(f"  recursive to_value: {len(docs) / legacy:10.0f} docs/sec")
+        print(f"  encode:             {len(docs) / fast:10.0f} docs/sec  ({legacy / fast:.1f}x)")
+        print(f"  decode:             {len(docs) / decoded:10.0f} docs/sec")
+        print(f"  differing outputs: {mismatches}, round-trip failures: {round_trip}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""Benchmark search_index queries against a linear catalog scan on seeded synthetic records."""
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, List, Tuple
+
+from search_index import SearchIndex, build_index, species_entries, starship_entries, tokens
+from synthetic_data import best_of, synthetic_catalog, synthetic_starships
+
+def synthetic_records(count: int, seed: int) -> List[Tuple[dict, List[str]]]:
+    """Half species, half starships, through the same entry builders as the real index."""
+    from starship_pipeline import normalize_ship, parse_wikitext
+
+    ships = [normalize_ship(parse_wikitext(wikitext, title)) for title, wikitext in synthetic_starships(count // 2, seed)]
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "starships.json"
+        path.write_text(json.dumps(ships), encoding="utf-8")
+        return [*species_entries(synthetic_catalog(count - count // 2, seed)), *starship_entries([path])]
+
+
+def linear_search(records: List[Tuple[dict, List[str]]], query: str) -> List[dict]:
+    # What the frontend does today: tokenize every record for every keystroke.
+    terms = tokens(query)
+    hits = []
+    for entry, text in records:
+        words = [token for part in text for token in tokens(part)]
+        if all(any(word.startswith(term) if i == len(terms) - 1 else word == term for word in words) for i, term in enumerate(terms)):
+            hits.append(entry)
+    return sorted(hits, key=lambda entry: entry["name"].casefold())[:20]
+
+
+def per_query(fn: Callable[[str], object], queries: List[str], repeat: int) -> float:
+    def run() -> None:
+        for query in queries:
+            fn(query)
+    return best_of(run, repeat) / len(queries)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--records", type=int, default=10_000, help="Synthetic catalog size.")
+    parser.add_argument("--queries", type=int, default=200, help="Queries per workload.")
+    parser.add_argument("--seed", type=int, default=6, help="Random seed for records and queries.")
+    parser.add_argument("--repeat", type=int, default=3, help="Timing repetitions (best run is reported).")
+    args = parser.parse_args()
+
+    records = synthetic_records(args.records, args.seed)
+    start = time.perf_counter()
+    compiled = build_index(records)
+    built = time.perf_counter() - start
+    blob = json.dumps(compiled, separators=(",", ":"))
+    start = time.perf_counter()
+    index = SearchIndex(json.loads(blob))
+    loaded = time.perf_counter() - start
+
+    rng = random.Random(args.seed + 1)
+    names = [entry["name"] for entry, _ in records]
+    words = [rng.choice(tokens(rng.choice(names))) for _ in range(args.queries)]
+    prefixes = [word[: rng.randint(2, max(2, len(word)))] for word in words]
+    phrases = [" ".join(tokens(rng.choice(names))[:2]) for _ in range(args.queries)]
+
+    print(f"{args.records} records: built in {built * 1000:.0f} ms, {len(blob) / 1024:.0f} KiB JSON, loaded in {loaded * 1000:.0f} ms")
+    print(f"  {len(compiled['tokens'])} tokens, {len(compiled['trie'])} trie nodes")
+    workloads = (
+        ("exact token", words, lambda q: index.search(q), lambda q: linear_search(records, q)),
+        ("prefix", prefixes, lambda q: index.search(q), lambda q: linear_search(records, q)),
+        ("two-term", phrases, lambda q: index.search(q), lambda q: linear_search(records, q)),
+        ("typeahead", prefixes, lambda q: index.complete(q), None),
+        ("sorted page", ["homeworld", "attributeDice", "name"], lambda q: index.ordered(q, "species", limit=50), None),
+    )
+    for label, queries, indexed, scan in workloads:
+        fast = per_query(indexed, queries, args.repeat)
+        line = f"  {label:<12} {fast * 1e6:9.1f} µs/query"
+        if scan is not None:
+            slow = per_query(scan, queries[:20], 1)
+            line += f"   linear scan {slow * 1e3:7.1f} ms/query ({slow / fast:,.0f}x)"
+        print(line)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""Benchmark species_sections.split_sections against the legacy per-label extract_block scans."""
+from __future__ import annotations
+
+import argparse
+import json
+import re
+from pathlib import Path
+from typing import Callable, Dict, List
+
+from enrich_species_from_source import load_sections
+from species_sections import SECTION_FOLLOWERS, SECTION_LABELS, split_sections
+from synthetic_data import best_of
+
+ROOT = Path(__file__).resolve().parent.parent
+RAW_DIR = ROOT / "Source Data" / "d6holocron" / "raw"
+
+
+def legacy_extract_block(text: str, label: str, followers: List[str]) -> str:
+    # Verbatim copy of the pre-tokenizer Add_New_Aliens.extract_block.
+    pattern = re.compile(rf"{label}:\s*(.*?)(?:\n(?:{'|'.join(map(re.escape, followers))}):|\Z)", re.S | re.I)
+    match = pattern.search(text)
+    if not match:
+        return ""
+    return match.group(1).strip()
+
+
+def legacy_sections(text: str) -> Dict[str, str]:
+    followers = list(SECTION_FOLLOWERS)
+    sections = {}
+    for label in SECTION_LABELS:
+        block = legacy_extract_block(text, label, followers)
+        if block:
+            sections[label] = block
+    return sections
+
+
+def tokenized_sections(text: str) -> Dict[str, str]:
+    return {label: body for label, body in split_sections(text).items() if body}
+
+
+def load_corpus() -> Dict[str, List[str]]:
+    c4 = list(load_sections().values())
+    raw = [
+        json.loads(path.read_text(encoding="utf-8")).get("wikitext", "").replace("\r\n", "\n")
+        for path in sorted(RAW_DIR.glob("*.json"))
+    ]
+    return {"C4_Universe_Section.txt": c4, "d6holocron/raw": raw}
+
+
+def time_parser(parser: Callable[[str], Dict[str, str]], texts: List[str], repeat: int) -> float:
+    def run() -> None:
+        for text in texts:
+            parser(text)
+    return best_of(run, repeat)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=5, help="Timing repetitions (best run is reported).")
+    args = parser.parse_args()
+
+    for corpus, texts in load_corpus().items():
+        total_bytes = sum(len(text.encode("utf-8")) for text in texts)
+        mismatches = sum(1 for text in texts if legacy_sections(text) != tokenized_sections(text))
+        legacy = time_parser(legacy_sections, texts, args.repeat)
+        tokenized = time_parser(tokenized_sections, texts, args.repeat)
+        print(f"{corpus}: {len(texts)} texts, {total_bytes / 1024:.0f} KiB")
+        print(f"  extract_block x{len(SECTION_LABELS)}: {legacy * 1000:8.1f} ms")
+        print(f"  split_sections:    {tokenized * 1000:8.1f} ms  ({legacy / tokenized:.1f}x faster)")
+        print(f"  differing outputs:   {mismatches}")
+
+
+if __name__ == "__main__":
+    main()
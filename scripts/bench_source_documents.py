@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""Benchmark source_documents.SourceText against reading and regex-splitting the whole C4 dump."""
+from __future__ import annotations
+
+import argparse
+import re
+import tempfile
+from pathlib import Path
+from typing import Dict
+
+from source_documents import C4_SOURCE_PATH, SourceText
+from synthetic_data import best_of
+
+LEGACY_HEADER = re.compile(r"\n([A-Z][A-Z\s\-']+)\n\n")
+
+
+def legacy_load_sections(path: Path) -> Dict[str, str]:
+    # Verbatim copy of the pre-index enrich_species_from_source.load_sections.
+    text = path.read_text(encoding="utf-8").replace("\r\n", "\n")
+    matches = list(LEGACY_HEADER.finditer(text))
+    sections: Dict[str, str] = {}
+    for idx, match in enumerate(matches):
+        key = match.group(1).strip()
+        start = match.end()
+        end = matches[idx + 1].start() if idx + 1 < len(matches) else len(text)
+        sections[key] = text[start:end].strip()
+    return sections
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("path", nargs="?", type=Path, default=C4_SOURCE_PATH, help="Text dump to read.")
+    parser.add_argument("--repeat", type=int, default=5, help="Timing repetitions (best run is reported).")
+    args = parser.parse_args()
+
+    legacy = legacy_load_sections(args.path)
+    with tempfile.TemporaryDirectory() as cache:
+        cache_dir = Path(cache)
+        with SourceText(args.path, cache_dir=cache_dir) as document:
+            mismatches = sum(1 for header in legacy if header not in document or document[header] != legacy[header])
+            header = next(iter(legacy))
+
+        def cold() -> None:
+            for entry in cache_dir.iterdir():
+                entry.unlink()
+            SourceText(args.path, cache_dir=cache_dir).close()
+
+        def warm_one() -> None:
+            with SourceText(args.path, cache_dir=cache_dir) as document:
+                document[header]
+
+        def warm_all() -> None:
+            with SourceText(args.path, cache_dir=cache_dir) as document:
+                dict(document)
+
+        timings = {
+            "read + regex split (legacy)": best_of(lambda: legacy_load_sections(args.path), args.repeat),
+            "build index (cold cache)": best_of(cold, args.repeat),
+            "cached index + 1 section": best_of(warm_one, args.repeat),
+            "cached index + all sections": best_of(warm_all, args.repeat),
+        }
+
+    print(f"{args.path.name}: {args.path.stat().st_size / 1024:.0f} KiB, {len(legacy)} sections, {mismatches} differing")
+    baseline = timings["read + regex split (legacy)"]
+    for label, seconds in timings.items():
+        print(f"  {label:<30} {seconds * 1000:8.2f} ms  ({baseline / seconds:5.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,410 @@
+#!/usr/bin/env python3
+"""Time every parsing, validation, encoding and writing path of the Python data tools on synthetic data.
+
+Datasets come from ``synthetic_data`` (1x, 10x and 100x the real input
+sizes by default, cached under ``.cache/synthetic``). ``images.convert``
+stops at 10x: 4,700 method-6 encodes would take most of an hour per run.
+Each case runs in its own child process so peak RSS belongs to that case
+alone. After one untimed warm-up run it reports:
+
+* ``wall_ms``: median of ``--repeat`` samples, plus ``per_item_us`` and
+  ``spread_pct``, how far apart the fastest and slowest samples were. A
+  case faster than ``MIN_SAMPLE_MS`` runs several times per sample, so
+  scheduler jitter doesn't swamp millisecond cases;
+* ``rss_peak_kib`` / ``rss_delta_kib``: process high-water mark, and how far
+  the timed runs pushed it past the setup (loading inputs);
+* ``alloc_peak_kib`` / ``alloc_retained_kib``: tracemalloc peak and what was
+  still allocated when one extra run returned.
+
+Results go to ``dev/bench/baseline.json`` (stable key order, rounded, so the
+diff reads well in review). ``--compare`` checks a fresh run against that
+file instead and exits non-zero when ``per_item_us`` grew by more than
+``--tolerance`` plus the spread either run measured, or the allocation peak
+grew by more than ``--tolerance``. Timings only compare on the machine that
+recorded them: re-record the baseline there (``--baseline`` can point at a
+local copy) before using ``--compare`` as a gate.
+
+Usage:
+    python3 scripts/bench_suite.py                      # refresh the baseline
+    python3 scripts/bench_suite.py --compare --scales 1 10
+    python3 scripts/bench_suite.py --cases 'c4.*' 'wikitext.*' --scales 100 --compare
+"""
+from __future__ import annotations
+
+import argparse
+import fnmatch
+import json
+import math
+import os
+import platform
+import shutil
+import subprocess
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+from metrics import max_rss_kib
+from species_store import ROOT, SpeciesStore, write_atomic
+from synthetic_data import DEFAULT_OUT, Dataset, time_runs, write_dataset
+
+sys.path.insert(0, str(ROOT))
+
+BASELINE_PATH = ROOT / "dev" / "bench" / "baseline.json"
+BASELINE_VERSION = 2
+DEFAULT_SCALES = [1, 10, 100]
+# Differences below this are timer noise, whatever the ratio says.
+NOISE_FLOOR_MS = 2.0
+MIN_SAMPLE_MS = 50.0
+
+# name -> (stage, setup, max_scale); setup(dataset, workdir) returns (run, items processed per run).
+Setup = Callable[[Dataset, Path], Tuple[Callable[[], object], int]]
+CASES: Dict[str, Tuple[str, Setup, Optional[int]]] = {}
+
+
+def case(name: str, stage: str, max_scale: Optional[int] = None) -> Callable[[Setup], Setup]:
+    def register(setup: Setup) -> Setup:
+        CASES[name] = (stage, setup, max_scale)
+        return setup
+    return register
+
+
+def runs_at(name: str, scale: int) -> bool:
+    max_scale = CASES[name][2]
+    return max_scale is None or scale <= max_scale
+
+
+def read_pages(path: Path) -> List[dict]:
+    with path.open(encoding="utf-8") as handle:
+        return [json.loads(line) for line in handle]
+
+
+# -- parsing -------------------------------------------------------------------------------------
+
+
+@case("catalog.load", "parse")
+def catalog_load(dataset: Dataset, work: Path):
+    return lambda: SpeciesStore.load(dataset.catalog), dataset.species
+
+
+@case("c4.index", "parse")
+def c4_index(dataset: Dataset, work: Path):
+    from source_documents import SourceText
+
+    cache_dir = work / "source-index"
+
+    def run() -> None:
+        shutil.rmtree(cache_dir, ignore_errors=True)
+        SourceText(dataset.c4, cache_dir=cache_dir).close()
+    return run, dataset.species
+
+
+@case("c4.split_sections", "parse")
+def c4_split_sections(dataset: Dataset, work: Path):
+    from source_documents import SourceText
+    from species_sections import split_sections
+
+    sections = SourceText(dataset.c4, cache_dir=work / "source-index")
+    return lambda: [split_sections(sections[header]) for header in sections], len(sections)
+
+
+@case("c4.parse_species", "parse")
+def c4_parse_species(dataset: Dataset, work: Path):
+    from Add_New_Aliens import parse_species
+    from source_documents import SourceText
+
+    sections = SourceText(dataset.c4, cache_dir=work / "source-index")
+    texts = [f"{header.title()}\n{sections[header]}" for header in sections]
+    return lambda: [parse_species(text, ask=lambda *_: "") for text in texts], len(texts)
+
+
+@case("c4.enrich", "parse")
+def c4_enrich(dataset: Dataset, work: Path):
+    from enrich_species_from_source import extract_move, extract_size, extract_special_abilities, normalize_key
+    from name_resolver import NameResolver
+    from source_documents import SourceText
+    from species_sections import split_sections
+
+    store = SpeciesStore.load(dataset.catalog)
+    sections = SourceText(dataset.c4, cache_dir=work / "source-index")
+
+    def run() -> None:
+        # The matching and extraction half of enrich(), without the final save.
+        resolver = NameResolver((header, header) for header in sections)
+        for species in store:
+            match = resolver.resolve(normalize_key(species["name"]))
+            if match is not None:
+                fields = split_sections(sections[match.value])
+                extract_move(fields), extract_size(fields), extract_special_abilities(fields)
+    return run, len(store)
+
+
+@case("wikitext.species", "parse")
+def wikitext_species(dataset: Dataset, work: Path):
+    from holocron_wikitext import parse_wikitext
+
+    pages = read_pages(dataset.species_wikitext)
+    return lambda: [parse_wikitext(page["wikitext"], page["title"]) for page in pages], len(pages)
+
+
+@case("wikitext.starships", "parse")
+def wikitext_starships(dataset: Dataset, work: Path):
+    from starship_pipeline import normalize_ship, parse_wikitext
+
+    pages = read_pages(dataset.starship_wikitext)
+    return lambda: [normalize_ship(parse_wikitext(page["wikitext"], page["title"])) for page in pages], len(pages)
+
+
+# -- validation ----------------------------------------------------------------------------------
+
+
+@case("audit.species", "validate")
+def audit_species(dataset: Dataset, work: Path):
+    from audit_species_data import audit_species
+
+    records = SpeciesStore.load(dataset.catalog).races
+    return lambda: [audit_species(record) for record in records], len(records)
+
+
+@case("audit.dice_table", "validate")
+def audit_dice_table(dataset: Dataset, work: Path):
+    from dice_codes import DiceTable
+
+    records = SpeciesStore.load(dataset.catalog).races
+    return lambda: DiceTable.from_records(records).problems(), len(records)
+
+
+# -- encoding ------------------------------------------------------------------------------------
+
+
+@case("firehose.build_payload", "encode")
+def firehose_build_payload(dataset: Dataset, work: Path):
+    from import_species_firehose import build_payload
+
+    records = SpeciesStore.load(dataset.catalog).races
+    return lambda: [build_payload(record, index) for index, record in enumerate(records)], len(records)
+
+
+@case("firehose.plan_sync", "encode")
+def firehose_plan_sync(dataset: Dataset, work: Path):
+    from import_species_firehose import build_document, plan_sync
+
+    records = SpeciesStore.load(dataset.catalog).races
+    documents = [build_document(record, index) for index, record in enumerate(records)]
+    state = plan_sync(documents, {}).hashes
+    for _, doc in documents[::10]:
+        doc["description"] += " Revised."
+    return lambda: plan_sync(documents, state), len(documents)
+
+
+@case("images.convert", "encode", max_scale=10)
+def images_convert(dataset: Dataset, work: Path):
+    import convert_images_to_webp
+
+    # Variant paths are recorded relative to PUBLIC_DIR; point it at the scratch dir.
+    convert_images_to_webp.PUBLIC_DIR = work
+    sources = sorted(dataset.image_dir.glob("*.png"))
+    return lambda: [convert_images_to_webp.convert_image(source, work / "aliens" / f"{source.stem}.webp") for source in sources], len(sources)
+
+
+# -- writing -------------------------------------------------------------------------------------
+
+
+@case("catalog.save", "write")
+def catalog_save(dataset: Dataset, work: Path):
+    store = SpeciesStore.load(dataset.catalog)
+    return lambda: store.save(work / "aliens.json", force=True), len(store)
+
+
+@case("sql.emit", "write")
+def sql_emit(dataset: Dataset, work: Path):
+    from sql_loader import DEFAULT_CHUNK_SIZE, SPECIES, emit_statements, plan_load, species_row
+
+    rows = [species_row(record, index) for index, record in enumerate(SpeciesStore.load(dataset.catalog))]
+    plans = [plan_load(SPECIES, rows, None)]
+    return lambda: write_atomic(work / "species.sql", emit_statements(plans, "mysql", DEFAULT_CHUNK_SIZE)), len(rows)
+
+
+# -- measurement ---------------------------------------------------------------------------------
+
+
+def measure(name: str, dataset: Dataset, repeat: int) -> dict:
+    """Run one case in this process; meant to be called in a fresh child."""
+    stage, setup, _ = CASES[name]
+    with tempfile.TemporaryDirectory(prefix="bench-") as tmp:
+        run, items = setup(dataset, Path(tmp))
+        rss_setup = max_rss_kib()
+        # Lazy imports, regex compiles and cold file caches land here rather than in the timings.
+        warm_up = time_runs(run, 1)[0]
+        loops = max(1, math.ceil(MIN_SAMPLE_MS / 1000 / warm_up)) if warm_up else 1
+
+        def sample() -> None:
+            for _ in range(loops):
+                run()
+        runs = [seconds / loops for seconds in time_runs(sample, repeat)]
+        wall = statistics.median(runs)
+        rss_peak = max_rss_kib()
+        tracemalloc.start()
+        try:
+            run()
+            retained, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+    return {
+        "stage": stage,
+        "items": items,
+        "wall_ms": round(wall * 1000, 3),
+        "per_item_us": round(wall * 1e6 / items, 2) if items else None,
+        "spread_pct": round((max(runs) - min(runs)) * 100 / wall, 1) if wall else 0.0,
+        "rss_peak_kib": rss_peak,
+        "rss_delta_kib": rss_peak - rss_setup if rss_peak is not None else None,
+        "alloc_peak_kib": round(peak / 1024),
+        "alloc_retained_kib": round(retained / 1024),
+    }
+
+
+def run_child(name: str, dataset: Dataset, repeat: int) -> dict:
+    command = [sys.executable, str(Path(__file__).resolve()), "--child", name, "--dataset", str(dataset.root), "--repeat", str(repeat)]
+    completed = subprocess.run(command, capture_output=True, text=True)
+    if completed.returncode != 0:
+        raise SystemExit(f"❌ {name} at {dataset.scale}x failed:\n{completed.stderr.strip()}")
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+# -- baseline ------------------------------------------------------------------------------------
+
+
+def environment() -> dict:
+    return {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(terse=True),
+        "machine": platform.machine(),
+        "cpus": os.cpu_count(),
+    }
+
+
+def load_baseline(path: Path) -> dict:
+    if not path.exists():
+        raise SystemExit(f"Missing baseline {path}; run without --compare first.")
+    baseline = json.loads(path.read_text(encoding="utf-8"))
+    if baseline.get("version") != BASELINE_VERSION:
+        raise SystemExit(f"{path} is baseline version {baseline.get('version')}, expected {BASELINE_VERSION}; regenerate it.")
+    return baseline
+
+
+def merge_results(previous: Optional[dict], results: Dict[str, Dict[str, dict]], args: argparse.Namespace) -> dict:
+    """Overlay this run on the previous baseline so partial runs (--cases/--scales) keep the other entries."""
+    merged = {scale: dict(cases) for scale, cases in (previous or {}).get("results", {}).items()}
+    for scale, cases in results.items():
+        merged.setdefault(scale, {}).update(cases)
+    ordered = {scale: dict(sorted(merged[scale].items())) for scale in sorted(merged, key=lambda key: int(key.rstrip("x")))}
+    return {"version": BASELINE_VERSION, "seed": args.seed, "repeat": args.repeat, "environment": environment(), "results": ordered}
+
+
+def compare(baseline: dict, results: Dict[str, Dict[str, dict]], tolerance: float) -> List[str]:
+    regressions: List[str] = []
+    for scale, cases in results.items():
+        for name, current in cases.items():
+            previous = baseline["results"].get(scale, {}).get(name)
+            if previous is None:
+                print(f"  {name:<24} {scale:>5}  (no baseline)")
+                continue
+            # Per item, so a case whose item count changed still compares; wall_ms only feeds the noise floor.
+            time_ratio = current["per_item_us"] / previous["per_item_us"] if previous["per_item_us"] and current["per_item_us"] else 1.0
+            noise = max(current["spread_pct"], previous["spread_pct"]) / 100
+            alloc_ratio = current["alloc_peak_kib"] / previous["alloc_peak_kib"] if previous["alloc_peak_kib"] else 1.0
+            slower = time_ratio > 1 + tolerance + noise and current["wall_ms"] - previous["wall_ms"] > NOISE_FLOOR_MS
+            heavier = alloc_ratio > 1 + tolerance and current["alloc_peak_kib"] - previous["alloc_peak_kib"] > 64
+            mark = "❌" if slower or heavier else "✅"
+            print(f"{mark} {name:<24} {scale:>5}  {previous['per_item_us']:>9.1f} → {current['per_item_us']:>9.1f} µs/item "
+                  f"({time_ratio:5.2f}x, ±{noise:.0%})  alloc peak {alloc_ratio:5.2f}x")
+            if slower:
+                regressions.append(f"{name} at {scale}: {time_ratio:.2f}x baseline time per item")
+            if heavier:
+                regressions.append(f"{name} at {scale}: allocation peak {alloc_ratio:.2f}x baseline")
+    return regressions
+
+
+def print_result(name: str, scale: str, result: dict) -> None:
+    per_item = f"{result['per_item_us']:>9.1f} µs/item" if result["per_item_us"] is not None else ""
+    rss = f"rss {result['rss_peak_kib'] / 1024:7.1f} MiB (+{result['rss_delta_kib'] / 1024:.1f})" if result["rss_peak_kib"] is not None else ""
+    print(f"  {name:<24} {scale:>5}  {result['wall_ms']:>10.1f} ms ±{result['spread_pct']:4.0f}% {per_item}  alloc {result['alloc_peak_kib'] / 1024:7.1f} MiB  {rss}")
+
+
+def select_cases(patterns: Optional[List[str]]) -> List[str]:
+    if not patterns:
+        return list(CASES)
+    selected = [name for name in CASES if any(fnmatch.fnmatchcase(name, pattern) for pattern in patterns)]
+    if not selected:
+        raise SystemExit(f"No cases match {' '.join(patterns)}; choose from {', '.join(CASES)}")
+    return selected
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scales", type=int, nargs="+", default=DEFAULT_SCALES, help="Dataset scales to run.")
+    parser.add_argument("--cases", nargs="+", help="Only run cases matching these glob patterns (e.g. 'c4.*').")
+    parser.add_argument("--seed", type=int, default=24, help="Random seed for the synthetic datasets.")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed runs per case after a warm-up (the median is reported).")
+    parser.add_argument("--data-dir", type=Path, default=DEFAULT_OUT, help="Where synthetic datasets are generated and cached.")
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH, help="Baseline file to write or compare against.")
+    parser.add_argument("--compare", action="store_true", help="Compare against --baseline instead of updating it.")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed slowdown or allocation growth with --compare.")
+    parser.add_argument("--list", action="store_true", help="List cases and exit.")
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    parser.add_argument("--dataset", type=Path, help=argparse.SUPPRESS)
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    args = parse_args(argv)
+    if args.child:
+        print(json.dumps(measure(args.child, Dataset.open(args.dataset), args.repeat)))
+        return
+    if args.list:
+        for name, (stage, _, max_scale) in CASES.items():
+            print(f"  {stage:<9} {name}" + (f"  (up to {max_scale}x)" if max_scale else ""))
+        return
+
+    names = select_cases(args.cases)
+    baseline = load_baseline(args.baseline) if args.compare else None
+    if baseline is not None and baseline["seed"] != args.seed:
+        raise SystemExit(f"{args.baseline} was recorded with --seed {baseline['seed']}; compare with the same seed.")
+    if baseline is not None and baseline["environment"] != environment():
+        print(f"⚠️  {args.baseline} was recorded on {baseline['environment']['platform']} ({baseline['environment']['cpus']} CPUs, "
+              f"Python {baseline['environment']['python']}); timings from another machine are not comparable. "
+              f"Re-record it here without --compare first.")
+    results: Dict[str, Dict[str, dict]] = {}
+    for scale in args.scales:
+        start = time.perf_counter()
+        scale_names = [name for name in names if runs_at(name, scale)]
+        images = any(name.startswith("images.") for name in scale_names)
+        dataset = write_dataset(args.data_dir / f"scale-{scale}", scale, args.seed, images=images)
+        print(f"⏱️  {scale}x: {dataset.species} species, {dataset.wiki_species} species pages, {dataset.starships} starship pages, "
+              f"{dataset.images} images (ready in {time.perf_counter() - start:.1f}s)")
+        key = f"{scale}x"
+        results[key] = {}
+        for name in scale_names:
+            results[key][name] = run_child(name, dataset, args.repeat)
+            print_result(name, key, results[key][name])
+
+    if baseline is not None:
+        print(f"\nCompared with {args.baseline} (tolerance {args.tolerance:.0%}):")
+        regressions = compare(baseline, results, args.tolerance)
+        if regressions:
+            raise SystemExit("❌ Regressions:\n  " + "\n  ".join(regressions))
+        print("✅ No regressions")
+        return
+
+    previous = json.loads(args.baseline.read_text(encoding="utf-8")) if args.baseline.exists() else None
+    document = merge_results(previous, results, args)
+    write_atomic(args.baseline, [json.dumps(document, ensure_ascii=False, indent=2), "\n"])
+    print(f"💾 Wrote {args.baseline}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""Benchmark holocron_wikitext against Add_New_Aliens.parse_species and report field coverage vs import-ready.json."""
+from __future__ import annotations
+
+import argparse
+import contextlib
+import io
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Callable, List
+
+from holocron_wikitext import RAW_DIR, iter_raw_pages, iter_species, parse_wikitext
+from species_store import ROOT, normalize_name
+from synthetic_data import best_of
+
+sys.path.insert(0, str(ROOT))
+from Add_New_Aliens import normalize_text, parse_species  # noqa: E402
+
+IMPORT_READY_PATH = ROOT / "Source Data" / "d6holocron" / "import-ready.json"
+
+# Dotted paths into a species record.
+FIELDS = (
+    "name",
+    "plural",
+    "description",
+    "personality",
+    "physicalDescription",
+    "homeworld",
+    "languages.native",
+    "languages.description",
+    "exampleNames",
+    "adventurers",
+    "stats.attributeDice",
+    "stats.attributes",
+    "stats.move",
+    "stats.size",
+    "specialAbilities",
+    "storyFactors",
+    "sources",
+)
+
+
+def lookup(record: dict, path: str):
+    value = record
+    for part in path.split("."):
+        value = value.get(part) if isinstance(value, dict) else None
+    return value
+
+
+def legacy_parse(page: dict) -> None:
+    with contextlib.redirect_stdout(io.StringIO()):
+        parse_species(normalize_text(page["wikitext"]), ask=lambda *_: "", name=page["title"])
+
+
+def wikitext_parse(page: dict) -> None:
+    parse_wikitext(page["wikitext"], page["title"])
+
+
+def time_parser(parser: Callable[[dict], None], pages: List[dict], repeat: int) -> float:
+    def run() -> None:
+        for page in pages:
+            parser(page)
+    return best_of(run, repeat)
+
+
+def coverage(paths: List[Path]) -> None:
+    reference = {
+        normalize_name(record["name"]): record
+        for record in json.loads(IMPORT_READY_PATH.read_text(encoding="utf-8"))["species"]
+    }
+    found = dict.fromkeys(FIELDS, 0)
+    agree = dict.fromkeys(FIELDS, 0)
+    missing = dict.fromkeys(FIELDS, 0)
+    parsed = compared = 0
+    for record in iter_species(iter_raw_pages(paths)):
+        parsed += 1
+        expected = reference.get(normalize_name(record["name"]))
+        compared += expected is not None
+        for field in FIELDS:
+            value = lookup(record, field)
+            found[field] += bool(value)
+            if expected is None:
+                continue
+            if value == lookup(expected, field):
+                agree[field] += 1
+            elif lookup(expected, field) and not value:
+                missing[field] += 1
+
+    print(f"\nField coverage: {parsed} pages parsed, {compared} also in {IMPORT_READY_PATH.name}")
+    print(f"  {'field':<24}{'filled':>8}{'agree':>8}{'lost':>6}")
+    for field in FIELDS:
+        print(f"  {field:<24}{found[field] / parsed:>7.0%}{agree[field]:>8}{missing[field]:>6}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--raw", type=Path, default=RAW_DIR, help="Directory of raw page dumps.")
+    parser.add_argument("--repeat", type=int, default=5, help="Timing repetitions (best run is reported).")
+    args = parser.parse_args()
+
+    paths = sorted(args.raw.glob("*.json"))
+    pages = list(iter_raw_pages(paths))
+    total_bytes = sum(len(page["wikitext"].encode("utf-8")) for page in pages)
+    legacy = time_parser(legacy_parse, pages, args.repeat)
+    fast = time_parser(wikitext_parse, pages, args.repeat)
+
+    start = time.perf_counter()
+    streamed = sum(1 for _ in iter_species(iter_raw_pages(paths)))
+    end_to_end = time.perf_counter() - start
+
+    print(f"{len(pages)} pages, {total_bytes / 1024:.0f} KiB of wikitext")
+    print(f"  parse_species (C4 rules): {len(pages) / legacy:8.0f} pages/sec")
+    print(f"  parse_wikitext:           {len(pages) / fast:8.0f} pages/sec  {total_bytes / fast / 2**20:6.1f} MiB/s")
+    print(f"  iter_species incl. I/O:   {streamed / end_to_end:8.0f} pages/sec")
+    coverage(paths)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,395 @@
+#!/usr/bin/env python3
+"""Export species and starships as flat columnar tables that open zero-copy with NumPy memory maps.
+
+Tables (one row per entity, children point at their parent's row number):
+
+  species            name, homeworld, attribute dice and every attribute min/max in pips
+  species_abilities  species_row, kind (special / story), name, description
+  starships          name, category, scale, parent, stats in pips, length / cost / speed
+  starship_weapons   starship_row, name, fire arc, fire control and damage in pips
+
+The layout follows Arrow: numbers are typed fixed-width arrays with a
+sentinel for missing values (-1, or NaN for floats), strings are an
+``offsets`` + UTF-8 ``data`` pair, and low-cardinality strings (homeworld,
+category, fire arc, ...) are dictionary encoded as int32 codes plus a small
+string table. Each array is its own ``.npy`` file next to a
+``manifest.json``, so :func:`open_table` maps them with ``mmap_mode="r"``
+and a column scan touches only that column's pages.
+
+``--parquet`` also writes zstd-compressed Parquet files through pyarrow for
+pandas / DuckDB users.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import re
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Union
+
+try:
+    import numpy as np
+except ImportError as exc:  # pragma: no cover
+    raise SystemExit(
+        "NumPy is required. Install with `python3 -m pip install numpy` and rerun."
+    ) from exc
+
+import metrics
+from dice_codes import ATTRIBUTES, to_pips
+from dice_rolls import leading_code
+from metrics import timed
+from search_index import STARSHIP_DATA_DIR, STARSHIP_FILES
+from species_store import ALIENS_PATH, ROOT, SpeciesStore, slugify, write_atomic
+from starship_pipeline import CACHE_PATH as PIPELINE_CACHE_PATH
+from starship_pipeline import RAW_DIR, StageCache, run_pipeline
+
+FORMAT_VERSION = 1
+OUT_DIR = ROOT / ".cache" / "catalog-columns"
+MISSING = -1
+# Strings with at most this share of distinct values are dictionary encoded.
+DICTIONARY_RATIO = 0.5
+MOVE_RE = re.compile(r"\d+")
+
+
+# -- column types --------------------------------------------------------------------------------
+
+
+class StringColumn:
+    """UTF-8 strings as ``offsets`` (int64, n + 1) into one ``data`` byte array, with a ``valid`` mask for None."""
+
+    def __init__(self, offsets: np.ndarray, data: np.ndarray, valid: np.ndarray) -> None:
+        self.offsets = offsets
+        self.data = data
+        self.valid = valid
+
+    @classmethod
+    def from_values(cls, values: Sequence[Optional[str]]) -> "StringColumn":
+        encoded = [(value or "").encode("utf-8") for value in values]
+        offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        np.cumsum([len(blob) for blob in encoded], out=offsets[1:])
+        data = np.frombuffer(b"".join(encoded), dtype=np.uint8).copy()
+        valid = np.array([value is not None for value in values], dtype=bool)
+        return cls(offsets, data, valid)
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __getitem__(self, index: int) -> Optional[str]:
+        if not self.valid[index]:
+            return None
+        return bytes(self.data[self.offsets[index]:self.offsets[index + 1]]).decode("utf-8")
+
+    def __iter__(self) -> Iterator[Optional[str]]:
+        blob = bytes(self.data)
+        offsets = self.offsets.tolist()
+        for index, valid in enumerate(self.valid.tolist()):
+            yield blob[offsets[index]:offsets[index + 1]].decode("utf-8") if valid else None
+
+    def to_list(self) -> List[Optional[str]]:
+        return list(self)
+
+    def arrays(self) -> Dict[str, np.ndarray]:
+        return {"offsets": self.offsets, "data": self.data, "valid": self.valid}
+
+
+class DictionaryColumn:
+    """``codes`` (int32, -1 for None) into a small ``dictionary`` of distinct strings."""
+
+    def __init__(self, codes: np.ndarray, dictionary: StringColumn) -> None:
+        self.codes = codes
+        self.dictionary = dictionary
+        self._values = dictionary.to_list()
+
+    @classmethod
+    def from_values(cls, values: Sequence[Optional[str]]) -> "DictionaryColumn":
+        distinct = sorted({value for value in values if value is not None})
+        lookup = {value: code for code, value in enumerate(distinct)}
+        codes = np.fromiter((lookup.get(value, MISSING) for value in values), dtype=np.int32, count=len(values))
+        return cls(codes, StringColumn.from_values(distinct))
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def __getitem__(self, index: int) -> Optional[str]:
+        code = int(self.codes[index])
+        return self._values[code] if code >= 0 else None
+
+    def __iter__(self) -> Iterator[Optional[str]]:
+        values = self._values
+        return (values[code] if code >= 0 else None for code in self.codes.tolist())
+
+    def to_list(self) -> List[Optional[str]]:
+        return list(self)
+
+    def equals(self, value: str) -> np.ndarray:
+        """Row mask for ``column == value``, one integer comparison per row."""
+        try:
+            return self.codes == self._values.index(value)
+        except ValueError:
+            return np.zeros(len(self.codes), dtype=bool)
+
+    def arrays(self) -> Dict[str, np.ndarray]:
+        return {"codes": self.codes, **{f"dict.{key}": array for key, array in self.dictionary.arrays().items()}}
+
+
+Column = Union[np.ndarray, StringColumn, DictionaryColumn]
+
+
+@dataclass
+class Table:
+    name: str
+    columns: Dict[str, Column]
+
+    def __len__(self) -> int:
+        return len(next(iter(self.columns.values()))) if self.columns else 0
+
+    def __getitem__(self, column: str) -> Column:
+        return self.columns[column]
+
+
+def strings(values: Sequence[Optional[str]], dictionary: Optional[bool] = None) -> Column:
+    """Dictionary encode when asked, or automatically when values repeat enough."""
+    if dictionary is None:
+        distinct = len({value for value in values if value is not None})
+        dictionary = bool(values) and distinct <= len(values) * DICTIONARY_RATIO
+    return DictionaryColumn.from_values(values) if dictionary else StringColumn.from_values(values)
+
+
+def ints(values: Iterable[Optional[int]], dtype=np.int16) -> np.ndarray:
+    return np.array([MISSING if value is None else value for value in values], dtype=dtype)
+
+
+def floats(values: Iterable[Optional[float]]) -> np.ndarray:
+    return np.array([np.nan if value is None else value for value in values], dtype=np.float64)
+
+
+def pips(value: object) -> Optional[int]:
+    count = to_pips(leading_code(value) or "") if isinstance(value, str) else MISSING
+    return count if count >= 0 else None
+
+
+def text(value: object) -> Optional[str]:
+    return value.strip() or None if isinstance(value, str) else None
+
+
+# -- flatten -------------------------------------------------------------------------------------
+
+
+def species_tables(records: Sequence[dict]) -> List[Table]:
+    stats = [record.get("stats") if isinstance(record.get("stats"), dict) else {} for record in records]
+    attributes = [block.get("attributes") if isinstance(block.get("attributes"), dict) else {} for block in stats]
+    columns: Dict[str, Column] = {
+        "slug": strings([slugify(record.get("name") or "") for record in records], dictionary=False),
+        "name": strings([text(record.get("name")) for record in records], dictionary=False),
+        "homeworld": strings([text(record.get("homeworld")) for record in records]),
+        "attribute_dice": ints(pips(block.get("attributeDice")) for block in stats),
+        "move": ints(int(match.group()) if (match := MOVE_RE.search(str(block.get("move") or ""))) else None for block in stats),
+    }
+    for attribute in ATTRIBUTES:
+        for bound in ("min", "max"):
+            columns[f"{attribute}_{bound}"] = ints(
+                pips((block.get(attribute) or {}).get(bound) if isinstance(block.get(attribute), dict) else None)
+                for block in attributes
+            )
+
+    owner: List[int] = []
+    kinds: List[str] = []
+    names: List[Optional[str]] = []
+    descriptions: List[Optional[str]] = []
+    for row, record in enumerate(records):
+        for kind, key in (("special", "specialAbilities"), ("story", "storyFactors")):
+            for entry in record.get(key) or []:
+                if isinstance(entry, dict):
+                    owner.append(row)
+                    kinds.append(kind)
+                    names.append(text(entry.get("name")))
+                    descriptions.append(text(entry.get("description")))
+    abilities = {
+        "species_row": np.array(owner, dtype=np.int32),
+        "kind": strings(kinds, dictionary=True),
+        "name": strings(names),
+        "description": strings(descriptions, dictionary=False),
+    }
+    return [Table("species", columns), Table("species_abilities", abilities)]
+
+
+def starship_tables(ships: Sequence[dict]) -> List[Table]:
+    columns: Dict[str, Column] = {
+        "slug": strings([ship["slug"] for ship in ships], dictionary=False),
+        "name": strings([ship["name"] for ship in ships], dictionary=False),
+        "category": strings([ship.get("category") for ship in ships], dictionary=True),
+        "scale": strings([text(ship.get("scale")) for ship in ships], dictionary=True),
+        "parent": strings([ship.get("parent") for ship in ships], dictionary=True),
+        "is_variant": np.array([bool(ship.get("isVariant")) for ship in ships], dtype=bool),
+        "maneuverability": ints(pips(ship.get("maneuverability")) for ship in ships),
+        "hull": ints(pips(ship.get("hull")) for ship in ships),
+        "shields": ints(pips(ship.get("shields")) for ship in ships),
+        "length_meters": floats(ship.get("lengthMeters") for ship in ships),
+        "cost_new": ints((ship.get("costNew") for ship in ships), dtype=np.int64),
+        "cost_used": ints((ship.get("costUsed") for ship in ships), dtype=np.int64),
+        "space_speed": floats(ship.get("spaceSpeed") for ship in ships),
+        "atmosphere_kmh": ints((ship.get("atmosphereKmh") for ship in ships), dtype=np.int32),
+    }
+
+    owner: List[int] = []
+    weapons: List[dict] = []
+    for row, ship in enumerate(ships):
+        for weapon in ship.get("weapons") or []:
+            owner.append(row)
+            weapons.append(weapon)
+    weapon_columns = {
+        "starship_row": np.array(owner, dtype=np.int32),
+        "name": strings([text(weapon.get("name")) for weapon in weapons]),
+        "fire_arc": strings([text(weapon.get("fireArc")) for weapon in weapons], dictionary=True),
+        "fire_control": ints(pips(weapon.get("fireControl")) for weapon in weapons),
+        "damage": ints(pips(weapon.get("damage")) for weapon in weapons),
+        "space_range": strings([text(weapon.get("spaceRange")) for weapon in weapons]),
+    }
+    return [Table("starships", columns), Table("starship_weapons", weapon_columns)]
+
+
+# -- write / read --------------------------------------------------------------------------------
+
+
+def column_kind(column: Column) -> str:
+    if isinstance(column, DictionaryColumn):
+        return "dictionary"
+    if isinstance(column, StringColumn):
+        return "string"
+    return str(column.dtype)
+
+
+def column_arrays(column: Column) -> Dict[str, np.ndarray]:
+    return column.arrays() if isinstance(column, (StringColumn, DictionaryColumn)) else {"values": column}
+
+
+def write_tables(out_dir: Path, tables: Sequence[Table]) -> Dict[str, dict]:
+    """Write each array as ``<table>/<column>.<part>.npy`` and return the manifest entries."""
+    manifest: Dict[str, dict] = {}
+    for table in tables:
+        table_dir = out_dir / table.name
+        table_dir.mkdir(parents=True, exist_ok=True)
+        for stale in table_dir.glob("*.npy"):
+            stale.unlink()
+        entry = {"rows": len(table), "columns": {}}
+        for name, column in table.columns.items():
+            for part, array in column_arrays(column).items():
+                np.save(table_dir / f"{name}.{part}.npy", np.ascontiguousarray(array), allow_pickle=False)
+            entry["columns"][name] = column_kind(column)
+        manifest[table.name] = entry
+    return manifest
+
+
+def write_export(out_dir: Path, tables: Sequence[Table]) -> None:
+    """Write the column files, then the manifest that describes them."""
+    manifest = {"version": FORMAT_VERSION, "tables": write_tables(out_dir, tables)}
+    write_atomic(out_dir / "manifest.json", [json.dumps(manifest, indent=2), "\n"])
+
+
+def load_column(table_dir: Path, name: str, kind: str, mmap: bool = True) -> Column:
+    mode = "r" if mmap else None
+
+    def part(suffix: str) -> np.ndarray:
+        return np.load(table_dir / f"{name}.{suffix}.npy", mmap_mode=mode, allow_pickle=False)
+
+    if kind == "string":
+        return StringColumn(part("offsets"), part("data"), part("valid"))
+    if kind == "dictionary":
+        return DictionaryColumn(part("codes"), StringColumn(part("dict.offsets"), part("dict.data"), part("dict.valid")))
+    return part("values")
+
+
+def read_manifest(out_dir: Path) -> dict:
+    path = out_dir / "manifest.json"
+    if not path.exists():
+        raise SystemExit(f"No columnar export in {out_dir}; run scripts/catalog_columns.py first.")
+    manifest = json.loads(path.read_text(encoding="utf-8"))
+    if manifest.get("version") != FORMAT_VERSION:
+        raise SystemExit(f"{path} is format {manifest.get('version')}, expected {FORMAT_VERSION}; re-export it.")
+    return manifest
+
+
+def open_table(name: str, out_dir: Path = OUT_DIR, columns: Optional[Sequence[str]] = None, mmap: bool = True) -> Table:
+    """Memory-map a table's columns (all, or just ``columns``); nothing is read until it is touched."""
+    entry = read_manifest(out_dir)["tables"][name]
+    wanted = columns or list(entry["columns"])
+    return Table(name, {column: load_column(out_dir / name, column, entry["columns"][column], mmap) for column in wanted})
+
+
+def write_parquet(out_dir: Path, tables: Sequence[Table]) -> List[Path]:
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError as exc:  # pragma: no cover
+        raise SystemExit(
+            "pyarrow is required for --parquet. Install with `python3 -m pip install pyarrow` and rerun."
+        ) from exc
+
+    def arrow(name: str, column: Column):
+        if isinstance(column, DictionaryColumn):
+            indices = pa.array(column.codes, mask=column.codes < 0)
+            return pa.DictionaryArray.from_arrays(indices, pa.array(column.dictionary.to_list(), pa.string()))
+        if isinstance(column, StringColumn):
+            return pa.array(column.to_list(), pa.string())
+        if column.dtype.kind == "f":
+            return pa.array(column, mask=np.isnan(column))
+        if column.dtype.kind == "i" and not name.endswith("_row"):
+            return pa.array(column, mask=column == MISSING)
+        return pa.array(column)
+
+    written = []
+    for table in tables:
+        arrays = {name: arrow(name, column) for name, column in table.columns.items()}
+        path = out_dir / f"{table.name}.parquet"
+        pq.write_table(pa.table(arrays), path, compression="zstd")
+        written.append(path)
+    return written
+
+
+@timed("columnar_export")
+def export(
+    out_dir: Path = OUT_DIR,
+    aliens: Path = ALIENS_PATH,
+    raw_dir: Optional[Path] = RAW_DIR,
+    species: Optional[Sequence[dict]] = None,
+) -> List[Table]:
+    records = list(species) if species is not None else SpeciesStore.load(aliens).races
+    cache = StageCache(PIPELINE_CACHE_PATH)
+    ships = run_pipeline((STARSHIP_DATA_DIR / name for name in STARSHIP_FILES), raw_dir, cache)
+    cache.save()
+    tables = species_tables(records) + starship_tables(ships)
+    write_export(out_dir, tables)
+    return tables
+
+
+def disk_size(path: Path) -> int:
+    return sum(item.stat().st_size for item in path.rglob("*") if item.is_file())
+
+
+def write_columns(args: argparse.Namespace) -> None:
+    started = time.perf_counter()
+    tables = export(args.out_dir, args.aliens, None if args.no_raw else RAW_DIR)
+    for table in tables:
+        print(f"✅ {table.name}: {len(table)} rows, {len(table.columns)} columns")
+    if args.parquet:
+        for path in write_parquet(args.out_dir, tables):
+            print(f"   {path.name}: {path.stat().st_size / 1024:.1f} KiB")
+    print(f"Wrote {args.out_dir} ({disk_size(args.out_dir) / 1024:.1f} KiB) in {time.perf_counter() - started:.2f}s")
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--out-dir", type=Path, default=OUT_DIR, help="Where the tables are written.")
+    parser.add_argument("--aliens", type=Path, default=ALIENS_PATH, help="Species catalog.")
+    parser.add_argument("--no-raw", action="store_true", help="Build starships from the import-ready files only.")
+    parser.add_argument("--parquet", action="store_true", help="Also write zstd-compressed Parquet (needs pyarrow).")
+    metrics.add_arguments(parser)
+    args = parser.parse_args(argv)
+    with metrics.session("catalog_columns", args.metrics, args.profile):
+        write_columns(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,435 @@
+#!/usr/bin/env python3
+"""Build and query a local SQLite read cache of the species and starship catalogs.
+
+Dice codes are stored as pip counts next to the text (``strength_max`` is 12
+for ``4D``), FTS5 indexes cover description, personality and special
+abilities, and homeworld / category / parent are indexed, so questions like
+"which species have Strength max >= 4D" are one indexed query instead of a
+walk over every JSON file.
+
+Each source (ALIENS.json; the starship import-ready files plus raw pages) is
+rebuilt only when its content hash differs from the one recorded at the last
+build. Examples::
+
+    python3 scripts/catalog_db.py build
+    python3 scripts/catalog_db.py species --where "strength.max>=4D" --where "homeworld~Kashyyyk"
+    python3 scripts/catalog_db.py search "pheromones"
+    python3 scripts/catalog_db.py search --starships --fts '"proton torpedo" OR ion*'
+    python3 scripts/catalog_db.py starships --parent "X-Wing"
+"""
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import re
+import sqlite3
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import metrics
+from dice_codes import ATTRIBUTES, to_pips
+from dice_rolls import leading_code
+from metrics import timed
+from search_index import STARSHIP_DATA_DIR, STARSHIP_FILES
+from source_documents import file_digest
+from species_store import ALIENS_PATH, ROOT, SpeciesStore, slugify
+from starship_pipeline import CACHE_PATH as PIPELINE_CACHE_PATH
+from starship_pipeline import RAW_DIR, StageCache, run_pipeline
+
+SCHEMA_VERSION = 1
+DB_PATH = ROOT / ".cache" / "catalog.sqlite"
+SOURCES = ("species", "starships")
+
+SPECIES_DDL = """
+CREATE TABLE species (
+  id INTEGER PRIMARY KEY,
+  slug TEXT NOT NULL,
+  name TEXT NOT NULL,
+  plural TEXT,
+  homeworld TEXT,
+  move TEXT,
+  size TEXT,
+  attribute_dice TEXT,
+  attribute_dice_pips INTEGER,
+  {attributes},
+  record TEXT NOT NULL
+);
+CREATE INDEX species_slug ON species (slug);
+CREATE INDEX species_homeworld ON species (homeworld COLLATE NOCASE);
+{max_indexes};
+CREATE TABLE species_abilities (
+  species_id INTEGER NOT NULL REFERENCES species (id),
+  kind TEXT NOT NULL,
+  name TEXT,
+  description TEXT
+);
+CREATE INDEX species_abilities_species ON species_abilities (species_id);
+""".format(
+    attributes=",\n  ".join(f"{attribute}_{bound} INTEGER" for attribute in ATTRIBUTES for bound in ("min", "max")),
+    max_indexes=";\n".join(f"CREATE INDEX species_{attribute}_max ON species ({attribute}_max)" for attribute in ATTRIBUTES),
+)
+# Everything but the stored JSON, which is only decoded on request.
+SPECIES_SUMMARY = "id, slug, name, plural, homeworld, move, size, attribute_dice, attribute_dice_pips, " + ", ".join(
+    f"{attribute}_{bound}" for attribute in ATTRIBUTES for bound in ("min", "max")
+)
+SPECIES_FTS_DDL = "CREATE VIRTUAL TABLE species_fts USING fts5(name, description, personality, special_abilities, tokenize='unicode61 remove_diacritics 2');"
+
+STARSHIPS_DDL = """
+CREATE TABLE starships (
+  id INTEGER PRIMARY KEY,
+  slug TEXT NOT NULL UNIQUE,
+  name TEXT NOT NULL,
+  craft TEXT,
+  type TEXT,
+  category TEXT,
+  scale TEXT,
+  parent TEXT,
+  variant_of TEXT,
+  is_variant INTEGER NOT NULL DEFAULT 0,
+  maneuverability_pips INTEGER,
+  hull_pips INTEGER,
+  shields_pips INTEGER,
+  length_meters REAL,
+  cost_new INTEGER,
+  space_speed REAL,
+  atmosphere_kmh INTEGER,
+  record TEXT NOT NULL
+);
+CREATE INDEX starships_category ON starships (category);
+CREATE INDEX starships_parent ON starships (parent COLLATE NOCASE);
+CREATE INDEX starships_variant_of ON starships (variant_of);
+"""
+STARSHIPS_FTS_DDL = "CREATE VIRTUAL TABLE starships_fts USING fts5(name, craft, type, description, weapons, tokenize='unicode61 remove_diacritics 2');"
+
+# ``--where`` fields: species columns, with dice-valued ones compared in pips.
+DICE_FIELDS = {
+    **{f"{attribute}.{bound}": f"{attribute}_{bound}" for attribute in ATTRIBUTES for bound in ("min", "max")},
+    "attributedice": "attribute_dice_pips",
+}
+TEXT_FIELDS = {"name": "name", "slug": "slug", "homeworld": "homeworld", "move": "move", "size": "size"}
+WHERE_RE = re.compile(r"^\s*([\w.]+)\s*(>=|<=|!=|!~|=|~|>|<)\s*(.+?)\s*$")
+# Text fields are prose ("The forest world of Kashyyyk"), so ``~`` / ``!~`` test for a substring.
+LIKE_OPS = {"~": "LIKE", "!~": "NOT LIKE"}
+
+
+def run_script(connection: sqlite3.Connection, script: str) -> None:
+    """``executescript`` without its implicit COMMIT, so a rebuild stays one transaction."""
+    for statement in script.split(";"):
+        if statement.strip():
+            connection.execute(statement)
+
+
+def has_fts5(connection: sqlite3.Connection) -> bool:
+    try:
+        connection.execute("CREATE VIRTUAL TABLE temp.fts5_probe USING fts5(x)")
+        connection.execute("DROP TABLE temp.fts5_probe")
+        return True
+    except sqlite3.OperationalError:
+        return False
+
+
+def fts_query(text: str) -> str:
+    """Each word as an FTS5 string, so ``x-wing`` or a stray quote can't be read as query syntax.
+
+    A trailing ``*`` stays outside the quotes and keeps its prefix meaning.
+    """
+    terms = []
+    for term in text.split():
+        prefix = term.endswith("*") and term.strip("*") != ""
+        term = term.rstrip("*") if prefix else term
+        terms.append('"' + term.replace('"', '""') + '"' + ("*" if prefix else ""))
+    return " ".join(terms)
+
+
+def pips_or_none(value: object) -> Optional[int]:
+    pips = to_pips(leading_code(value) or "") if isinstance(value, str) else -1
+    return pips if pips >= 0 else None
+
+
+def entries_text(entries: object) -> str:
+    if not isinstance(entries, list):
+        return ""
+    return " ".join(
+        f"{entry.get('name') or ''} {entry.get('description') or ''}".strip()
+        for entry in entries if isinstance(entry, dict)
+    )
+
+
+def species_digest(path: Path) -> str:
+    return file_digest(path) if path.exists() else ""
+
+
+def starship_digest(paths: Sequence[Path], raw_dir: Optional[Path]) -> str:
+    files = [path for path in paths if path.exists()]
+    if raw_dir and raw_dir.is_dir():
+        files.extend(sorted(raw_dir.glob("*.json")))
+    digest = hashlib.blake2b(digest_size=16)
+    for path in files:
+        digest.update(f"{path.name}\0{file_digest(path)}\n".encode("utf-8"))
+    return digest.hexdigest()
+
+
+def load_species(connection: sqlite3.Connection, records: Iterable[dict], fts: bool) -> int:
+    run_script(connection, "DROP TABLE IF EXISTS species_abilities; DROP TABLE IF EXISTS species; DROP TABLE IF EXISTS species_fts;")
+    run_script(connection, SPECIES_DDL)
+    if fts:
+        connection.execute(SPECIES_FTS_DDL)
+    columns = ["id", "slug", "name", "plural", "homeworld", "move", "size", "attribute_dice", "attribute_dice_pips"]
+    columns += [f"{attribute}_{bound}" for attribute in ATTRIBUTES for bound in ("min", "max")] + ["record"]
+    insert = f"INSERT INTO species ({','.join(columns)}) VALUES ({','.join('?' * len(columns))})"
+    rows, abilities, texts = [], [], []
+    for index, record in enumerate(records, start=1):
+        stats = record.get("stats") if isinstance(record.get("stats"), dict) else {}
+        attributes = stats.get("attributes") if isinstance(stats.get("attributes"), dict) else {}
+        name = record.get("name") or f"species-{index}"
+        row: List[object] = [
+            index, slugify(name, f"species-{index}"), name, record.get("plural"), record.get("homeworld") or None,
+            stats.get("move") or None, stats.get("size") or None, stats.get("attributeDice") or None,
+            pips_or_none(stats.get("attributeDice")),
+        ]
+        for attribute in ATTRIBUTES:
+            bounds = attributes.get(attribute) if isinstance(attributes.get(attribute), dict) else {}
+            row += [pips_or_none(bounds.get("min")), pips_or_none(bounds.get("max"))]
+        row.append(json.dumps(record, ensure_ascii=False))
+        rows.append(row)
+        for kind, key in (("special", "specialAbilities"), ("story", "storyFactors")):
+            for entry in record.get(key) or []:
+                if isinstance(entry, dict):
+                    abilities.append((index, kind, entry.get("name"), entry.get("description")))
+        texts.append((index, name, record.get("description") or "", record.get("personality") or "", entries_text(record.get("specialAbilities"))))
+    connection.executemany(insert, rows)
+    connection.executemany("INSERT INTO species_abilities VALUES (?, ?, ?, ?)", abilities)
+    if fts:
+        connection.executemany("INSERT INTO species_fts (rowid, name, description, personality, special_abilities) VALUES (?, ?, ?, ?, ?)", texts)
+    return len(rows)
+
+
+def load_starships(connection: sqlite3.Connection, ships: Iterable[dict], fts: bool) -> int:
+    run_script(connection, "DROP TABLE IF EXISTS starships; DROP TABLE IF EXISTS starships_fts;")
+    run_script(connection, STARSHIPS_DDL)
+    if fts:
+        connection.execute(STARSHIPS_FTS_DDL)
+    rows, texts = [], []
+    for index, ship in enumerate(ships, start=1):
+        rows.append((
+            index, ship["slug"], ship["name"], ship.get("craft"), ship.get("type"), ship.get("category"), ship.get("scale"),
+            ship.get("parent"), ship.get("variantOf"), int(bool(ship.get("isVariant"))),
+            pips_or_none(ship.get("maneuverability")), pips_or_none(ship.get("hull")), pips_or_none(ship.get("shields")),
+            ship.get("lengthMeters"), ship.get("costNew"), ship.get("spaceSpeed"), ship.get("atmosphereKmh"),
+            json.dumps(ship, ensure_ascii=False),
+        ))
+        weapons = " ".join(weapon.get("name") or "" for weapon in ship.get("weapons") or [])
+        texts.append((index, ship["name"], ship.get("craft") or "", ship.get("type") or "", ship.get("description") or "", weapons))
+    connection.executemany(f"INSERT INTO starships VALUES ({','.join('?' * 18)})", rows)
+    if fts:
+        connection.executemany("INSERT INTO starships_fts (rowid, name, craft, type, description, weapons) VALUES (?, ?, ?, ?, ?, ?)", texts)
+    return len(rows)
+
+
+class CatalogDB:
+    """Read API over the cache; :meth:`open` brings stale sources up to date first."""
+
+    def __init__(self, connection: sqlite3.Connection) -> None:
+        self.connection = connection
+        self.connection.row_factory = sqlite3.Row
+        self.fts = has_fts5(connection)
+
+    @classmethod
+    def open(
+        cls,
+        path: Path = DB_PATH,
+        aliens: Path = ALIENS_PATH,
+        raw_dir: Optional[Path] = RAW_DIR,
+        refresh: bool = True,
+        force: bool = False,
+    ) -> "CatalogDB":
+        path.parent.mkdir(parents=True, exist_ok=True)
+        db = cls(sqlite3.connect(path, isolation_level=None))
+        if refresh:
+            db.refresh(aliens, raw_dir, force=force)
+        return db
+
+    def close(self) -> None:
+        self.connection.close()
+
+    def __enter__(self) -> "CatalogDB":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    # -- build -----------------------------------------------------------------------------------
+
+    def recorded_digests(self) -> Dict[str, str]:
+        self.connection.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+        found = dict(self.connection.execute("SELECT key, value FROM meta").fetchall())
+        if found.get("schema") != str(SCHEMA_VERSION) or found.get("fts") != str(int(self.fts)):
+            return {}
+        return {source: found.get(f"digest:{source}", "") for source in SOURCES}
+
+    @timed("catalog_db_refresh")
+    def refresh(self, aliens: Path = ALIENS_PATH, raw_dir: Optional[Path] = RAW_DIR, force: bool = False) -> Dict[str, str]:
+        """Rebuild each source whose digest changed; returns ``{source: "rebuilt N rows" | "current"}``."""
+        recorded = {} if force else self.recorded_digests()
+        starship_paths = [STARSHIP_DATA_DIR / name for name in STARSHIP_FILES]
+        digests = {"species": species_digest(aliens), "starships": starship_digest(starship_paths, raw_dir)}
+        status: Dict[str, str] = {}
+        self.connection.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+        self.connection.execute("BEGIN")
+        try:
+            for source in SOURCES:
+                if recorded.get(source) == digests[source] and digests[source]:
+                    status[source] = "current"
+                    continue
+                if source == "species":
+                    count = load_species(self.connection, SpeciesStore.load(aliens) if aliens.exists() else [], self.fts)
+                else:
+                    cache = StageCache(PIPELINE_CACHE_PATH)
+                    count = load_starships(self.connection, run_pipeline(starship_paths, raw_dir, cache), self.fts)
+                    cache.save()
+                self.connection.execute("REPLACE INTO meta VALUES (?, ?)", (f"digest:{source}", digests[source]))
+                status[source] = f"rebuilt {count} rows"
+            self.connection.executemany(
+                "REPLACE INTO meta VALUES (?, ?)", [("schema", str(SCHEMA_VERSION)), ("fts", str(int(self.fts)))]
+            )
+            self.connection.execute("COMMIT")
+        except BaseException:
+            self.connection.execute("ROLLBACK")
+            raise
+        return status
+
+    # -- queries ---------------------------------------------------------------------------------
+
+    def species(self, where: Sequence[str] = (), order: str = "name") -> List[sqlite3.Row]:
+        """Species matching every ``field op value`` filter, e.g. ``strength.max>=4D`` or ``homeworld~Kashyyyk``."""
+        clauses, params = [], []
+        for condition in where:
+            clause, value = parse_where(condition)
+            clauses.append(clause)
+            params.append(value)
+        order_column = DICE_FIELDS.get(order.lower()) or TEXT_FIELDS.get(order.lower()) or "name"
+        sql = f"SELECT {SPECIES_SUMMARY} FROM species" + (f" WHERE {' AND '.join(clauses)}" if clauses else "")
+        return self.connection.execute(f"{sql} ORDER BY {order_column}, name", params).fetchall()
+
+    def starships(self, category: Optional[str] = None, parent: Optional[str] = None) -> List[sqlite3.Row]:
+        clauses, params = [], []
+        if category:
+            clauses.append("category = ?")
+            params.append(category.lower())
+        if parent:
+            clauses.append("(parent = ? COLLATE NOCASE OR variant_of = ?)")
+            params += [parent, slugify(parent)]
+        sql = "SELECT * FROM starships" + (f" WHERE {' AND '.join(clauses)}" if clauses else "")
+        return self.connection.execute(f"{sql} ORDER BY name", params).fetchall()
+
+    def record(self, kind: str, slug: str) -> Optional[dict]:
+        """The full catalog record behind a ``species`` or ``starships`` row."""
+        table = "species" if kind == "species" else "starships"
+        row = self.connection.execute(f"SELECT record FROM {table} WHERE slug = ?", (slug,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def abilities(self, species_id: int) -> List[sqlite3.Row]:
+        return self.connection.execute(
+            "SELECT kind, name, description FROM species_abilities WHERE species_id = ? ORDER BY rowid", (species_id,)
+        ).fetchall()
+
+    def search(self, text: str, kind: str = "species", limit: int = 20, raw: bool = False) -> List[Tuple[str, str]]:
+        """``(name, snippet)`` best matches for every word of ``text`` (``claw*`` matches a prefix).
+
+        With ``raw`` the text goes to FTS5 as-is, so phrases, ``OR`` and
+        ``NEAR`` work but a malformed query raises ``sqlite3.OperationalError``.
+        """
+        table = "species" if kind == "species" else "starships"
+        if self.fts:
+            rows = self.connection.execute(
+                f"SELECT t.name, snippet({table}_fts, -1, '[', ']', '…', 12) FROM {table}_fts "
+                f"JOIN {table} t ON t.id = {table}_fts.rowid WHERE {table}_fts MATCH ? ORDER BY rank LIMIT ?",
+                (text if raw else fts_query(text), limit),
+            ).fetchall()
+            return [(row[0], row[1]) for row in rows]
+        # No FTS5 in this SQLite build: substring match over the stored records.
+        pattern = f"%{text}%"
+        rows = self.connection.execute(
+            f"SELECT name, '' FROM {table} WHERE record LIKE ? ORDER BY name LIMIT ?", (pattern, limit)
+        ).fetchall()
+        return [(row[0], row[1]) for row in rows]
+
+
+def parse_where(condition: str) -> Tuple[str, object]:
+    """``"strength.max>=4D"`` -> ``("strength_max >= ?", 12)``; ``"homeworld~Kashyyyk"`` -> a ``LIKE '%Kashyyyk%'``."""
+    match = WHERE_RE.match(condition)
+    if not match:
+        raise ValueError(f"Expected FIELD OP VALUE, got {condition!r}")
+    field, op, value = match.group(1).lower(), match.group(2), match.group(3).strip("'\"")
+    if field in DICE_FIELDS:
+        pips = to_pips(value)
+        if pips < 0:
+            raise ValueError(f"{value!r} is not a dice code")
+        return f"{DICE_FIELDS[field]} {op} ?", pips
+    if field in TEXT_FIELDS:
+        if op in LIKE_OPS:
+            pattern = "%" + re.sub(r"([\\%_])", r"\\\1", value) + "%"
+            return f"{TEXT_FIELDS[field]} {LIKE_OPS[op]} ? ESCAPE '\\'", pattern
+        if op not in ("=", "!="):
+            raise ValueError(f"{field} only supports =, !=, ~ (contains) and !~")
+        return f"{TEXT_FIELDS[field]} {op} ? COLLATE NOCASE", value
+    raise ValueError(f"Unknown field {field!r}; use one of {', '.join(sorted({**DICE_FIELDS, **TEXT_FIELDS}))}")
+
+
+def run(args: argparse.Namespace) -> None:
+    raw_dir = None if args.no_raw else RAW_DIR
+    started = time.perf_counter()
+    with CatalogDB.open(args.db, args.aliens, raw_dir, refresh=False) as db:
+        status = db.refresh(args.aliens, raw_dir, force=getattr(args, "force", False))
+        if args.command == "build":
+            for source, state in status.items():
+                print(f"{'✅' if state != 'current' else '⏭️ '} {source}: {state}")
+            print(f"{args.db} ready in {time.perf_counter() - started:.2f}s{'' if db.fts else ' (no FTS5: search falls back to LIKE)'}")
+            return
+        try:
+            if args.command == "species":
+                rows = db.species(args.where, args.order)
+                for row in rows:
+                    print(f"{row['name']:<28} {row['homeworld'] or '—':<28} {row['attribute_dice'] or '—'}")
+                print(f"\n{len(rows)} species")
+            elif args.command == "starships":
+                rows = db.starships(args.category, args.parent)
+                for row in rows:
+                    print(f"{row['name']:<44} {row['category'] or '—':<12} {row['parent'] or ''}")
+                print(f"\n{len(rows)} starships")
+            else:
+                for name, snippet in db.search(args.text, "starships" if args.starships else "species", args.limit, args.fts):
+                    print(f"{name}: {snippet}" if snippet else name)
+        except (ValueError, sqlite3.OperationalError) as exc:
+            raise SystemExit(f"❌ {exc}") from exc
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--db", type=Path, default=DB_PATH, help="SQLite cache file.")
+    parser.add_argument("--aliens", type=Path, default=ALIENS_PATH, help="Species catalog.")
+    parser.add_argument("--no-raw", action="store_true", help="Build starships from the import-ready files only.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    build = commands.add_parser("build", help="Rebuild sources whose files changed.")
+    build.add_argument("--force", action="store_true", help="Rebuild everything.")
+    species = commands.add_parser("species", help="List species matching filters.")
+    species.add_argument("--where", action="append", default=[], help="FIELD OP VALUE, e.g. strength.max>=4D or homeworld~Kashyyyk (repeatable).")
+    species.add_argument("--order", default="name", help="Sort field, e.g. attributeDice or strength.max.")
+    starships = commands.add_parser("starships", help="List starships by category or parent.")
+    starships.add_argument("--category", choices=("starfighter", "transport", "capital"))
+    starships.add_argument("--parent", help="Family or base ship name, e.g. 'X-Wing'.")
+    search = commands.add_parser("search", help="Full-text search.")
+    search.add_argument("text")
+    search.add_argument("--starships", action="store_true", help="Search starships instead of species.")
+    search.add_argument("--limit", type=int, default=20)
+    search.add_argument("--fts", action="store_true", help="Pass TEXT through as FTS5 query syntax (phrases, OR, NEAR).")
+    metrics.add_arguments(parser)
+    args = parser.parse_args(argv)
+    with metrics.session("catalog_db", args.metrics, args.profile):
+        run(args)
+
+
+if __name__ == "__main__":
+    main()
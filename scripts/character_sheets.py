@@ -0,0 +1,611 @@
+#!/usr/bin/env python3
+"""Parse character sheets (text rosters and fillable PDF sheets) into character records and batched SQL.
+
+Text files hold one or more sheets separated by ``____`` rules, laid out
+like ``Source Data/Characters/Thursday.txt``:
+
+* a ``Name — Description`` header, optionally ending in ``(Species)``;
+* a ``Force Sensitive: … • Move: … • CP/FP: … • Credits: …`` line;
+* attribute lines (``DEXTERITY 3D+2``), each followed by skill bonuses, where
+  an indented line is a specialization of the skill above it;
+* ``WEAPONS:``, ``ARMOR:`` and ``GEAR:`` lines.
+
+PDFs are the fillable D6 sheet (``BlankSheet.pdf``). Their AcroForm field
+values are read directly, so no page layout is guessed.
+
+Files are parsed across a process pool. Species are then resolved once, in
+the parent process, through a NameResolver index over ALIENS.json (with
+holocron titles as a fallback). Every dice code is stored with its pip
+count. Records use the ``characters`` table shape, and ``data`` follows
+``CharacterData`` in web/src/types/character.types.ts. Ids are stable
+UUIDs derived from the owner and the character name, so re-importing a
+roster updates rows instead of duplicating them.
+
+Usage:
+    python3 scripts/character_sheets.py "Source Data/Characters" --user-id UID --sql characters.sql
+    python3 scripts/character_sheets.py rosters/ --user-id UID --sqlite dev.sqlite --create
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import re
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import metrics
+from dice_codes import ATTRIBUTES, PLACEHOLDERS, format_code, to_pips
+from metrics import count, timed
+from name_resolver import RACES_INDEX_PATH, NameResolver
+from species_store import ROOT, SpeciesStore, slugify, write_atomic
+from sql_loader import (
+    DEFAULT_CHUNK_SIZE,
+    SCHEMA_PATH,
+    Table,
+    chunk_size_for,
+    chunked,
+    connect,
+    create_schema,
+    emit_statements,
+    execute_plans,
+    plan_load,
+)
+
+SHEETS_DIR = ROOT / "Source Data" / "Characters"
+OUT_PATH = ROOT / ".cache" / "characters.json"
+SHEET_SUFFIXES = (".txt", ".pdf")
+CHARACTERS = Table("characters", ("id", "user_id", "name", "species_slug", "data"), frozenset({"data"}), key="id")
+ID_NAMESPACE = uuid.uuid5(uuid.NAMESPACE_URL, "https://github.com/smkun/Star-Wars-d6/characters")
+
+FORCE_ATTRIBUTES = ("control", "sense", "alter")
+# The fillable sheet abbreviates attributes in its field names: CharDEX, CharDEXSkill.0, CharDEXSkillDice.0.
+FORM_ATTRIBUTES = dict(zip(ATTRIBUTES, ("DEX", "KNO", "MEC", "PER", "STR", "TEC")))
+
+SHEET_RULE_RE = re.compile(r"^\s*_{5,}\s*$", re.M)
+HEADER_RE = re.compile(r"^(?P<name>.+?)\s+[—–]\s+(?P<description>.+)$")
+TRAILING_PAREN_RE = re.compile(r"\s*\((?P<inner>[^()]*)\)\s*$")
+ATTRIBUTE_RE = re.compile(r"^(?P<name>[A-Za-z]+)\s+(?P<code>\d+\s*D(?:\s*[+-]\s*\d+)?)$")
+SKILL_RE = re.compile(r"^(?P<indent>\s*)(?P<name>\S.*?)\s+(?P<bonus>[+-]\s*\d+\s*D(?:\s*\+\s*\d+)?|[+-]\s*\d+)$")
+SECTION_RE = re.compile(r"^(?P<label>WEAPONS|ARMOR|ARMOUR|GEAR|EQUIPMENT)\s*:\s*(?P<value>.*)$", re.I)
+FORCE_SKILL_RE = re.compile(r"^(?P<name>control|sense|alter)\s+(?P<bonus>\+?\d+D(?:\+\d+)?)\s*(?:\((?P<notes>.*)\))?$", re.I)
+RANGE_RE = re.compile(r"^\d+\s*[-–]\s*\d+(?:\s*/\s*[\d.]+)+(?:\s*k?m)?$")
+DAMAGE_RE = re.compile(r"^(?:STR\s*\+\s*)?\d+D(?:\+\d+)?$", re.I)
+ARMOR_VALUE_RE = re.compile(r"^(?P<value>[+-]?\d+D?(?:\+\d+)?)\s+(?P<kind>phys\w*|eng\w*|energy)$", re.I)
+NUMBER_RE = re.compile(r"\d[\d,]*")
+
+
+@dataclass
+class Sheet:
+    """One parsed sheet before species resolution."""
+
+    source: str
+    name: str
+    description: str
+    data: dict
+    species: Optional[str] = None  # named explicitly: a "(Human)" suffix or the sheet's species field
+    warnings: List[str] = field(default_factory=list)
+
+
+def clean(value: Optional[str]) -> str:
+    text = " ".join((value or "").split())
+    return "" if text.casefold() in PLACEHOLDERS else text
+
+
+def split_top_level(text: str, separators: str = ",;") -> List[str]:
+    """Split on ``separators`` outside parentheses: ``"A (5D; 3-10), B"`` -> ``["A (5D; 3-10)", "B"]``."""
+    parts, depth, current = [], 0, []
+    for ch in text:
+        if ch == "(":
+            depth += 1
+        elif ch == ")":
+            depth = max(0, depth - 1)
+        if ch in separators and not depth:
+            parts.append("".join(current))
+            current = []
+        else:
+            current.append(ch)
+    parts.append("".join(current))
+    return [part.strip() for part in parts if clean(part)]
+
+
+def split_name(text: str) -> Tuple[str, List[str]]:
+    """``"Vibro Ax (STR+3D, max 7D)"`` -> ``("Vibro Ax", ["STR+3D", "max 7D"])``."""
+    match = TRAILING_PAREN_RE.search(text)
+    if not match:
+        return text.strip(), []
+    return text[:match.start()].strip(), split_top_level(match.group("inner"))
+
+
+def bonus_pips(text: str) -> int:
+    """``"+2D"`` -> 6, ``"+1D+1"`` -> 4, ``"+2"`` -> 2."""
+    compact = "".join(text.split())
+    sign = -1 if compact.startswith("-") else 1
+    compact = compact.lstrip("+-")
+    pips = int(compact) if compact.isdigit() else to_pips(compact)
+    return sign * pips if pips >= 0 else pips
+
+
+def block(code: str) -> dict:
+    return {"dice": code, "pips": to_pips(code), "skills": []}
+
+
+def skill(name: str, pips: int, specialization: bool = False) -> dict:
+    entry = {"name": name, "dice": format_code(pips), "pips": pips}
+    if specialization:
+        entry["isSpecialization"] = True
+    return entry
+
+
+def to_int(text: str) -> Optional[int]:
+    match = NUMBER_RE.search(text or "")
+    return int(match.group().replace(",", "")) if match else None
+
+
+def parse_weapon(text: str) -> dict:
+    name, details = split_name(text)
+    weapon: dict = {"name": name}
+    notes = []
+    for detail in details:
+        if "damage" not in weapon and DAMAGE_RE.match(detail.replace(" ", "")):
+            weapon["damage"] = detail.replace(" ", "")
+        elif "range" not in weapon and RANGE_RE.match(detail):
+            weapon["range"] = detail.replace("–", "-").replace(" ", "")
+        elif "ammo" not in weapon and detail.isdigit():
+            weapon["ammo"] = int(detail)
+        else:
+            notes.append(detail)
+    if notes:
+        weapon["notes"] = "; ".join(notes)
+    return weapon
+
+
+def parse_armor(text: str) -> Optional[dict]:
+    name, details = split_name(text)
+    armor: dict = {}
+    notes = []
+    for detail in details:
+        match = ARMOR_VALUE_RE.match(detail.replace("−", "-"))
+        if match:
+            key = "protectionPhysical" if match.group("kind").lower().startswith("phys") else "protectionEnergy"
+            armor.setdefault(key, match.group("value"))
+        else:
+            notes.append(detail)
+    if not clean(name):
+        # "— (chassis only)": no armor worn, only a note about it.
+        if not notes:
+            return None
+        name, notes = notes[0][:1].upper() + notes[0][1:], notes[1:]
+    armor = {"name": name, **armor}
+    if notes:
+        armor["notes"] = "; ".join(notes)
+    return armor
+
+
+def parse_stats(line: str, data: dict, warnings: List[str]) -> None:
+    """``Force Sensitive: No • Move: 10 • CP/FP: 5/1 • Credits: 500 (+4 medpacs)``."""
+    for part in line.split("•"):
+        key, _, value = part.partition(":")
+        key, value = key.strip().casefold(), value.strip()
+        if key == "force sensitive":
+            data["forceSensitive"] = value.casefold().startswith("y")
+        elif key == "move":
+            data["move"] = value
+        elif key in ("cp/fp", "cp / fp"):
+            points = [to_int(number) for number in value.split("/")]
+            data["characterPoints"], data["forcePoints"] = (points + [None, None])[:2]
+        elif key in ("cp", "character points"):
+            data["characterPoints"] = to_int(value)
+        elif key in ("fp", "force points"):
+            data["forcePoints"] = to_int(value)
+        elif key in ("dsp", "dark side points"):
+            data["darkSidePoints"] = to_int(value)
+        elif key == "credits":
+            amount, extras = split_name(value)
+            data["credits"] = to_int(amount)
+            data.setdefault("equipment", []).extend({"name": extra.lstrip("+ ")} for extra in extras)
+        elif key:
+            warnings.append(f"unknown stat {key!r}")
+
+
+def parse_force_skills(text: str, data: dict) -> None:
+    """``Control +1D; Sense +1D (3 starting powers …)`` -> control/sense blocks."""
+    for part in split_top_level(text, ";"):
+        match = FORCE_SKILL_RE.match(part)
+        if not match:
+            data.setdefault("notes", []).append(part)
+            continue
+        data[match.group("name").lower()] = block(format_code(bonus_pips(match.group("bonus"))))
+        if match.group("notes"):
+            data.setdefault("notes", []).append(match.group("notes").strip())
+
+
+def parse_text_sheet(text: str, source: str) -> Optional[Sheet]:
+    lines = [line.rstrip() for line in text.splitlines() if line.strip()]
+    if not lines:
+        return None
+    header = HEADER_RE.match(lines[0].strip())
+    if not header:
+        return Sheet(source, lines[0].strip(), "", {}, warnings=["no 'Name — Description' header; sheet skipped"])
+    name = header.group("name").strip().strip("\"“”'")
+    description = header.group("description").strip()
+    species = None
+    match = TRAILING_PAREN_RE.search(description)
+    if match:
+        species, description = match.group("inner").strip(), description[:match.start()].strip()
+    sheet = Sheet(source, name, description, {}, species)
+    data = sheet.data
+
+    attribute: Optional[dict] = None
+    parent: Optional[dict] = None
+    section = None
+    for line in lines[1:]:
+        stripped = line.strip()
+        attribute_match = ATTRIBUTE_RE.match(stripped)
+        section_match = SECTION_RE.match(stripped)
+        if "•" in stripped or stripped.casefold().startswith("force sensitive"):
+            parse_stats(stripped, data, sheet.warnings)
+        elif stripped.casefold().startswith("force skills:"):
+            parse_force_skills(stripped.partition(":")[2], data)
+        elif attribute_match and attribute_match.group("name").lower() in ATTRIBUTES:
+            attribute = data[attribute_match.group("name").lower()] = block("".join(attribute_match.group("code").split()))
+            parent, section = None, None
+        elif section_match:
+            section = section_match.group("label").upper()
+            attribute = parent = None
+            value = section_match.group("value")
+            if section == "WEAPONS":
+                data.setdefault("weapons", []).extend(parse_weapon(item) for item in split_top_level(value))
+            elif section in ("ARMOR", "ARMOUR"):
+                armor = parse_armor(value)
+                if armor:
+                    data.setdefault("armor", []).append(armor)
+            else:
+                data.setdefault("equipment", []).extend({"name": item} for item in split_top_level(value, ","))
+        elif attribute is not None and SKILL_RE.match(line):
+            skill_match = SKILL_RE.match(line)
+            bonus = bonus_pips(skill_match.group("bonus"))
+            if bonus < 0:
+                sheet.warnings.append(f"unreadable skill bonus in {stripped!r}")
+                continue
+            if skill_match.group("indent") and parent is not None:
+                attribute["skills"].append(skill(skill_match.group("name"), parent["pips"] + bonus, True))
+            else:
+                parent = skill(skill_match.group("name"), max(attribute["pips"], 0) + bonus)
+                attribute["skills"].append(parent)
+        else:
+            # Free-form lines such as house rules under WEAPONS.
+            data.setdefault("notes", []).append(stripped)
+    if "notes" in data:
+        data["notes"] = "\n".join(data["notes"])
+    missing = [name for name in ATTRIBUTES if name not in data]
+    if missing:
+        sheet.warnings.append(f"missing attributes: {', '.join(missing)}")
+    return sheet
+
+
+def parse_text_file(path: Path) -> List[Sheet]:
+    sheets = (parse_text_sheet(chunk, str(path)) for chunk in SHEET_RULE_RE.split(path.read_text(encoding="utf-8")))
+    return [sheet for sheet in sheets if sheet is not None]
+
+
+def require_pdfminer_forms():
+    try:
+        from pdfminer.pdfdocument import PDFDocument
+        from pdfminer.pdfparser import PDFParser
+        from pdfminer.pdftypes import resolve1
+        from pdfminer.psparser import PSLiteral
+        from pdfminer.utils import decode_text
+    except ImportError as exc:  # pragma: no cover
+        raise SystemExit(
+            "pdfminer.six is required. Install with `python3 -m pip install pdfminer.six` and rerun."
+        ) from exc
+    return PDFDocument, PDFParser, resolve1, PSLiteral, decode_text
+
+
+def read_form_fields(path: Path) -> Dict[str, str]:
+    """AcroForm field values by dotted name, minus numeric root groups: ``{"CharDEXSkill.0": "Blaster"}``."""
+    PDFDocument, PDFParser, resolve1, PSLiteral, decode_text = require_pdfminer_forms()
+
+    def text(value) -> str:
+        value = resolve1(value)
+        if isinstance(value, bytes):
+            return decode_text(value)
+        if isinstance(value, PSLiteral):
+            return str(value.name)
+        if isinstance(value, list):
+            return ", ".join(text(item) for item in value)
+        return "" if value is None else str(value)
+
+    fields: Dict[str, str] = {}
+
+    def walk(node, parts: Tuple[str, ...]) -> None:
+        node = resolve1(node)
+        if not isinstance(node, dict):
+            return
+        name = text(node.get("T")).strip()
+        if name and (parts or not name.isdigit()):
+            parts = parts + (name,)
+        kids = resolve1(node.get("Kids"))
+        if kids:
+            for kid in kids:
+                walk(kid, parts)
+        elif parts and "V" in node:
+            fields.setdefault(".".join(parts), text(node.get("V")))
+
+    with path.open("rb") as handle:
+        document = PDFDocument(PDFParser(handle))
+        form = resolve1(document.catalog.get("AcroForm"))
+        for node in resolve1(form.get("Fields")) if isinstance(form, dict) else []:
+            walk(node, ())
+    return fields
+
+
+def indexed(fields: Dict[str, str], prefix: str) -> Dict[int, str]:
+    """``CharDEXSkill.0``, ``CharDEXSkill.1`` … (or ``CharEQPMT1`` …) -> ``{0: …, 1: …}`` with blanks dropped."""
+    found: Dict[int, str] = {}
+    for key, value in fields.items():
+        suffix = key[len(prefix):].lstrip(".") if key.startswith(prefix) else ""
+        if suffix.isdigit() and clean(value):
+            found[int(suffix)] = clean(value)
+    return dict(sorted(found.items()))
+
+
+def form_sheet(fields: Dict[str, str], source: str) -> Optional[Sheet]:
+    """Map the fillable sheet's fields onto CharacterData; ``None`` for an unfilled sheet."""
+    def value(key: str) -> str:
+        return clean(fields.get(key))
+
+    def joined(*keys: str) -> str:
+        return " ".join(filter(None, map(value, keys)))
+
+    data: dict = {}
+    for attribute, abbreviation in FORM_ATTRIBUTES.items():
+        code = value(f"Char{abbreviation}")
+        if not code:
+            continue
+        data[attribute] = block(code)
+        dice = indexed(fields, f"Char{abbreviation}SkillDice")
+        for index, name in indexed(fields, f"Char{abbreviation}Skill").items():
+            # The sheet records skill totals, not bonuses over the attribute.
+            total = to_pips(dice.get(index, ""))
+            data[attribute]["skills"].append(skill(name, total) if total >= 0 else {"name": name, "dice": dice.get(index, "")})
+    if not any(entry["pips"] >= 0 for entry in data.values()):
+        return None
+    for attribute in FORCE_ATTRIBUTES:
+        code = value(f"CharFORCE{attribute.upper()}")
+        if to_pips(code) >= 0:
+            data[attribute] = block(code)
+
+    details = {
+        "type": value("CharType"),
+        "homeworld": value("CharHomeworld"),
+        "gender": value("CharGender"),
+        "age": value("CharAge"),
+        "height": value("CharHeight"),
+        "weight": value("CharWeight"),
+        "move": value("CharMove"),
+        "appearance": joined("CharPhysicalDescription", "CharPhysicalDescription2", "CharPhysicalDescription3"),
+        "personality": joined("CharPersonality1", "CharPersonality2"),
+        "quote": value("CharQuote"),
+        "background": " ".join(indexed(fields, "CharBACKGROUND").values()),
+    }
+    data.update({key: text for key, text in details.items() if text})
+
+    names, ranges, damages = (indexed(fields, f"CharWPN{part}") for part in ("Name", "Rng", "Dmg"))
+    weapons = []
+    for index, name in names.items():
+        weapon = {"name": name, "range": ranges.get(index), "damage": damages.get(index)}
+        weapons.append({key: text for key, text in weapon.items() if text})
+    if weapons:
+        data["weapons"] = weapons
+    if value("CharARMName"):
+        armor = {
+            "name": value("CharARMName"),
+            "strBonus": value("CharARMStrBonus"),
+            "dexPenalty": value("CharARMDexPenalty"),
+            "notes": " ".join(indexed(fields, "CharARMNotes").values()),
+        }
+        data["armor"] = [{key: text for key, text in armor.items() if text}]
+    equipment = indexed(fields, "CharEQPMT")
+    if equipment:
+        data["equipment"] = [{"name": name} for name in equipment.values()]
+    abilities = indexed(fields, "CharSPEC")
+    if abilities:
+        data["specialAbilities"] = list(abilities.values())
+
+    for key, target in (("CharCREDITS", "credits"), ("CharPoints", "characterPoints"),
+                        ("CharFORCEPOINTS", "forcePoints"), ("CharDARKSIDEPOINTS", "darkSidePoints")):
+        number = to_int(value(key))
+        if number is not None:
+            data[target] = number
+    if value("CharFORCESENSITIVE"):
+        data["forceSensitive"] = value("CharFORCESENSITIVE").casefold() in ("yes", "y", "on", "true", "x")
+    health = {
+        key: value(f"CharHEALTH{key}").casefold() not in ("", "off", "no")
+        for key in ("stunned", "wounded", "incapacitated", "mortallywounded")
+    }
+    if any(health.values()):
+        data["health"] = {("mortallyWounded" if key == "mortallywounded" else key): flag for key, flag in health.items()}
+
+    sheet = Sheet(source, value("CharName"), value("CharType"), data, value("CharSpecies") or None)
+    missing = [name for name in ATTRIBUTES if name not in data]
+    if missing:
+        sheet.warnings.append(f"missing attributes: {', '.join(missing)}")
+    if not sheet.name:
+        sheet.warnings.append("no character name; sheet skipped")
+    return sheet
+
+
+def parse_file(path: Path) -> Tuple[List[Sheet], List[str]]:
+    """Pool task: every sheet in one file, plus file-level problems."""
+    try:
+        if path.suffix.lower() == ".pdf":
+            sheet = form_sheet(read_form_fields(path), str(path))
+            return ([sheet], []) if sheet else ([], [f"{path.name}: no filled-in attributes (blank sheet?)"])
+        return parse_text_file(path), []
+    except (OSError, UnicodeDecodeError, ValueError) as exc:
+        return [], [f"{path.name}: {type(exc).__name__}: {exc}"]
+
+
+@timed()
+def parse_files(paths: List[Path], workers: Optional[int] = None) -> Tuple[List[Sheet], List[str]]:
+    if len(paths) == 1 or workers == 1:
+        results = [parse_file(path) for path in paths]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(parse_file, paths, chunksize=4))
+    sheets = [sheet for found, _ in results for sheet in found]
+    problems = [problem for _, found in results for problem in found]
+    return sheets, problems
+
+
+def collect_paths(inputs: Iterable[Path]) -> List[Path]:
+    paths: List[Path] = []
+    for path in inputs:
+        if path.is_dir():
+            paths.extend(sorted(child for child in path.rglob("*") if child.suffix.lower() in SHEET_SUFFIXES))
+        elif path.is_file():
+            paths.append(path)
+        else:
+            raise SystemExit(f"❌ No such file or directory: {path}")
+    return paths
+
+
+def species_index(store: SpeciesStore, titles: Iterable[str] = (), min_confidence: float = 0.85) -> NameResolver[Tuple[str, str]]:
+    """Catalog names and plurals first, then holocron titles for species not in the catalog yet."""
+    resolver: NameResolver[Tuple[str, str]] = NameResolver(min_confidence=min_confidence)
+    for record in store:
+        if record.get("name"):
+            resolver.add(record["name"], (slugify(record["name"]), record["name"]))
+    for record in store:
+        if record.get("name") and record.get("plural"):
+            resolver.add(record["plural"], (slugify(record["name"]), record["name"]))
+    for title in titles:
+        resolver.add(title, (slugify(title), title))
+    return resolver
+
+
+def resolve_species(sheet: Sheet, resolver: NameResolver[Tuple[str, str]]) -> Tuple[Optional[Tuple[str, str]], str]:
+    """``(slug, name)`` or ``None``, plus the description left once a leading species name is taken off it.
+
+    An explicit species is resolved as-is. Otherwise the longest of the first
+    three words of the description that names a species wins ("Chadra Fan
+    Pilot/Mechanic"); first-word fallbacks are skipped because every
+    description would otherwise match on its first word.
+    """
+    if sheet.species:
+        match = resolver.resolve(sheet.species)
+        return (match.value if match else None), sheet.description
+    words = sheet.description.split()
+    for words_taken in range(min(3, len(words)), 0, -1):
+        match = resolver.resolve(" ".join(words[:words_taken]))
+        if match and match.method != "head":
+            return match.value, " ".join(words[words_taken:]) or sheet.description
+    return None, sheet.description
+
+
+def character_record(sheet: Sheet, resolver: NameResolver[Tuple[str, str]], user_id: str) -> dict:
+    species, role = resolve_species(sheet, resolver)
+    data = dict(sheet.data)
+    if species:
+        data["species"] = species[1]
+    elif sheet.species:
+        data["species"] = sheet.species
+    if role and "type" not in data:
+        data["type"] = role
+    return {
+        "id": str(uuid.uuid5(ID_NAMESPACE, f"{user_id}/{slugify(sheet.name, 'character')}")),
+        "user_id": user_id or None,
+        "name": sheet.name,
+        "species_slug": species[0] if species else None,
+        "data": data,
+        "source": os.path.relpath(sheet.source, ROOT),
+    }
+
+
+def is_droid(sheet: Sheet) -> bool:
+    return "droid" in (sheet.species or sheet.description).casefold().split()
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("inputs", nargs="*", type=Path, default=[SHEETS_DIR], help="Sheet files or directories (default: Source Data/Characters).")
+    parser.add_argument("--user-id", default=os.environ.get("CHARACTER_USER_ID", ""), help="Owner for every imported character ($CHARACTER_USER_ID).")
+    parser.add_argument("--json", type=Path, default=OUT_PATH, help="Where to write the parsed records.")
+    parser.add_argument("--sql", type=Path, help="Write batched upserts to this file.")
+    parser.add_argument("--dialect", choices=("mysql", "sqlite"), default="mysql", help="SQL dialect for --sql.")
+    parser.add_argument("--sqlite", help="Load straight into this SQLite database.")
+    parser.add_argument("--mysql-url", help="Load straight into MySQL, e.g. \"$MYSQL_URL\".")
+    parser.add_argument("--create", action="store_true", help="Create the tables from dev/sql/schema.sql first.")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help="Rows per INSERT statement.")
+    parser.add_argument("--workers", type=int, help="Parser processes (default: CPU count).")
+    parser.add_argument("--min-confidence", type=float, default=0.85, help="Reject fuzzy species matches below this score.")
+    metrics.add_arguments(parser)
+    return parser.parse_args(argv)
+
+
+def import_sheets(args: argparse.Namespace) -> None:
+    if (args.sql or args.sqlite or args.mysql_url) and not args.user_id:
+        raise SystemExit("❌ --user-id (or CHARACTER_USER_ID) is required to write characters to SQL.")
+
+    started = time.perf_counter()
+    paths = collect_paths(args.inputs)
+    if any(path.suffix.lower() == ".pdf" for path in paths):
+        require_pdfminer_forms()  # fail here rather than once per worker
+    sheets, problems = parse_files(paths, args.workers)
+    parsed = time.perf_counter() - started
+    count("records_parsed", len(sheets))
+
+    titles = json.loads(RACES_INDEX_PATH.read_text(encoding="utf-8")).get("titles", []) if RACES_INDEX_PATH.exists() else []
+    resolver = species_index(SpeciesStore.load(), titles, args.min_confidence)
+    records: List[dict] = []
+    seen: Dict[str, str] = {}
+    for sheet in sheets:
+        for warning in sheet.warnings:
+            print(f"⚠️  {sheet.name or Path(sheet.source).name}: {warning}")
+        if not sheet.name or not sheet.data:
+            continue
+        record = character_record(sheet, resolver, args.user_id)
+        if record["species_slug"] is None and not is_droid(sheet):
+            print(f"⚠️  {sheet.name}: species not found for {sheet.species or sheet.description!r}")
+        if record["id"] in seen:
+            print(f"⚠️  {sheet.name}: also in {seen[record['id']]}; the later sheet wins")
+        seen[record["id"]] = record["source"]
+        records.append(record)
+    for problem in problems:
+        print(f"❌ {problem}")
+
+    write_atomic(args.json, [json.dumps(records, ensure_ascii=False, indent=2), "\n"])
+    print(f"✅ {len(records)} characters from {len(paths)} file(s) in {parsed:.2f}s → {args.json}")
+
+    plan = plan_load(CHARACTERS, records, None)
+    if args.sql:
+        schema = SCHEMA_PATH.read_text(encoding="utf-8") if args.create else None
+        write_atomic(args.sql, emit_statements([plan], args.dialect, args.chunk_size, schema))
+        print(f"✅ {len(plan.rows)} rows in {len(list(chunked(plan.rows, args.chunk_size)))} statements → {args.sql}")
+    for dialect, target in (("sqlite", args.sqlite), ("mysql", args.mysql_url)):
+        if not target:
+            continue
+        connection = connect(target, dialect)
+        try:
+            if args.create:
+                create_schema(connection, dialect)
+            statements = execute_plans(connection, [plan], dialect, chunk_size_for(CHARACTERS, dialect, args.chunk_size))
+        finally:
+            connection.close()
+        print(f"✅ Loaded {len(plan.rows)} characters into {dialect} in {statements} statements")
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    args = parse_args(argv)
+    with metrics.session("character_sheets", args.metrics, args.profile):
+        import_sheets(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,25 @@
 #!/usr/bin/env python3
-"""Convert source alien images to optimized WebP assets and update ALIENS.json."""
+"""Convert source alien images to optimized WebP assets and update ALIENS.json.
+
+Conversion runs in a process pool and is incremental: a manifest keyed by the
+source content hash plus encoder settings lets unchanged images be skipped.
+Besides ``Source Data/Aliens`` the same pipeline handles the holocron species
+images and the starship images.
+
+Each image is decoded once and written at full size plus the narrower
+``VARIANT_WIDTHS``; species records (and starship import-ready records) get
+an ``imageVariants`` list with paths, dimensions and byte sizes for srcset.
+"""
 from __future__ import annotations
 
+import argparse
+import hashlib
 import json
-import re
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, field
 from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
 
 try:
     from PIL import Image
@@ -13,67 +28,191 @@ except ImportError as exc:  # pragma: no cover
         "Pillow is required. Install with `python3 -m pip install pillow` and rerun."
     ) from exc
 
+import metrics
+from metrics import METRICS, count, reset_worker, stage, timed
+from name_resolver import NameResolver
+from species_store import SpeciesStore, slugify, write_atomic
+
 ROOT = Path(__file__).resolve().parent.parent
 SOURCE_DIR = ROOT / "Source Data" / "Aliens"
 TARGET_DIR = ROOT / "web" / "public" / "aliens"
 ALIENS_PATH = ROOT / "ALIENS.json"
+MANIFEST_PATH = ROOT / ".cache" / "webp-manifest.json"
 QUALITY = 85
+# method=6 is Pillow's slowest setting for a few percent of bytes; ``--method 4``
+# (Pillow's default) trades those bytes for a faster first run.
+METHOD = 6
+IMAGE_SUFFIXES = {".jpg", ".jpeg", ".png", ".gif"}
+PUBLIC_DIR = ROOT / "web" / "public"
+STARSHIP_DATA_DIR = ROOT / "Source Data" / "d6holocron" / "starships"
+# Responsive widths in px; variants wider than the source are not generated.
+VARIANT_WIDTHS: Dict[str, int] = {"thumb": 160, "card": 320, "detail": 640}
 
-ALIASES = {
-    "gamorrean": "gamorean",
-    "wookiee": "wookie",
-    "sullustan": "sulustan",
-    "geonosianworker": "geonosian",
-    "geonosianaristocrat": "geonosian",
+# Extra image sets converted by file stem: name -> (source dir, target dir).
+IMAGE_SETS: Dict[str, Tuple[Path, Path]] = {
+    "holocron": (ROOT / "Source Data" / "d6holocron" / "images", TARGET_DIR),
+    "starships": (ROOT / "Source Data" / "d6holocron" / "starships" / "images", ROOT / "web" / "public" / "starships"),
 }
 
+@dataclass(frozen=True)
+class ConversionJob:
+    source: Path
+    destination: Path
+
 
-def sanitize(value: str) -> str:
-    return re.sub(r"[^a-z0-9]", "", value.lower())
+@dataclass(frozen=True)
+class EncoderSettings:
+    quality: int = QUALITY
+    method: int = METHOD
+    widths: Tuple[Tuple[str, int], ...] = tuple(VARIANT_WIDTHS.items())
 
 
-def slugify(value: str) -> str:
-    slug = re.sub(r"[^a-z0-9]+", "-", value.lower()).strip("-")
-    return slug or "species"
+@dataclass
+class ConversionResult:
+    source: str
+    destination: str
+    key: str = ""
+    seconds: float = 0.0
+    bytes_in: int = 0
+    bytes_out: int = 0
+    skipped: bool = False
+    error: str = ""
+    variants: List[dict] = field(default_factory=list)
 
 
-def build_file_map() -> dict[str, Path]:
+def relative(path: Path) -> str:
+    try:
+        return path.relative_to(ROOT).as_posix()
+    except ValueError:
+        return path.as_posix()
+
+
+def build_file_resolver() -> NameResolver[Path]:
+    """Resolve species names to image files, tolerating spellings like "Wookie" for "Wookiee"."""
     if not SOURCE_DIR.exists():
         raise SystemExit(f"Missing source directory: {SOURCE_DIR}")
-    mapping: dict[str, Path] = {}
-    for file_path in SOURCE_DIR.glob("*.*"):
-        key = sanitize(file_path.stem)
-        mapping[key] = file_path
-    return mapping
+    return NameResolver((file_path.stem, file_path) for file_path in sorted(SOURCE_DIR.glob("*.*")))
+
+
+def file_digest(path: Path) -> str:
+    digest = hashlib.sha256()
+    with path.open("rb") as handle:
+        for block in iter(lambda: handle.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def cache_key(digest: str, settings: EncoderSettings) -> str:
+    widths = ",".join(f"{name}{width}" for name, width in settings.widths)
+    return f"{digest}:webp:q{settings.quality}:m{settings.method}:{widths}"
+
+
+def variant_path(destination: Path, name: str) -> Path:
+    return destination.with_name(f"{destination.stem}-{name}.webp")
+
+
+def public_path(path: Path) -> str:
+    return path.relative_to(PUBLIC_DIR).as_posix()
 
 
-def convert_image(source: Path, destination: Path) -> None:
+def load_manifest() -> Dict[str, dict]:
+    if not MANIFEST_PATH.exists():
+        return {}
+    return json.loads(MANIFEST_PATH.read_text(encoding="utf-8")).get("images", {})
+
+
+def save_manifest(entries: Dict[str, dict]) -> None:
+    payload = {"version": 1, "images": dict(sorted(entries.items()))}
+    write_atomic(MANIFEST_PATH, [json.dumps(payload, ensure_ascii=False, indent=2), "\n"])
+
+
+@timed()
+def convert_image(source: Path, destination: Path, settings: EncoderSettings = EncoderSettings()) -> List[dict]:
+    """Write the full-size WebP plus each narrower variant from a single decode.
+
+    Returns variant metadata, narrowest first and ending with the full-size
+    ``"full"`` entry, ready to be stored as ``imageVariants``.
+    """
     destination.parent.mkdir(parents=True, exist_ok=True)
     with Image.open(source) as img:
         rgb = img.convert("RGB")
-        rgb.save(destination, "WEBP", quality=QUALITY, method=6)
+    rgb.save(destination, "WEBP", quality=settings.quality, method=settings.method)
+    variants = [{"name": "full", "path": public_path(destination), "width": rgb.width, "height": rgb.height,
+                 "bytes": destination.stat().st_size}]
+
+    # Downscale widest-first so each variant resamples the previous, smaller image.
+    current = rgb
+    for name, width in sorted(settings.widths, key=lambda item: item[1], reverse=True):
+        if width >= rgb.width:
+            continue
+        height = max(1, round(rgb.height * width / rgb.width))
+        current = current.resize((width, height), Image.LANCZOS)
+        target = variant_path(destination, name)
+        current.save(target, "WEBP", quality=settings.quality, method=settings.method)
+        variants.append({"name": name, "path": public_path(target), "width": width, "height": height,
+                         "bytes": target.stat().st_size})
+    count("images_converted")
+    count("bytes_written", sum(variant["bytes"] for variant in variants))
+    return sorted(variants, key=lambda item: item["width"])
+
+
+def remove_stale_variants(previous: List[dict], current: List[dict]) -> int:
+    """Delete variant files from the last encode that this one no longer produces (widths changed)."""
+    keep = {variant["path"] for variant in current}
+    removed = 0
+    for variant in previous:
+        path = PUBLIC_DIR / variant["path"]
+        if variant["path"] not in keep and path.exists():
+            path.unlink()
+            removed += 1
+    return removed
+
+
+def variants_exist(variants: List[dict]) -> bool:
+    return bool(variants) and all((PUBLIC_DIR / variant["path"]).exists() for variant in variants)
+
+
+def run_job(job: ConversionJob, previous: dict, settings: EncoderSettings) -> ConversionResult:
+    """Process-pool worker: hash the source and re-encode only if the cache key changed."""
+    result = ConversionResult(source=relative(job.source), destination=relative(job.destination))
+    start = time.perf_counter()
+    try:
+        result.key = cache_key(file_digest(job.source), settings)
+        result.bytes_in = job.source.stat().st_size
+        previous_variants = previous.get("variants") or []
+        if result.key == previous.get("key") and variants_exist(previous_variants):
+            result.skipped = True
+            result.variants = previous_variants
+        else:
+            result.variants = convert_image(job.source, job.destination, settings)
+        result.bytes_out = job.destination.stat().st_size
+    except Exception as exc:  # noqa: BLE001
+        result.error = f"{type(exc).__name__}: {exc}"
+    result.seconds = time.perf_counter() - start
+    return result
+
 
+def run_job_measured(job: ConversionJob, previous: dict, settings: EncoderSettings) -> Tuple[ConversionResult, dict]:
+    """Pool entry point: :func:`run_job` plus what it recorded in this worker's metrics."""
+    return run_job(job, previous, settings), METRICS.drain()
 
-def main() -> None:
-    file_map = build_file_map()
-    data = json.loads(ALIENS_PATH.read_text(encoding="utf-8"))
-    races = data["races"] if isinstance(data, dict) else data
 
+def plan_species_jobs(store: SpeciesStore) -> Tuple[List[ConversionJob], Dict[Path, List[dict]], List[str]]:
+    """Match catalog entries to Source Data/Aliens images; returns jobs, species per destination, misses."""
+    files = build_file_resolver()
     used_keys: dict[str, int] = {}
     missing_sources: list[str] = []
+    jobs: List[ConversionJob] = []
+    species_by_destination: Dict[Path, List[dict]] = {}
 
-    for index, species in enumerate(races):
+    for index, species in enumerate(store):
         name = species.get("name", f"species-{index}")
-        base_key = sanitize(name)
-        file_key = base_key if base_key in file_map else ALIASES.get(base_key)
-
-        if not file_key or file_key not in file_map:
+        match = files.resolve(name)
+        if match is None:
             missing_sources.append(name)
             continue
 
-        source_path = file_map[file_key]
-
-        slug = slugify(name)
+        slug = slugify(name, "species")
         # Ensure uniqueness if duplicate slugs exist (e.g., Verpine variants)
         count = used_keys.get(slug, 0)
         used_keys[slug] = count + 1
@@ -81,20 +220,186 @@ def main() -> None:
             slug = f"{slug}-{species.get('id', index)}"
 
         destination = TARGET_DIR / f"{slug}.webp"
-        convert_image(source_path, destination)
+        jobs.append(ConversionJob(match.value, destination))
+        species_by_destination.setdefault(destination, []).append(species)
+
+    return jobs, species_by_destination, missing_sources
+
+
+def plan_directory_jobs(source_dir: Path, target_dir: Path) -> List[ConversionJob]:
+    if not source_dir.exists():
+        print(f"⚠️  Skipping missing image directory: {relative(source_dir)}")
+        return []
+    # Output names become public URLs, so slug them like the species images.
+    return [
+        ConversionJob(path, target_dir / f"{slugify(path.stem, 'image')}.webp")
+        for path in sorted(source_dir.iterdir())
+        if path.is_file() and path.suffix.lower() in IMAGE_SUFFIXES
+    ]
+
+
+def dedupe_jobs(jobs: Iterable[ConversionJob]) -> List[ConversionJob]:
+    """Keep the first job per destination so curated species art wins over holocron images."""
+    seen: Dict[Path, ConversionJob] = {}
+    for job in jobs:
+        seen.setdefault(job.destination, job)
+    return list(seen.values())
+
+
+def load_starship_files() -> Dict[Path, dict]:
+    return {
+        path: json.loads(path.read_text(encoding="utf-8"))
+        for path in sorted(STARSHIP_DATA_DIR.glob("*-import-ready.json"))
+    }
+
+
+def apply_starship_variants(documents: Dict[Path, dict], variants_by_stem: Dict[str, List[dict]]) -> int:
+    """Attach ``imageVariants`` to starships by image filename; write back changed files atomically."""
+    written = 0
+    for path, document in documents.items():
+        changed = False
+        for ship in document.get("starships", []):
+            stem = Path(ship.get("imageFilename") or "").stem
+            variants = variants_by_stem.get(stem)
+            if variants and ship.get("imageVariants") != variants:
+                ship["imageVariants"] = variants
+                changed = True
+        if changed:
+            # The JSON.stringify(data, null, 2) layout of the Node fetchers, newline-terminated like our other writers.
+            write_atomic(path, [json.dumps(document, ensure_ascii=False, indent=2), "\n"])
+            written += 1
+    return written
+
+
+def print_report(results: List[ConversionResult], wall: float, top: int) -> None:
+    converted = [result for result in results if not result.skipped and not result.error]
+    skipped = [result for result in results if result.skipped]
+    failed = [result for result in results if result.error]
+
+    if converted:
+        print("\nPer-image encode times (slowest first):")
+        for result in sorted(converted, key=lambda item: item.seconds, reverse=True)[:top]:
+            print(
+                f"  {result.seconds * 1000:8.1f} ms  {result.bytes_in / 1024:7.1f} KiB → "
+                f"{result.bytes_out / 1024:7.1f} KiB  {result.destination}"
+            )
+        if len(converted) > top:
+            print(f"  … {len(converted) - top} more")
+    for result in failed:
+        print(f"❌ {result.source}: {result.error}")
+
+    encode_time = sum(result.seconds for result in converted)
+    print(
+        f"\n{len(converted)} converted, {len(skipped)} unchanged, {len(failed)} failed "
+        f"in {wall:.2f}s wall ({encode_time:.2f}s summed worker time)."
+    )
 
-        species["imageUrl"] = f"{slug}.webp"
-        species["imagePath"] = f"aliens/{slug}.webp"
-        species["hasImage"] = True
 
-    if missing_sources:
-        print("⚠️  Missing source images for:", ", ".join(missing_sources))
+def print_bandwidth_report(results: List[ConversionResult], settings: EncoderSettings) -> None:
+    """Compare serving each variant against the single full-size WebP we used to ship."""
+    ok = [result for result in results if not result.error]
+    full_total = sum(result.bytes_out for result in ok)
+    if not full_total:
+        return
+    print(f"\nBandwidth by variant ({len(ok)} images, full size {full_total / 1024 / 1024:.2f} MiB):")
+    for name, width in sorted(settings.widths, key=lambda item: item[1]):
+        total = 0
+        for result in ok:
+            sizes = {variant["name"]: variant["bytes"] for variant in result.variants}
+            total += sizes.get(name, result.bytes_out)
+        saved = 1 - total / full_total
+        print(f"  {name:<7} ≤{width:>4}px  {total / 1024 / 1024:7.2f} MiB  ({saved:6.1%} saved vs full size)")
 
-    ALIENS_PATH.write_text(
-        json.dumps(data, ensure_ascii=False, indent=2) + "\n",
-        encoding="utf-8",
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--sets",
+        nargs="+",
+        choices=["aliens", *IMAGE_SETS],
+        default=["aliens", *IMAGE_SETS],
+        help="Image sets to convert (default: all).",
     )
-    print(f"✅ Converted images written to {TARGET_DIR.relative_to(ROOT)} and dataset updated.")
+    parser.add_argument("--workers", type=int, default=None, help="Encoder processes (default: CPU count).")
+    parser.add_argument("--quality", type=int, default=QUALITY)
+    parser.add_argument("--method", type=int, default=METHOD, choices=range(7), help="WebP effort 0-6.")
+    parser.add_argument("--force", action="store_true", help="Re-encode even when the manifest says unchanged.")
+    parser.add_argument("--top", type=int, default=20, help="Slowest conversions to list in the report.")
+    parser.add_argument("--report", type=Path, help="Also write per-image timings to this JSON file.")
+    metrics.add_arguments(parser)
+    return parser.parse_args(argv)
+
+
+def convert(args: argparse.Namespace) -> None:
+    store: Optional[SpeciesStore] = None
+    species_by_destination: Dict[Path, List[dict]] = {}
+    jobs: List[ConversionJob] = []
+
+    if "aliens" in args.sets:
+        store = SpeciesStore.load(ALIENS_PATH)
+        species_jobs, species_by_destination, missing_sources = plan_species_jobs(store)
+        jobs.extend(species_jobs)
+        if missing_sources:
+            print("⚠️  Missing source images for:", ", ".join(missing_sources))
+    for name, (source_dir, target_dir) in IMAGE_SETS.items():
+        if name in args.sets:
+            jobs.extend(plan_directory_jobs(source_dir, target_dir))
+    jobs = dedupe_jobs(jobs)
+
+    settings = EncoderSettings(quality=args.quality, method=args.method)
+    manifest = load_manifest()
+    previous = [{} if args.force else manifest.get(relative(job.destination), {}) for job in jobs]
+
+    start = time.perf_counter()
+    with stage("encode_pool"), ProcessPoolExecutor(max_workers=args.workers, initializer=reset_worker) as pool:
+        measured = list(pool.map(run_job_measured, jobs, previous, [settings] * len(jobs), chunksize=4))
+    wall = time.perf_counter() - start
+    results = [result for result, _ in measured]
+    for _, snapshot in measured:
+        METRICS.merge(snapshot)
+
+    starship_variants: Dict[str, List[dict]] = {}
+    stale = 0
+    for job, result in zip(jobs, results):
+        if result.error:
+            continue
+        stale += remove_stale_variants(manifest.get(result.destination, {}).get("variants") or [], result.variants)
+        manifest[result.destination] = {
+            "source": result.source,
+            "key": result.key,
+            "bytes": result.bytes_out,
+            "variants": result.variants,
+        }
+        for species in species_by_destination.get(job.destination, []):
+            species["imageUrl"] = job.destination.name
+            species["imagePath"] = f"aliens/{job.destination.name}"
+            species["hasImage"] = True
+            species["imageVariants"] = result.variants
+        if job.source.parent == IMAGE_SETS["starships"][0]:
+            starship_variants[job.source.stem] = result.variants
+    save_manifest(manifest)
+    if stale:
+        print(f"🧹 Removed {stale} variant file(s) for widths no longer configured.")
+
+    print_report(results, wall, args.top)
+    print_bandwidth_report(results, settings)
+    if starship_variants:
+        written = apply_starship_variants(load_starship_files(), starship_variants)
+        print(f"✅ Starship imageVariants refreshed in {written} import-ready file(s).")
+    if args.report:
+        write_atomic(args.report, [json.dumps([asdict(result) for result in results], indent=2), "\n"])
+
+    if store is not None:
+        if store.save():
+            print(f"✅ Converted images written to {TARGET_DIR.relative_to(ROOT)} and dataset updated.")
+        else:
+            print(f"✅ Converted images written to {TARGET_DIR.relative_to(ROOT)}; dataset already current.")
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    args = parse_args(argv)
+    with metrics.session("convert_images_to_webp", args.metrics, args.profile):
+        convert(args)
 
 
 if __name__ == "__main__":
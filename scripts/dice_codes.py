@@ -0,0 +1,262 @@
+#!/usr/bin/env python3
+"""Parse D6 dice codes and validate a catalog's attribute ranges in bulk with NumPy.
+
+A code like ``"2D+2"`` is two dice plus two pips; three pips make a die, so
+every code is stored as a single pip count (``2D+2`` -> 8). A whole catalog
+becomes one ``(species, attribute, min/max)`` integer array, and range checks
+and per-species totals are array expressions instead of per-record loops.
+"""
+from __future__ import annotations
+
+import argparse
+import re
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+try:
+    import numpy as np
+except ImportError as exc:  # pragma: no cover
+    raise SystemExit(
+        "NumPy is required. Install with `python3 -m pip install numpy` and rerun."
+    ) from exc
+
+import metrics
+from metrics import stage
+from species_store import ALIENS_PATH, SpeciesStore
+
+ATTRIBUTES: Tuple[str, ...] = ("dexterity", "knowledge", "mechanical", "perception", "strength", "technical")
+PIPS_PER_DIE = 3
+DICE_CODE_RE = re.compile(r"^\s*(\d+)\s*D\s*(?:([+-])\s*(\d+))?\s*$", re.I)
+# Written in the source books where a species has no value; not an error in the data entry.
+PLACEHOLDERS = frozenset({"—", "–", "-", "n/a"})
+
+# Sentinel pip counts for codes that did not parse.
+MISSING = -1
+PLACEHOLDER = -2
+INVALID = -3
+
+
+def parse_code(code: object) -> Optional[Tuple[int, int]]:
+    """``"2D+2"`` -> ``(2, 2)``, normalised so pips are 0-2 (``"2D+4"`` -> ``(3, 1)``)."""
+    pips = to_pips(code)
+    return divmod(pips, PIPS_PER_DIE) if pips >= 0 else None
+
+
+def to_pips(code: object) -> int:
+    """Total pips of a dice code, or ``MISSING`` / ``PLACEHOLDER`` / ``INVALID``."""
+    text = code.strip() if isinstance(code, str) else ""
+    if not text:
+        return MISSING
+    if text.casefold() in PLACEHOLDERS:
+        return PLACEHOLDER
+    match = DICE_CODE_RE.match(text)
+    if not match:
+        return INVALID
+    pips = int(match.group(1)) * PIPS_PER_DIE
+    if match.group(3):
+        pips += int(match.group(3)) * (1 if match.group(2) == "+" else -1)
+    return pips if pips >= 0 else INVALID
+
+
+def format_code(pips: int) -> str:
+    if pips < 0:
+        return f"-{format_code(-pips)}"
+    dice, extra = divmod(int(pips), PIPS_PER_DIE)
+    return f"{dice}D+{extra}" if extra else f"{dice}D"
+
+
+def normalize_code(code: str) -> str:
+    """Canonical spelling (``"2d + 4"`` -> ``"3D+1"``); unparseable codes are returned stripped."""
+    pips = to_pips(code)
+    return format_code(pips) if pips >= 0 else (code.strip() if isinstance(code, str) else code)
+
+
+def pips_array(codes: np.ndarray) -> np.ndarray:
+    """Vectorised ``to_pips``: each distinct code is parsed once.
+
+    Catalogs reuse a few dozen spellings, so a lookup table beats sorting
+    the strings for ``np.unique``.
+    """
+    table: Dict[object, int] = {}
+
+    def lookup(code: object) -> int:
+        pips = table.get(code)
+        if pips is None:
+            pips = table[code] = to_pips(code)
+        return pips
+
+    flat = np.asarray(codes, dtype=object).ravel()
+    return np.fromiter(map(lookup, flat), dtype=np.int16, count=flat.size).reshape(np.shape(codes))
+
+
+@dataclass
+class DiceTable:
+    """Attribute ranges and attribute-dice budgets of many species, in pips.
+
+    ``ranges[i, j, 0]`` / ``ranges[i, j, 1]`` are the min / max of attribute
+    ``ATTRIBUTES[j]`` for species ``i``; ``budget[i]`` is its attributeDice.
+    Negative entries are the ``MISSING`` / ``PLACEHOLDER`` / ``INVALID`` sentinels.
+    """
+
+    names: List[str]
+    codes: np.ndarray  # object (n, 6, 2): the original strings, for messages
+    ranges: np.ndarray  # int16 (n, 6, 2)
+    budget_codes: np.ndarray  # object (n,)
+    budget: np.ndarray  # int16 (n,)
+
+    @classmethod
+    def from_records(cls, records: Iterable[dict]) -> "DiceTable":
+        names: List[str] = []
+        codes: List[object] = []
+        budgets: List[object] = []
+        for record in records:
+            stats = record.get("stats") or {}
+            attributes = stats.get("attributes") if isinstance(stats.get("attributes"), dict) else {}
+            names.append(record.get("name", "<unknown>"))
+            for attribute in ATTRIBUTES:
+                bounds = attributes.get(attribute) if isinstance(attributes.get(attribute), dict) else {}
+                codes.append(bounds.get("min") or "")
+                codes.append(bounds.get("max") or "")
+            budgets.append(stats.get("attributeDice") or "")
+        code_array = np.empty(len(codes), dtype=object)
+        code_array[:] = codes
+        code_array = code_array.reshape(len(names), len(ATTRIBUTES), 2)
+        budget_codes = np.empty(len(budgets), dtype=object)
+        budget_codes[:] = budgets
+        return cls(names, code_array, pips_array(code_array), budget_codes, pips_array(budget_codes))
+
+    @property
+    def low(self) -> np.ndarray:
+        return self.ranges[..., 0]
+
+    @property
+    def high(self) -> np.ndarray:
+        return self.ranges[..., 1]
+
+    @property
+    def complete(self) -> np.ndarray:
+        """Species whose twelve bounds all parsed."""
+        return (self.ranges >= 0).all(axis=(1, 2))
+
+    def aggregates(self) -> Dict[str, np.ndarray]:
+        """Per-species totals in pips.
+
+        ``min_total``/``max_total``/``spread`` are meaningful where
+        ``complete`` is set; ``slack`` (budget left after every attribute is
+        at its minimum) and ``headroom`` (how far the maxima exceed the
+        budget) where ``checked`` is. Other rows hold 0. Negative slack or
+        headroom means the ranges cannot hold the budget.
+        """
+        complete = self.complete
+        checked = complete & (self.budget >= 0)
+        min_total = np.where(complete, self.low.sum(axis=1, dtype=np.int32), 0)
+        max_total = np.where(complete, self.high.sum(axis=1, dtype=np.int32), 0)
+        budget = self.budget.astype(np.int32)
+        return {
+            "complete": complete,
+            "checked": checked,
+            "min_total": min_total,
+            "max_total": max_total,
+            "spread": max_total - min_total,
+            "slack": np.where(checked, budget - min_total, 0),
+            "headroom": np.where(checked, max_total - budget, 0),
+        }
+
+    def problems(self) -> Dict[int, List[str]]:
+        """``{species index: [problem, ...]}`` from one pass over the arrays.
+
+        Empty codes are not reported here; callers already flag those as
+        incomplete ranges.
+        """
+        found: Dict[int, List[str]] = {}
+
+        def report(rows: Iterable[int], message) -> None:
+            for row in rows:
+                found.setdefault(int(row), []).append(message(int(row)))
+
+        placeholder_rows, placeholder_columns = np.nonzero((self.ranges == PLACEHOLDER).any(axis=2))
+        columns_by_row: Dict[int, List[str]] = {}
+        for row, column in zip(placeholder_rows, placeholder_columns):
+            columns_by_row.setdefault(int(row), []).append(ATTRIBUTES[column])
+        report(columns_by_row, lambda row: f"placeholder range for {', '.join(columns_by_row[row])}")
+        for row, column, bound in zip(*np.nonzero(self.ranges == INVALID)):
+            found.setdefault(int(row), []).append(
+                f"invalid {ATTRIBUTES[column]} {('min', 'max')[bound]} {self.codes[row, column, bound]!r}"
+            )
+        report(np.nonzero(self.budget == INVALID)[0], lambda row: f"invalid attributeDice {self.budget_codes[row]!r}")
+
+        valid = (self.low >= 0) & (self.high >= 0)
+        for row, column in zip(*np.nonzero(valid & (self.low > self.high))):
+            found.setdefault(int(row), []).append(
+                f"{ATTRIBUTES[column]} min {self.codes[row, column, 0]} is above max {self.codes[row, column, 1]}"
+            )
+
+        totals = self.aggregates()
+        checked = totals["checked"]
+        report(
+            np.nonzero(checked & (totals["slack"] < 0))[0],
+            lambda row: f"attributeDice {format_code(self.budget[row])} is below the minimums' total {format_code(totals['min_total'][row])}",
+        )
+        report(
+            np.nonzero(checked & (totals["headroom"] < 0))[0],
+            lambda row: f"attributeDice {format_code(self.budget[row])} is above the maximums' total {format_code(totals['max_total'][row])}",
+        )
+        return found
+
+    def normalized(self) -> List[Dict[str, Dict[str, str]]]:
+        """Attribute ranges respelled canonically; unparseable codes are kept as written."""
+        result = []
+        for row in range(len(self.names)):
+            result.append({
+                attribute: {
+                    bound: format_code(self.ranges[row, column, index]) if self.ranges[row, column, index] >= 0
+                    else str(self.codes[row, column, index]).strip()
+                    for index, bound in enumerate(("min", "max"))
+                }
+                for column, attribute in enumerate(ATTRIBUTES)
+            })
+        return result
+
+
+def check(args: argparse.Namespace) -> None:
+    with stage("dice_table"):
+        table = DiceTable.from_records(SpeciesStore.load(args.aliens))
+    if args.totals:
+        totals = table.aggregates()
+        print(f"{'species':<28}{'min':>7}{'max':>7}{'dice':>7}{'slack':>7}")
+        for row, name in enumerate(table.names):
+            if not totals["complete"][row]:
+                print(f"{name:<28}{'—':>7}{'—':>7}{'—':>7}{'—':>7}")
+                continue
+            budget = format_code(table.budget[row]) if totals["checked"][row] else "—"
+            slack = format_code(totals["slack"][row]) if totals["checked"][row] else "—"
+            print(
+                f"{name:<28}{format_code(totals['min_total'][row]):>7}"
+                f"{format_code(totals['max_total'][row]):>7}{budget:>7}{slack:>7}"
+            )
+        print()
+
+    problems = table.problems()
+    if not problems:
+        print(f"✅ {len(table.names)} species: all dice codes parse and every range fits its attributeDice.")
+        return
+    print(f"⚠️  Dice code problems in {len(problems)} of {len(table.names)} species:\n")
+    for row in sorted(problems):
+        print(f"- {table.names[row]}:")
+        for problem in problems[row]:
+            print(f"  • {problem}")
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--aliens", type=Path, default=ALIENS_PATH, help="Species catalog to check.")
+    parser.add_argument("--totals", action="store_true", help="Print per-species min/max totals and budget slack.")
+    metrics.add_arguments(parser)
+    args = parser.parse_args(argv)
+    with metrics.session("dice_codes", args.metrics, args.profile):
+        check(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,409 @@
+#!/usr/bin/env python3
+"""D6 roll distributions: exact convolution, batched Monte Carlo sampling and a per-code cache.
+
+A roll of ``ND+p`` is N six-sided dice plus p. With the Wild Die rule one of
+the N dice is the Wild Die: a 6 is added and rerolled for as long as it keeps
+coming up 6, and a 1 on its first roll is a complication. How a complication
+affects the total is selectable:
+
+* ``subtract``: the Wild Die and the highest other die are dropped (the
+  default, as in the Second Edition rules),
+* ``count``: the 1 is added like any other die (the complication is only
+  reported).
+
+Exact distributions are built by convolution for pools up to
+``EXACT_MAX_DICE``; beyond that, or on request, totals are sampled with NumPy
+a million rolls at a time.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import re
+import time
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+try:
+    import numpy as np
+except ImportError as exc:  # pragma: no cover
+    raise SystemExit(
+        "NumPy is required. Install with `python3 -m pip install numpy` and rerun."
+    ) from exc
+
+import metrics
+from dice_codes import ATTRIBUTES, PIPS_PER_DIE, format_code, to_pips
+from metrics import timed
+from search_index import STARSHIP_DATA_DIR, STARSHIP_FILES
+from species_store import ALIENS_PATH, ROOT, SpeciesStore, write_atomic
+
+CACHE_VERSION = 1
+CACHE_PATH = ROOT / "web" / "public" / "data" / "dice-distributions.json"
+COMPLICATION_MODES = ("subtract", "count")
+# Standard difficulty numbers.
+DIFFICULTIES: Dict[str, int] = {
+    "Very Easy": 5,
+    "Easy": 10,
+    "Moderate": 15,
+    "Difficult": 20,
+    "Very Difficult": 25,
+    "Heroic": 30,
+}
+EXACT_MAX_DICE = 40
+CACHE_MAX_DICE = 15
+SAMPLE_CHUNK = 1_000_000
+# A chain of 20 sixes has probability 6**-20; longer explosions are dropped.
+MAX_EXPLOSIONS = 20
+DIE = np.full(6, 1 / 6)
+# "5D (6D when fire-linked)", "2D+2 (3D+2 in Atmosphere)": the leading code is the roll.
+LEADING_CODE_RE = re.compile(r"^\s*(\d+\s*D(?:\s*[+-]\s*\d+)?)(?![\w+])", re.I)
+
+Code = Union[str, int]
+
+
+def leading_code(value: object) -> Optional[str]:
+    match = LEADING_CODE_RE.match(value) if isinstance(value, str) else None
+    return match.group(1) if match else None
+
+
+def code_pips(code: Code) -> int:
+    pips = code if isinstance(code, int) else to_pips(code)
+    if pips < 0:
+        raise ValueError(f"Not a dice code: {code!r}")
+    return pips
+
+
+@dataclass(frozen=True)
+class Distribution:
+    """Probability of every total from ``offset`` to ``offset + len(probabilities) - 1``."""
+
+    code: str
+    offset: int
+    probabilities: np.ndarray
+    complication: float
+
+    @property
+    def totals(self) -> np.ndarray:
+        return np.arange(self.offset, self.offset + len(self.probabilities))
+
+    @property
+    def mean(self) -> float:
+        return float(self.totals @ self.probabilities)
+
+    @property
+    def std(self) -> float:
+        return float(np.sqrt(((self.totals - self.mean) ** 2) @ self.probabilities))
+
+    def survival(self) -> np.ndarray:
+        """``survival()[i]`` is P(total >= offset + i)."""
+        return np.cumsum(self.probabilities[::-1])[::-1]
+
+    def at_least(self, target: int) -> float:
+        """Chance to meet or beat a difficulty number."""
+        index = target - self.offset
+        if index <= 0:
+            return 1.0
+        if index >= len(self.probabilities):
+            return 0.0
+        return float(self.probabilities[index:].sum())
+
+    def percentile(self, q: float) -> int:
+        return int(self.offset + np.searchsorted(np.cumsum(self.probabilities), q))
+
+    def versus(self, other: "Distribution") -> Tuple[float, float, float]:
+        """``(win, tie, loss)`` probabilities of an opposed roll against ``other``."""
+        # cdf[k] = P(other's total < other.offset + k).
+        cdf = np.concatenate(([0.0], np.cumsum(other.probabilities)))
+        last = len(other.probabilities)
+        below = cdf[np.clip(self.totals - other.offset, 0, last)]
+        at_or_below = cdf[np.clip(self.totals - other.offset + 1, 0, last)]
+        win = float(self.probabilities @ below)
+        tie = float(self.probabilities @ (at_or_below - below))
+        return win, tie, 1.0 - win - tie
+
+    def summary(self, decimals: int = 6) -> dict:
+        return {
+            "code": self.code,
+            "min": self.offset,
+            "max": self.offset + len(self.probabilities) - 1,
+            "mean": round(self.mean, 3),
+            "std": round(self.std, 3),
+            "median": self.percentile(0.5),
+            "complication": round(self.complication, decimals),
+            "atLeast": {name: round(self.at_least(target), decimals) for name, target in DIFFICULTIES.items()},
+            # Exploding tails are long; the list stops once the rest rounds to zero.
+            "probabilities": [round(float(p), decimals) for p in self.probabilities[: self.significant(decimals)]],
+        }
+
+    def significant(self, decimals: int) -> int:
+        """Number of leading totals whose probability survives rounding to ``decimals``."""
+        visible = np.nonzero(self.probabilities >= 0.5 * 10 ** -decimals)[0]
+        return int(visible[-1]) + 1 if visible.size else 0
+
+
+def pool_pmf(dice: int) -> np.ndarray:
+    """P(sum of ``dice`` ordinary dice = index)."""
+    pmf = np.ones(1)
+    for _ in range(dice):
+        pmf = np.convolve(pmf, np.concatenate(([0.0], DIE)))
+    return pmf
+
+
+def sum_without_highest_pmf(dice: int) -> np.ndarray:
+    """P(sum of ``dice`` ordinary dice minus the highest of them = index)."""
+    if dice == 0:
+        return np.ones(1)
+    # joint[m, s]: P(highest die = m and sum = s) over the dice rolled so far.
+    joint = np.zeros((7, 6 * dice + 1))
+    joint[0, 0] = 1.0
+    for _ in range(dice):
+        updated = np.zeros_like(joint)
+        for face in range(1, 7):
+            shifted = np.zeros_like(joint)
+            shifted[:, face:] = joint[:, :-face] / 6
+            updated[face] += shifted[: face + 1].sum(axis=0)
+            updated[face + 1:] += shifted[face + 1:]
+        joint = updated
+    result = np.zeros(6 * dice + 1)
+    for highest in range(1, 7):
+        result[: 6 * dice + 1 - highest] += joint[highest, highest:]
+    return result
+
+
+@lru_cache(maxsize=None)
+def wild_die_pmf(complication: str) -> Tuple[np.ndarray, float]:
+    """``(P(Wild Die adds index and no complication is applied), P(complication))``.
+
+    Under ``count`` the 1 stays in the first array; under ``subtract`` that
+    sixth of the outcomes is handled by the caller.
+    """
+    explosion = np.zeros(6 * (MAX_EXPLOSIONS + 1))
+    weight = 1 / 6
+    for depth in range(MAX_EXPLOSIONS + 1):
+        explosion[6 * depth + 1: 6 * depth + 6] = weight
+        weight /= 6
+    first = np.zeros(len(explosion) + 6)
+    first[2:6] = 1 / 6
+    first[6:] = explosion / 6
+    if complication == "count":
+        first[1] = 1 / 6
+    return first, 1 / 6
+
+
+@lru_cache(maxsize=None)
+def exact(pips: int, wild_die: bool = True, complication: str = "subtract") -> Distribution:
+    """Exact distribution of a ``pips``-pip roll (``exact(8)`` is 2D+2)."""
+    if complication not in COMPLICATION_MODES:
+        raise ValueError(f"Unknown complication rule: {complication}")
+    dice, bonus = divmod(pips, PIPS_PER_DIE)
+    code = format_code(pips)
+    if dice > EXACT_MAX_DICE:
+        raise ValueError(f"{code}: pools over {EXACT_MAX_DICE}D are sampled, not convolved")
+    if not wild_die or dice == 0:
+        pmf = pool_pmf(dice)
+        return trimmed(code, pmf, bonus, 0.0)
+
+    others = pool_pmf(dice - 1)
+    wild, complication_chance = wild_die_pmf(complication)
+    pmf = np.convolve(others, wild)
+    if complication == "subtract":
+        dropped = sum_without_highest_pmf(dice - 1) * complication_chance
+        pmf[: len(dropped)] += dropped
+    return trimmed(code, pmf, bonus, complication_chance)
+
+
+def trimmed(code: str, pmf: np.ndarray, bonus: int, complication: float) -> Distribution:
+    nonzero = np.nonzero(pmf > 1e-15)[0]
+    start, stop = nonzero[0], nonzero[-1] + 1
+    probabilities = pmf[start:stop] / pmf[start:stop].sum()
+    probabilities.setflags(write=False)
+    return Distribution(code, int(start) + bonus, probabilities, complication)
+
+
+def sample(
+    pips: int,
+    size: int,
+    rng: Optional[np.random.Generator] = None,
+    wild_die: bool = True,
+    complication: str = "subtract",
+) -> np.ndarray:
+    """``size`` sampled totals of a ``pips``-pip roll, drawn in batches of ``SAMPLE_CHUNK``."""
+    rng = rng or np.random.default_rng()
+    dice, bonus = divmod(pips, PIPS_PER_DIE)
+    wild = wild_die and dice > 0
+    ordinary = dice - 1 if wild else dice
+    totals = np.empty(size, dtype=np.int32)
+    for start in range(0, size, SAMPLE_CHUNK):
+        count = min(SAMPLE_CHUNK, size - start)
+        rolls = rng.integers(1, 7, size=(count, ordinary), dtype=np.int8)
+        total = rolls.sum(axis=1, dtype=np.int32)
+        if wild:
+            first = rng.integers(1, 7, size=count, dtype=np.int32)
+            added = first.copy()
+            exploding = np.nonzero(first == 6)[0]
+            while exploding.size:
+                again = rng.integers(1, 7, size=exploding.size, dtype=np.int32)
+                added[exploding] += again
+                exploding = exploding[again == 6]
+            if complication == "subtract":
+                failed = first == 1
+                added[failed] = 0
+                if ordinary:
+                    total[failed] -= rolls[failed].max(axis=1)
+            total += added
+        totals[start:start + count] = total + bonus
+    return totals
+
+
+def simulate(
+    pips: int,
+    size: int = 1_000_000,
+    rng: Optional[np.random.Generator] = None,
+    wild_die: bool = True,
+    complication: str = "subtract",
+) -> Distribution:
+    """Monte Carlo estimate of :func:`exact`, for pools too large to convolve."""
+    totals = sample(pips, size, rng, wild_die, complication)
+    low = int(totals.min())
+    counts = np.bincount(totals - low)
+    complication_chance = 1 / 6 if wild_die and pips >= PIPS_PER_DIE else 0.0
+    return Distribution(format_code(pips), low, counts / size, complication_chance)
+
+
+def distribution(code: Code, wild_die: bool = True, complication: str = "subtract") -> Distribution:
+    pips = code_pips(code)
+    if pips // PIPS_PER_DIE > EXACT_MAX_DICE:
+        return simulate(pips, wild_die=wild_die, complication=complication)
+    return exact(pips, wild_die, complication)
+
+
+def catalog_codes(aliens: Path = ALIENS_PATH) -> Dict[str, List[str]]:
+    """Every dice code in the species and starship data, by field."""
+    found: Dict[str, set] = {}
+
+    def add(field: str, value: object) -> None:
+        code = leading_code(value)
+        if code and to_pips(code) >= 0:
+            found.setdefault(field, set()).add(format_code(to_pips(code)))
+
+    for record in SpeciesStore.load(aliens):
+        attributes = (record.get("stats") or {}).get("attributes") or {}
+        for attribute in ATTRIBUTES:
+            for bound in ("min", "max"):
+                add("attribute", (attributes.get(attribute) or {}).get(bound))
+    for name in STARSHIP_FILES:
+        path = STARSHIP_DATA_DIR / name
+        if not path.exists():
+            continue
+        for ship in json.loads(path.read_text(encoding="utf-8")).get("starships", []):
+            for field in ("maneuverability", "hull", "shields"):
+                add(field, ship.get(field))
+            for weapon in ship.get("weapons") or []:
+                add("fireControl", weapon.get("fireControl"))
+                add("damage", weapon.get("damage"))
+    return {field: sorted(codes, key=to_pips) for field, codes in found.items()}
+
+
+@timed()
+def build_cache(codes: Iterable[str], wild_die: bool = True, complication: str = "subtract") -> dict:
+    """Summaries for ``codes`` plus every code up to ``CACHE_MAX_DICE``, keyed by canonical code."""
+    pips = {to_pips(code) for code in codes} | set(range(1, CACHE_MAX_DICE * PIPS_PER_DIE + PIPS_PER_DIE))
+    return {
+        "version": CACHE_VERSION,
+        "rules": {"wildDie": wild_die, "complication": complication, "difficulties": DIFFICULTIES},
+        "distributions": {
+            format_code(value): distribution(value, wild_die, complication).summary() for value in sorted(pips)
+        },
+    }
+
+
+def find_species(name: str, aliens: Path = ALIENS_PATH) -> dict:
+    record = SpeciesStore.load(aliens).find(name)
+    if record is None:
+        raise SystemExit(f"No species named {name!r} in {aliens.name}")
+    return record
+
+
+def print_distribution(dist: Distribution) -> None:
+    odds = "  ".join(f"{name} {dist.at_least(target):6.1%}" for name, target in DIFFICULTIES.items())
+    print(f"{dist.code:>6}: mean {dist.mean:5.2f} ± {dist.std:4.2f}, range {dist.offset}-{dist.offset + len(dist.probabilities) - 1}")
+    print(f"        {odds}")
+
+
+def report(args: argparse.Namespace) -> None:
+    wild_die = not args.no_wild_die
+
+    def describe(code: str) -> Distribution:
+        try:
+            return distribution(code, wild_die, args.complication)
+        except ValueError as exc:
+            raise SystemExit(str(exc))
+
+    if args.write_cache:
+        start = time.perf_counter()
+        codes = catalog_codes()
+        cache = build_cache((code for field in codes.values() for code in field), wild_die, args.complication)
+        write_atomic(args.out, [json.dumps(cache, ensure_ascii=False, separators=(",", ":")), "\n"])
+        print(
+            f"✅ Wrote {len(cache['distributions'])} distributions to {args.out} "
+            f"in {time.perf_counter() - start:.2f}s ({args.out.stat().st_size / 1024:.0f} KiB)"
+        )
+
+    if args.species:
+        record = find_species(args.species)
+        attributes = (record.get("stats") or {}).get("attributes") or {}
+        print(f"{record.get('name')}:")
+        for attribute in ATTRIBUTES:
+            bounds = attributes.get(attribute) or {}
+            low, high = to_pips(bounds.get("min") or ""), to_pips(bounds.get("max") or "")
+            if low < 0 or high < 0:
+                print(f"  {attribute:<11} —")
+                continue
+            low_dist, high_dist = exact(low, wild_die, args.complication), exact(high, wild_die, args.complication)
+            print(
+                f"  {attribute:<11} {low_dist.code:>5} mean {low_dist.mean:5.2f}  →  {high_dist.code:>5} mean {high_dist.mean:5.2f}"
+                f"   Moderate: {low_dist.at_least(DIFFICULTIES['Moderate']):6.1%} → {high_dist.at_least(DIFFICULTIES['Moderate']):6.1%}"
+            )
+
+    opponent = describe(args.against) if args.against else None
+    rng = np.random.default_rng(args.seed)
+    for code in args.codes:
+        dist = describe(code)
+        print_distribution(dist)
+        for target in args.difficulty:
+            print(f"        P(≥ {target}) = {dist.at_least(target):.2%}")
+        if opponent is not None:
+            win, tie, loss = dist.versus(opponent)
+            print(f"        vs {opponent.code}: win {win:.1%}, tie {tie:.1%}, lose {loss:.1%}")
+        if args.samples:
+            start = time.perf_counter()
+            sampled = simulate(code_pips(code), args.samples, rng, wild_die, args.complication)
+            elapsed = time.perf_counter() - start
+            print(
+                f"        Monte Carlo: mean {sampled.mean:5.2f}, Moderate {sampled.at_least(DIFFICULTIES['Moderate']):6.1%} "
+                f"({args.samples / elapsed / 1e6:.1f}M rolls/s)"
+            )
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("codes", nargs="*", help="Dice codes to describe, e.g. 3D+2.")
+    parser.add_argument("--against", help="Opposing dice code: print win/tie/loss odds for each code.")
+    parser.add_argument("--difficulty", type=int, action="append", default=[], help="Extra target number to report.")
+    parser.add_argument("--species", help="Report the attribute ranges of one species.")
+    parser.add_argument("--no-wild-die", action="store_true", help="Roll every die normally.")
+    parser.add_argument("--complication", choices=COMPLICATION_MODES, default="subtract", help="What a Wild Die 1 does.")
+    parser.add_argument("--samples", type=int, help="Also run a Monte Carlo check with this many rolls per code.")
+    parser.add_argument("--seed", type=int, help="Seed for --samples.")
+    parser.add_argument("--write-cache", action="store_true", help=f"Write {CACHE_PATH.relative_to(ROOT)} for the API.")
+    parser.add_argument("--out", type=Path, default=CACHE_PATH, help="Cache path for --write-cache.")
+    metrics.add_arguments(parser)
+    args = parser.parse_args(argv)
+    with metrics.session("dice_rolls", args.metrics, args.profile):
+        report(args)
+
+
+if __name__ == "__main__":
+    main()
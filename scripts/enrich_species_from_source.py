@@ -2,74 +2,59 @@
 """Fill missing species data in ALIENS.json using Source Data text."""
 from __future__ import annotations
 
-import json
+import argparse
 import re
 from pathlib import Path
 from typing import Dict, List, Optional
 
+import metrics
+from metrics import count, timed
+from name_resolver import NameResolver
+from source_documents import SourceText
+from species_sections import first_line, split_sections
+from species_store import SpeciesStore
+
 ROOT = Path(__file__).resolve().parent.parent
 ALIENS_PATH = ROOT / "ALIENS.json"
 SOURCE_PATH = ROOT / "Source Data" / "C4_Universe_Section.txt"
 DEFAULT_SOURCE = "Star Wars REUP Section 16"
 
-SECTION_HEADER = re.compile(r"\n([A-Z][A-Z\s\-']+)\n\n")
-MOVE_RE = re.compile(r"Move:\s*([^\n]+)")
-SIZE_RE = re.compile(r"Size:\s*([^\n]+)")
-SPECIAL_BLOCK_RE = re.compile(
-    r"Special Abilities:\s*(.*?)\n\s*Move:", re.DOTALL | re.IGNORECASE
-)
-
-ALIASES = {
-    "CEREAN": "CEREANS",
-    "CEREANS": "CEREANS",
-    "GEONOSIAN WORKER": "GEONOSIAN",
-    "GEONOSIAN ARISTOCRAT": "GEONOSIAN",
-    "RODIAN": "RODIANS",
-    "NAUTOLAN": "NAUTOLANS",
-    "TRANDOSHAN": "TRANDOSHANS",
-}
-
+WHITESPACE_RE = re.compile(r"\s+")
+# A soft hyphen at a line break splits one word across two lines ("suf\xad\nfers").
+SOFT_HYPHEN_BREAK_RE = re.compile(r"\xad\s*")
+# Descriptions that stop without closing punctuation ran into a page or column break.
+COMPLETE_SENTENCE_RE = re.compile(r"[.!?)\]”\"']$")
 
 def normalize_key(name: str) -> str:
     return name.upper().replace("’", "'").replace("–", "-")
 
 
-def load_sections() -> Dict[str, str]:
-    text = SOURCE_PATH.read_text(encoding="utf-8").replace("\r\n", "\n")
-    matches = list(SECTION_HEADER.finditer(text))
-    sections: Dict[str, str] = {}
-    for idx, match in enumerate(matches):
-        key = normalize_key(match.group(1).strip())
-        start = match.end()
-        end = matches[idx + 1].start() if idx + 1 < len(matches) else len(text)
-        sections[key] = text[start:end].strip()
-    return sections
+@timed()
+def load_sections() -> SourceText:
+    """C4 sections by header, sliced on demand from the cached offset index."""
+    return SourceText(SOURCE_PATH)
 
 
 def clean_whitespace(value: str) -> str:
-    return re.sub(r"\s+", " ", value).strip()
+    return WHITESPACE_RE.sub(" ", SOFT_HYPHEN_BREAK_RE.sub("", value)).strip()
 
 
-def extract_move(section: str) -> Optional[str]:
-    match = MOVE_RE.search(section)
-    if match:
-        return clean_whitespace(match.group(1))
-    return None
+def extract_move(fields: Dict[str, str]) -> Optional[str]:
+    return clean_whitespace(first_line(fields.get("Move", ""))) or None
 
 
-def extract_size(section: str) -> Optional[str]:
-    match = SIZE_RE.search(section)
-    if match:
-        return clean_whitespace(match.group(1))
-    return None
+def extract_size(fields: Dict[str, str]) -> Optional[str]:
+    return clean_whitespace(first_line(fields.get("Size", ""))) or None
 
 
-def extract_special_abilities(section: str) -> Optional[List[Dict[str, str]]]:
-    match = SPECIAL_BLOCK_RE.search(section)
-    if not match:
+def extract_special_abilities(
+    fields: Dict[str, str], truncated: Optional[List[str]] = None
+) -> Optional[List[Dict[str, str]]]:
+    """Abilities from the block; a final entry cut off mid-sentence is left out (and named in ``truncated``)."""
+    block = fields.get("Special Abilities")
+    if not block:
         return None
 
-    block = match.group(1)
     abilities: List[Dict[str, str]] = []
     current_name: Optional[str] = None
     current_desc: List[str] = []
@@ -95,10 +80,11 @@ def extract_special_abilities(section: str) -> Optional[List[Dict[str, str]]]:
             current_desc.append(line)
 
     if current_name:
-        abilities.append({
-            "name": clean_whitespace(current_name),
-            "description": clean_whitespace(" ".join(current_desc)),
-        })
+        description = clean_whitespace(" ".join(current_desc))
+        if COMPLETE_SENTENCE_RE.search(description):
+            abilities.append({"name": clean_whitespace(current_name), "description": description})
+        elif truncated is not None:
+            truncated.append(clean_whitespace(current_name))
 
     return abilities or None
 
@@ -112,54 +98,77 @@ def should_replace_abilities(current: List[Dict[str, str]]) -> bool:
 
 
 def enrich() -> None:
-    data = json.loads(ALIENS_PATH.read_text(encoding="utf-8"))
-    races = data["races"] if isinstance(data, dict) else data
-
-    sections = load_sections()
+    """Fill ALIENS.json from the C4 sections.
+
+    A section whose header is the species name is authoritative: its
+    abilities replace the record's and ``sources`` is normalised. A section
+    found only by the resolver's plural, head-word or fuzzy steps just fills
+    fields that are still empty, so curated text is never overwritten by a
+    guess.
+    """
+    store = SpeciesStore.load(ALIENS_PATH)
     updated = 0
-
-    for species in races:
-        name = species.get("name", "")
-        key = normalize_key(name)
-        section_key = key if key in sections else ALIASES.get(key, key)
-        section = sections.get(section_key)
-        if not section:
-            continue
-
-        stats = species.setdefault("stats", {})
-
-        if not stats.get("move"):
-            move = extract_move(section)
-            if move:
-                stats["move"] = move
-        if not stats.get("size"):
-            size = extract_size(section)
-            if size:
-                stats["size"] = size
-
-        current_abilities = species.get("specialAbilities") or []
-        if should_replace_abilities(current_abilities):
-            new_abilities = extract_special_abilities(section)
-            species["specialAbilities"] = new_abilities or []
-        else:
-            new_abilities = extract_special_abilities(section)
+    unmatched: List[str] = []
+    truncated: List[str] = []
+
+    with load_sections() as sections:
+        resolver = NameResolver((header, header) for header in sections)
+        for species in store:
+            name = species.get("name", "")
+            match = resolver.resolve(normalize_key(name))
+            if match is None:
+                unmatched.append(name)
+                continue
+            section = sections[match.value]
+            authoritative = match.method == "exact"
+
+            fields = split_sections(section)
+            count("records_parsed")
+            stats = species.setdefault("stats", {})
+
+            if not stats.get("move"):
+                move = extract_move(fields)
+                if move:
+                    stats["move"] = move
+            if not stats.get("size"):
+                size = extract_size(fields)
+                if size:
+                    stats["size"] = size
+
+            current_abilities = species.get("specialAbilities") or []
+            skipped: List[str] = []
+            new_abilities = extract_special_abilities(fields, skipped)
+            truncated.extend(f"{name} ({ability})" for ability in skipped)
             if new_abilities:
+                # Keep whatever the record already has for an ability the source cuts off.
+                new_abilities += [ability for ability in current_abilities if ability.get("name") in skipped]
+            if should_replace_abilities(current_abilities):
+                species["specialAbilities"] = new_abilities or []
+            elif new_abilities and authoritative:
                 species["specialAbilities"] = new_abilities
 
-        # Normalise sources
-        species["sources"] = [DEFAULT_SOURCE]
+            # Normalise sources
+            if authoritative or not species.get("sources"):
+                species["sources"] = [DEFAULT_SOURCE]
+
+            updated += 1
+
+    changed = len(store.dirty_records())
+    store.save()
+    print(f"Processed {updated} species entries ({changed} changed).")
+    if unmatched:
+        print(f"No source section for: {', '.join(unmatched)}")
+    if truncated:
+        print(f"Left out abilities cut off in the source: {', '.join(truncated)}")
 
-        updated += 1
 
-    ALIENS_PATH.write_text(json.dumps(data, ensure_ascii=False, indent=2) + "\n", encoding="utf-8")
-    print(f"Processed {updated} species entries.")
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    metrics.add_arguments(parser)
+    args = parser.parse_args(argv)
+    with metrics.session("enrich_species_from_source", args.metrics, args.profile):
+        enrich()
 
 
 if __name__ == "__main__":
-    enrich()
-ALIASES = {
-    "CEREAN": "CEREANS",
-    "CEREANS": "CEREANS",
-    "GEONOSIAN WORKER": "GEONOSIAN",
-    "GEONOSIAN ARISTOCRAT": "GEONOSIAN",
-}
+    main()
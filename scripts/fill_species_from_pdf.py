@@ -1,9 +1,12 @@
-import json
+import argparse
 import re
 from pathlib import Path
-from pdfminer.high_level import extract_text
 
-ALIENS = Path(r"c:\\Users\\skunian\\OneDrive\\MyCode\\Star Wars Races\\ALIENS.json")
+import metrics
+from name_resolver import NameResolver
+from source_documents import SourcePdf
+from species_store import ALIENS_PATH as ALIENS, SpeciesStore
+
 PDF = Path(r"c:\\Users\\skunian\\OneDrive\\MyCode\\Star Wars Races\\C4 Universe Section.pdf")
 
 # Basic heuristics to find blocks like "Anzat" and a following paragraph or two.
@@ -60,18 +63,21 @@ def summarize_block(block: str):
     }
 
 
-def main():
-    if not PDF.exists():
+def fill(args):
+    if not args.pdf.exists():
         print("PDF not found; aborting.")
         return
-    text = extract_text(str(PDF))
+    # Page text is cached by content hash, so pdfminer only runs on pages it has not seen.
+    text = SourcePdf(args.pdf).text(workers=args.workers)
     sections = split_sections(text)
+    resolver = NameResolver((header, header) for header in sections)
 
-    data = json.loads(ALIENS.read_text(encoding="utf-8"))
+    store = SpeciesStore.load(ALIENS)
     filled = 0
-    for race in data.get("races", []):
+    for race in store:
         name = race.get("name")
-        block = sections.get(name)
+        match = resolver.resolve(name) if name else None
+        block = sections[match.value] if match else None
         if not block:
             continue
         summary = summarize_block(block)
@@ -89,9 +95,19 @@ def main():
                 lang["native"] = m.group(1)
                 race["languages"] = lang
                 filled += 1
-    ALIENS.write_text(json.dumps(data, ensure_ascii=False, indent=2), encoding="utf-8")
+    store.save()
     print(f"Filled fields: {filled}")
 
 
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Fill empty species fields from the C4 Universe Section PDF.")
+    parser.add_argument("pdf", nargs="?", type=Path, default=PDF, help="Path to the C4 Universe Section PDF.")
+    parser.add_argument("--workers", type=int, help="Extraction processes (default: CPU count).")
+    metrics.add_arguments(parser)
+    args = parser.parse_args(argv)
+    with metrics.session("fill_species_from_pdf", args.metrics, args.profile):
+        fill(args)
+
+
 if __name__ == "__main__":
     main()
@@ -0,0 +1,159 @@
+"""Iterative encoder/decoder between plain JSON values and Firestore REST typed values."""
+from __future__ import annotations
+
+from functools import lru_cache
+from typing import Any, Dict, List, Tuple
+
+# Encoded values may be shared between calls (see ``_min_max_value``); treat
+# them as read-only and serialize them, don't mutate them.
+
+
+def _string(value: str) -> dict:
+    return {"stringValue": value}
+
+
+def _boolean(value: bool) -> dict:
+    return {"booleanValue": value}
+
+
+def _integer(value: int) -> dict:
+    return {"integerValue": str(value)}
+
+
+def _double(value: float) -> dict:
+    return {"doubleValue": value}
+
+
+def _null(value: None) -> dict:
+    return {"nullValue": None}
+
+
+# Exact-type dispatch; bool must not fall through to int.
+SCALAR_ENCODERS = {
+    str: _string,
+    bool: _boolean,
+    int: _integer,
+    float: _double,
+    type(None): _null,
+}
+
+
+def _scalar_encoder(value: Any):
+    encoder = SCALAR_ENCODERS.get(type(value))
+    if encoder is not None:
+        return encoder
+    # Subclasses (IntEnum, str enums, ...) take the slow isinstance path.
+    for kind in (bool, int, float, str):
+        if isinstance(value, kind):
+            return SCALAR_ENCODERS[kind]
+    return None
+
+
+@lru_cache(maxsize=4096)
+def _min_max_value(low: str, high: str) -> dict:
+    """Attribute ranges repeat across the catalog ("2D".."4D"), so build each one once."""
+    return {"mapValue": {"fields": {"min": {"stringValue": low}, "max": {"stringValue": high}}}}
+
+
+def _string_array(values: List[str]) -> dict:
+    return {"arrayValue": {"values": [{"stringValue": value} for value in values]}}
+
+
+def encode(value: Any, drop_none: bool = False) -> dict:
+    """Encode ``value`` as a Firestore ``Value`` without recursion.
+
+    ``drop_none`` omits ``None`` map entries (what the firehose importer
+    sends) instead of encoding them as ``nullValue``.
+    """
+    root: Dict[str, Any] = {}
+    stack: List[Tuple[Any, Any, Any]] = [(root, "value", value)]
+    while stack:
+        target, key, item = stack.pop()
+        kind = type(item)
+        if kind is dict:
+            if len(item) == 2 and type(item.get("min")) is str and type(item.get("max")) is str:
+                target[key] = _min_max_value(item["min"], item["max"])
+                continue
+            fields: Dict[str, Any] = {}
+            target[key] = {"mapValue": {"fields": fields}}
+            for name, child in item.items():
+                if child is None and drop_none:
+                    continue
+                encoder = SCALAR_ENCODERS.get(type(child))
+                if encoder is not None:
+                    fields[name] = encoder(child)
+                else:
+                    fields[name] = None  # placeholder keeps key order
+                    stack.append((fields, name, child))
+        elif kind is list:
+            if all(type(child) is str for child in item):
+                target[key] = _string_array(item)
+                continue
+            values: List[Any] = [None] * len(item)
+            target[key] = {"arrayValue": {"values": values}}
+            for index, child in enumerate(item):
+                encoder = SCALAR_ENCODERS.get(type(child))
+                if encoder is not None:
+                    values[index] = encoder(child)
+                else:
+                    stack.append((values, index, child))
+        else:
+            encoder = _scalar_encoder(item)
+            if encoder is not None:
+                target[key] = encoder(item)
+            elif isinstance(item, dict):
+                stack.append((target, key, dict(item)))
+            elif isinstance(item, list):
+                stack.append((target, key, list(item)))
+            else:
+                raise TypeError(f"Unsupported value type: {type(item)}")
+    return root["value"]
+
+
+def encode_fields(doc: dict, drop_none: bool = False) -> dict:
+    """The ``fields`` map of a document body, e.g. ``{"fields": encode_fields(doc)}``."""
+    return encode(doc, drop_none)["mapValue"]["fields"]
+
+
+def _decode_scalar(kind: str, raw: Any) -> Any:
+    if kind == "integerValue":
+        return int(raw)
+    if kind == "doubleValue":
+        return float(raw)
+    # stringValue, booleanValue, nullValue, timestampValue, referenceValue,
+    # bytesValue (base64) and geoPointValue pass through unchanged.
+    return raw
+
+
+def decode(value: dict) -> Any:
+    """Turn a Firestore ``Value`` back into plain Python data, without recursion."""
+    root: Dict[str, Any] = {}
+    stack: List[Tuple[Any, Any, dict]] = [(root, "value", value)]
+    while stack:
+        target, key, item = stack.pop()
+        if "mapValue" in item:
+            out: Dict[str, Any] = {}
+            target[key] = out
+            for name, child in (item["mapValue"].get("fields") or {}).items():
+                out[name] = None
+                stack.append((out, name, child))
+        elif "arrayValue" in item:
+            children = item["arrayValue"].get("values") or []
+            items: List[Any] = [None] * len(children)
+            target[key] = items
+            for index, child in enumerate(children):
+                if "stringValue" in child:
+                    items[index] = child["stringValue"]
+                else:
+                    stack.append((items, index, child))
+        elif item:
+            (kind, raw), = item.items()
+            target[key] = _decode_scalar(kind, raw)
+        else:
+            target[key] = None
+    return root["value"]
+
+
+def decode_document(document: dict) -> dict:
+    """Decode a REST document (``{"name", "fields", ...}``) into a plain dict."""
+    return decode({"mapValue": {"fields": document.get("fields") or {}}})
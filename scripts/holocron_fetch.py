@@ -0,0 +1,497 @@
+#!/usr/bin/env python3
+"""Incrementally refresh the d6holocron raw page dumps, downloading only revised pages.
+
+Every raw dump already records the ``pageId`` and ``revisionId`` it was
+fetched at. A refresh first asks the wiki for the current ``lastrevid`` of
+up to 50 pages per ``prop=info`` request, then pulls full wikitext only for
+pages whose revision moved (or that have no dump yet) and rewrites those
+files atomically in place. Requests run on asyncio with a bounded
+concurrency window, keep-alive connections, per-host rate limiting and
+retries on 429/5xx. Point ``--api-url`` (or ``HOLOCRON_API_URL``) at
+``holocron_standin.py`` to exercise it offline.
+
+Usage:
+    python3 scripts/holocron_fetch.py                   # species + starships
+    python3 scripts/holocron_fetch.py --only starships --dry-run
+    python3 scripts/holocron_fetch.py --discover        # also pick up new index links
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import gzip
+import json
+import os
+import random
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import quote, urlencode, urlsplit
+
+import metrics
+from holocron_wikitext import RAW_DIR as SPECIES_RAW_DIR
+from metrics import count
+from species_store import ROOT, slugify, write_atomic
+from starship_pipeline import RAW_DIR as STARSHIP_RAW_DIR
+
+API_URL = os.environ.get("HOLOCRON_API_URL", "http://d6holocron.com/wiki/api.php")
+WIKI_URL = "http://d6holocron.com/wiki/"
+RACES_INDEX = ROOT / "Source Data" / "d6holocron" / "races-index.json"
+USER_AGENT = "Star-Wars-d6-Species-Catalog/1.0 (+https://d6holocron.com; CC-BY-SA compliance script)"
+LICENSE = "CC-BY-SA 3.0"
+MAX_TITLES = 50  # MediaWiki's per-request limit for titles/pageids without apihighlimits
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+# Index pages whose links enumerate each collection (see fetch-holocron.js and
+# fetch-starships.js); the extra fields are stamped onto newly found pages.
+INDEX_PAGES: Dict[str, Dict[str, dict]] = {
+    "species": {"Races": {}},
+    "starships": {
+        "Starfighters": {"category": "starfighter"},
+        "Space Transports": {"category": "transport"},
+        "Capital Ships": {"category": "capital"},
+    },
+}
+
+
+class HolocronError(Exception):
+    def __init__(self, message: str, status: Optional[int] = None) -> None:
+        super().__init__(message)
+        self.status = status
+
+
+class HostLimiter:
+    """Space requests to the same host at least ``1 / rate`` seconds apart."""
+
+    def __init__(self, rate: float) -> None:
+        self.interval = 1.0 / rate if rate > 0 else 0.0
+        self.next_slot: Dict[str, float] = {}
+
+    async def wait(self, host: str) -> None:
+        if not self.interval:
+            return
+        now = asyncio.get_running_loop().time()
+        start = max(now, self.next_slot.get(host, now))
+        self.next_slot[host] = start + self.interval
+        if start > now:
+            await asyncio.sleep(start - now)
+
+
+class AsyncHttp:
+    """Minimal HTTP/1.1 GET client on asyncio streams with pooled keep-alive connections."""
+
+    def __init__(
+        self,
+        concurrency: int = 4,
+        rate: float = 2.5,
+        timeout: float = 30.0,
+        max_retries: int = 4,
+        backoff: float = 1.0,
+    ) -> None:
+        self.slots = asyncio.Semaphore(max(1, concurrency))
+        self.limiter = HostLimiter(rate)
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.idle: Dict[Tuple[str, str, int], List[Tuple[asyncio.StreamReader, asyncio.StreamWriter]]] = {}
+        self.requests = 0
+        self.wire_bytes = 0
+
+    async def get(self, url: str) -> bytes:
+        """GET ``url``, retrying 429/5xx and dropped connections with jittered backoff."""
+        parts = urlsplit(url)
+        for attempt in range(self.max_retries + 1):
+            retry_after: Optional[float] = None
+            try:
+                async with self.slots:
+                    await self.limiter.wait(parts.netloc)
+                    status, headers, body = await asyncio.wait_for(self._exchange(parts), self.timeout)
+                if 200 <= status < 300:
+                    return body
+                if status not in RETRY_STATUSES:
+                    raise HolocronError(f"HTTP {status}: {body.decode(errors='replace')[:300]}", status)
+                error = HolocronError(f"HTTP {status}", status)
+                header = headers.get("retry-after", "")
+                if header.isdigit():
+                    retry_after = float(header)
+            except (OSError, EOFError, ValueError, asyncio.TimeoutError) as exc:
+                error = HolocronError(f"{type(exc).__name__}: {exc}")
+            if attempt == self.max_retries:
+                raise error
+            delay = retry_after if retry_after is not None else self.backoff * (2 ** attempt)
+            await asyncio.sleep(delay * (0.5 + random.random() / 2))
+        raise AssertionError("unreachable")
+
+    async def _exchange(self, parts) -> Tuple[int, Dict[str, str], bytes]:
+        https = parts.scheme == "https"
+        key = (parts.scheme, parts.hostname or "", parts.port or (443 if https else 80))
+        pool = self.idle.setdefault(key, [])
+        reader, writer = pool.pop() if pool else await asyncio.open_connection(key[1], key[2], ssl=https or None)
+        try:
+            target = f"{parts.path or '/'}?{parts.query}" if parts.query else parts.path or "/"
+            writer.write(
+                (
+                    f"GET {target} HTTP/1.1\r\n"
+                    f"Host: {parts.netloc}\r\n"
+                    f"User-Agent: {USER_AGENT}\r\n"
+                    "Accept: application/json\r\n"
+                    "Accept-Encoding: gzip\r\n"
+                    "Connection: keep-alive\r\n\r\n"
+                ).encode("latin-1")
+            )
+            await writer.drain()
+            status_line = await reader.readline()
+            if not status_line:
+                raise ConnectionResetError("connection closed by server")
+            version, status, *_ = status_line.decode("latin-1").split(None, 2)
+            headers: Dict[str, str] = {}
+            while True:
+                line = await reader.readline()
+                if line in (b"\r\n", b"\n", b""):
+                    break
+                name, _, value = line.decode("latin-1").partition(":")
+                headers[name.strip().lower()] = value.strip()
+            reusable = version != "HTTP/1.0" and headers.get("connection", "").lower() != "close"
+            if "chunked" in headers.get("transfer-encoding", "").lower():
+                body = await read_chunked(reader)
+            elif "content-length" in headers:
+                body = await reader.readexactly(int(headers["content-length"]))
+            else:
+                body = await reader.read()
+                reusable = False
+        except BaseException:
+            writer.close()
+            raise
+        self.requests += 1
+        self.wire_bytes += len(body)
+        count("http_requests")
+        count("http_bytes", len(body))
+        if reusable:
+            pool.append((reader, writer))
+        else:
+            writer.close()
+        if headers.get("content-encoding", "").lower() == "gzip":
+            body = gzip.decompress(body)
+        return int(status), headers, body
+
+    async def close(self) -> None:
+        for pool in self.idle.values():
+            for _, writer in pool:
+                writer.close()
+        self.idle.clear()
+
+
+async def read_chunked(reader: asyncio.StreamReader) -> bytes:
+    body = bytearray()
+    while True:
+        size = int((await reader.readline()).split(b";", 1)[0].strip() or b"0", 16)
+        if not size:
+            break
+        body += await reader.readexactly(size)
+        await reader.readline()
+    while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+        pass  # trailers
+    return bytes(body)
+
+
+async def api_get(client: AsyncHttp, api_url: str, params: Dict[str, str]) -> dict:
+    data = json.loads(await client.get(f"{api_url}?{urlencode({**params, 'format': 'json'})}"))
+    if "error" in data:
+        raise HolocronError(f"API error {data['error'].get('code')}: {data['error'].get('info')}")
+    return data
+
+
+@dataclass
+class Page:
+    """One wiki page: what the local dump says, and what the wiki reports now."""
+
+    title: str
+    path: Path
+    page_id: Optional[int] = None
+    revision_id: Optional[int] = None
+    extra: dict = field(default_factory=dict)
+    remote_id: Optional[int] = None
+    remote_revision: Optional[int] = None
+    remote_length: int = 0
+    missing: bool = False
+
+    @property
+    def changed(self) -> bool:
+        return self.remote_revision != self.revision_id or not self.path.exists()
+
+
+def load_local(raw_dir: Path) -> Dict[str, Page]:
+    """Index the raw dumps in ``raw_dir`` by title."""
+    pages: Dict[str, Page] = {}
+    for path in sorted(raw_dir.glob("*.json")):
+        record = json.loads(path.read_text(encoding="utf-8"))
+        extra = {key: value for key, value in record.items() if key == "category"}
+        pages[record["title"]] = Page(record["title"], path, record.get("pageId"), record.get("revisionId"), extra)
+    return pages
+
+
+def plan_pages(raw_dir: Path, titles: Optional[List[str]] = None, extras: Optional[Dict[str, dict]] = None) -> List[Page]:
+    """Local dumps plus a fresh ``Page`` for every wanted title that has none yet."""
+    local = load_local(raw_dir)
+    if titles is None:
+        return list(local.values())
+    extras = extras or {}
+    pages = []
+    for title in dict.fromkeys(titles):
+        page = local.get(title) or Page(title, raw_dir / f"{slugify(title, 'page')}.json", extra=dict(extras.get(title, {})))
+        pages.append(page)
+    return pages
+
+
+def index_titles() -> List[str]:
+    if not RACES_INDEX.exists():
+        raise SystemExit(f"❌ Missing {RACES_INDEX}; run fetch-holocron.js once or pass --discover.")
+    return json.loads(RACES_INDEX.read_text(encoding="utf-8"))["titles"]
+
+
+async def discover(client: AsyncHttp, api_url: str, collection: str) -> Dict[str, dict]:
+    """Titles linked from the collection's index pages, mapped to the fields they imply."""
+    found: Dict[str, dict] = {}
+    for index_page, extra in INDEX_PAGES[collection].items():
+        data = await api_get(client, api_url, {"action": "parse", "page": index_page, "prop": "links"})
+        for link in data.get("parse", {}).get("links", []):
+            if link.get("ns") == 0 and link.get("*"):
+                found.setdefault(link["*"], extra)
+    return found
+
+
+async def check_batch(client: AsyncHttp, api_url: str, key: str, batch: List[Page]) -> List[Page]:
+    """Fill in the current revision for ``batch``; returns pages a pageid lookup could not find."""
+    values = [str(page.page_id) if key == "pageids" else page.title for page in batch]
+    data = await api_get(client, api_url, {"action": "query", "prop": "info", key: "|".join(values)})
+    query = data.get("query", {})
+    normalized = {entry["from"]: entry["to"] for entry in query.get("normalized", [])}
+    by_id = {str(info["pageid"]): info for info in query.get("pages", {}).values() if "pageid" in info}
+    by_title = {info["title"]: info for info in query.get("pages", {}).values() if "title" in info}
+    lost = []
+    for page, value in zip(batch, values):
+        info = by_id.get(value) if key == "pageids" else by_title.get(normalized.get(value, value))
+        if info is None or "missing" in info or "invalid" in info:
+            if key == "pageids":
+                lost.append(page)  # deleted or re-created under a new id; retry by title
+            else:
+                page.missing = True
+            continue
+        page.remote_id = info["pageid"]
+        page.remote_revision = info.get("lastrevid")
+        page.remote_length = info.get("length", 0)
+    return lost
+
+
+def batches(pages: List[Page], size: int) -> List[List[Page]]:
+    return [pages[i:i + size] for i in range(0, len(pages), size)]
+
+
+async def check_revisions(client: AsyncHttp, api_url: str, pages: List[Page], batch_size: int) -> None:
+    """Bulk ``prop=info`` lookups: by pageId where the dump has one, by title otherwise."""
+    size = max(1, min(batch_size, MAX_TITLES))
+    known = [page for page in pages if page.page_id]
+    unknown = [page for page in pages if not page.page_id]
+    lost = await asyncio.gather(*(check_batch(client, api_url, "pageids", batch) for batch in batches(known, size)))
+    unknown += [page for batch in lost for page in batch]
+    await asyncio.gather(*(check_batch(client, api_url, "titles", batch) for batch in batches(unknown, size)))
+
+
+def raw_record(page: Page, info: dict, revision: dict) -> dict:
+    """Same shape fetch-holocron.js / fetch-starships.js write."""
+    title = info["title"]
+    return {
+        "title": title,
+        "pageId": info["pageid"],
+        "revisionId": revision["revid"],
+        "wikitext": revision.get("*", ""),
+        **page.extra,
+        "license": LICENSE,
+        "sourceUrl": WIKI_URL + quote(title, safe="!~*'()"),
+        "retrievedAt": datetime.now(timezone.utc).isoformat(timespec="milliseconds").replace("+00:00", "Z"),
+    }
+
+
+async def download_batch(client: AsyncHttp, api_url: str, batch: List[Page]) -> Dict[str, str]:
+    """Fetch content for ``batch`` in one request and rewrite each dump; returns ``{title: error}``."""
+    params = {
+        "action": "query",
+        "prop": "revisions",
+        "rvprop": "ids|content",
+        "pageids": "|".join(str(page.remote_id) for page in batch),
+    }
+    try:
+        data = await api_get(client, api_url, params)
+    except HolocronError as exc:
+        return {page.title: str(exc) for page in batch}
+    found = data.get("query", {}).get("pages", {})
+    failed: Dict[str, str] = {}
+    for page in batch:
+        info = found.get(str(page.remote_id)) or {}
+        revisions = info.get("revisions") or []
+        if not revisions:
+            failed[page.title] = "no revision in response"
+            continue
+        record = raw_record(page, info, revisions[0])
+        await asyncio.to_thread(write_atomic, page.path, [json.dumps(record, indent=2, ensure_ascii=False)])
+        page.revision_id = record["revisionId"]
+    return failed
+
+
+@dataclass
+class FetchStats:
+    checked: int = 0
+    unchanged: int = 0
+    changed: int = 0
+    new: int = 0
+    missing: int = 0
+    downloaded: int = 0
+    bytes_saved: int = 0
+    bytes_total: int = 0
+    failed: Dict[str, str] = field(default_factory=dict)
+
+
+async def refresh(
+    client: AsyncHttp,
+    api_url: str,
+    pages: List[Page],
+    batch_size: int = MAX_TITLES,
+    content_batch: int = 10,
+    dry_run: bool = False,
+) -> FetchStats:
+    """Check every page's revision, then download and rewrite only the stale ones."""
+    stats = FetchStats(checked=len(pages))
+    await check_revisions(client, api_url, pages, batch_size)
+    stale = []
+    for page in pages:
+        if page.missing:
+            stats.missing += 1
+            continue
+        stats.bytes_total += page.remote_length
+        if not page.changed:
+            stats.unchanged += 1
+            stats.bytes_saved += page.remote_length
+            continue
+        if page.revision_id is None:
+            stats.new += 1
+        else:
+            stats.changed += 1
+        stale.append(page)
+    if dry_run or not stale:
+        return stats
+    results = await asyncio.gather(
+        *(download_batch(client, api_url, batch) for batch in batches(stale, max(1, min(content_batch, MAX_TITLES))))
+    )
+    for failed in results:
+        stats.failed.update(failed)
+    stats.downloaded = len(stale) - len(stats.failed)
+    return stats
+
+
+def write_index(titles: List[str]) -> None:
+    index = {
+        "retrievedAt": datetime.now(timezone.utc).isoformat(timespec="milliseconds").replace("+00:00", "Z"),
+        "total": len(titles),
+        "titles": titles,
+        "license": LICENSE,
+        "source": WIKI_URL + "Races",
+    }
+    write_atomic(RACES_INDEX, [json.dumps(index, indent=2, ensure_ascii=False)])
+
+
+async def run(args: argparse.Namespace, client: AsyncHttp) -> Dict[str, FetchStats]:
+    raw_dirs = {"species": args.species_raw, "starships": args.starship_raw}
+    results: Dict[str, FetchStats] = {}
+    try:
+        for collection in args.collections:
+            extras: Dict[str, dict] = {}
+            titles: Optional[List[str]] = None
+            if args.titles:
+                titles = args.titles
+            elif args.discover:
+                extras = await discover(client, args.api_url, collection)
+                titles = list(extras)
+                if collection == "species" and not args.dry_run and titles != index_titles():
+                    write_index(titles)
+                    print(f"✅ races-index.json now lists {len(titles)} titles")
+            elif collection == "species":
+                titles = index_titles()
+            pages = plan_pages(raw_dirs[collection], titles, extras)
+            if collection == "starships" and titles is not None and not args.titles:
+                # Category links only add pages; dumps already on disk stay tracked.
+                seen = {page.title for page in pages}
+                pages += [page for title, page in load_local(raw_dirs[collection]).items() if title not in seen]
+            results[collection] = await refresh(
+                client, args.api_url, pages, args.batch_size, args.content_batch, args.dry_run
+            )
+    finally:
+        await client.close()
+    return results
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--only", choices=sorted(INDEX_PAGES), help="Refresh just one collection (default: both).")
+    parser.add_argument("--api-url", default=API_URL, help="MediaWiki api.php endpoint (default: $HOLOCRON_API_URL or d6holocron).")
+    parser.add_argument("--species-raw", type=Path, default=SPECIES_RAW_DIR, help="Directory of species page dumps.")
+    parser.add_argument("--starship-raw", type=Path, default=STARSHIP_RAW_DIR, help="Directory of starship page dumps.")
+    parser.add_argument("--titles", nargs="+", help="Only refresh these titles.")
+    parser.add_argument("--discover", action="store_true", help="Re-read the index pages for new titles first.")
+    parser.add_argument("--concurrency", type=int, default=4, help="Requests in flight at once.")
+    parser.add_argument("--rate", type=float, default=2.5, help="Max requests per second per host (0 disables).")
+    parser.add_argument("--batch-size", type=int, default=MAX_TITLES, help="Pages per revision check request.")
+    parser.add_argument("--content-batch", type=int, default=10, help="Pages per content download request.")
+    parser.add_argument("--timeout", type=float, default=30.0, help="Per-request timeout in seconds.")
+    parser.add_argument("--retries", type=int, default=4, help="Retries for 429/5xx and dropped connections.")
+    parser.add_argument("--dry-run", action="store_true", help="Check revisions and report, but download nothing.")
+    metrics.add_arguments(parser)
+    args = parser.parse_args(argv)
+    args.collections = [args.only] if args.only else sorted(INDEX_PAGES)
+    return args
+
+
+def fetch(args: argparse.Namespace) -> None:
+    start = time.perf_counter()
+
+    async def session() -> Tuple[AsyncHttp, Dict[str, FetchStats]]:
+        client = AsyncHttp(args.concurrency, args.rate, args.timeout, args.retries)
+        return client, await run(args, client)
+
+    client, results = asyncio.run(session())
+    elapsed = max(time.perf_counter() - start, 1e-9)
+
+    checked = downloaded = saved = total = 0
+    failed: Dict[str, str] = {}
+    for collection, stats in results.items():
+        print(
+            f"{collection}: {stats.checked} checked, {stats.unchanged} unchanged, {stats.changed} revised, "
+            f"{stats.new} new, {stats.missing} missing on the wiki"
+            + (f", {stats.downloaded} downloaded" if not args.dry_run else "")
+        )
+        checked += stats.checked
+        downloaded += stats.downloaded
+        saved += stats.bytes_saved
+        total += stats.bytes_total
+        failed.update(stats.failed)
+    print(
+        f"⏱️  {elapsed:.2f}s, {client.requests} requests, {client.wire_bytes / 1024:.1f} KiB over the wire: "
+        f"{checked / elapsed:.1f} pages/sec checked, {downloaded / elapsed:.1f} pages/sec downloaded"
+    )
+    if total:
+        print(f"💾 Skipped {saved / 1024:.1f} KiB of unchanged wikitext ({saved / total:.0%} of a full re-scrape)")
+    for title, error in sorted(failed.items()):
+        print(f"❌ {title}: {error}")
+    if failed:
+        raise SystemExit(f"❌ {len(failed)} page(s) failed; re-run to retry them.")
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    args = parse_args(argv)
+    with metrics.session("holocron_fetch", args.metrics, args.profile):
+        fetch(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""Serve a local stand-in for the d6holocron MediaWiki API built from the raw page dumps.
+
+Answers the subset the fetchers use: ``action=query`` with ``prop=info`` or
+``prop=revisions`` by ``titles`` or ``pageids`` (50 per request, like the
+real wiki), and ``action=parse&prop=links`` for the Races and starship
+category index pages. Titles in races-index.json without a dump get a
+placeholder page. ``--bump`` gives that many seeded random pages a new
+revision so an incremental refresh has something to download, and
+``--fail-rate`` answers a share of requests with 503 to exercise retries.
+Responses are gzipped when asked and large ones go out chunked.
+
+Usage:
+    python3 scripts/holocron_standin.py --port 8765 --bump 25
+    HOLOCRON_API_URL=http://127.0.0.1:8765/api.php python3 scripts/holocron_fetch.py
+"""
+from __future__ import annotations
+
+import argparse
+import gzip
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, List, Optional
+from urllib.parse import parse_qs, urlsplit
+
+from holocron_fetch import INDEX_PAGES, MAX_TITLES, RACES_INDEX
+from holocron_wikitext import RAW_DIR as SPECIES_RAW_DIR
+from starship_pipeline import RAW_DIR as STARSHIP_RAW_DIR
+
+CHUNK_THRESHOLD = 16 * 1024
+
+
+class StandInWiki:
+    """In-memory pages plus index link lists, answering MediaWiki API queries."""
+
+    def __init__(self, pages: List[dict], links: Dict[str, List[str]]) -> None:
+        self.by_id = {page["pageid"]: page for page in pages}
+        self.by_title = {page["title"]: page for page in pages}
+        self.links = links
+
+    @classmethod
+    def from_dumps(cls, species_dir: Path, starship_dir: Path, index_path: Path = RACES_INDEX) -> "StandInWiki":
+        pages: List[dict] = []
+        links: Dict[str, List[str]] = {name: [] for group in INDEX_PAGES.values() for name in group}
+        categories = {extra["category"]: name for name, extra in INDEX_PAGES["starships"].items()}
+        for directory in (species_dir, starship_dir):
+            for path in sorted(directory.glob("*.json")):
+                record = json.loads(path.read_text(encoding="utf-8"))
+                pages.append({"pageid": record["pageId"], "revid": record["revisionId"], "title": record["title"], "wikitext": record["wikitext"]})
+                if directory == species_dir:
+                    links["Races"].append(record["title"])
+                elif record.get("category") in categories:
+                    links[categories[record["category"]]].append(record["title"])
+        known = {page["title"] for page in pages}
+        next_id = max((page["pageid"] for page in pages), default=0) + 1
+        next_rev = max((page["revid"] for page in pages), default=0) + 1
+        titles = json.loads(index_path.read_text(encoding="utf-8"))["titles"] if index_path.exists() else links["Races"]
+        for title in titles:
+            if title not in known:
+                wikitext = f"'''{title}''' are a species.\n\n==Attributes==\n*Dexterity: 1D/4D\n*Strength: 1D/4D\n"
+                pages.append({"pageid": next_id, "revid": next_rev, "title": title, "wikitext": wikitext})
+                next_id += 1
+                next_rev += 1
+        links["Races"] = list(titles)
+        return cls(pages, links)
+
+    def bump(self, count: int, seed: int) -> List[str]:
+        """Give ``count`` random pages a new revision; returns their titles."""
+        rng = random.Random(seed)
+        revision = max((page["revid"] for page in self.by_id.values()), default=0)
+        chosen = rng.sample(sorted(self.by_id), min(count, len(self.by_id)))
+        for pageid in chosen:
+            revision += 1
+            page = self.by_id[pageid]
+            page["revid"] = revision
+            page["wikitext"] += f"\n<!-- revision {revision} -->"
+        return [self.by_id[pageid]["title"] for pageid in chosen]
+
+    def view(self, page: dict, props: List[str], content: bool) -> dict:
+        entry = {"pageid": page["pageid"], "ns": 0, "title": page["title"]}
+        if "info" in props:
+            entry.update(contentmodel="wikitext", lastrevid=page["revid"], length=len(page["wikitext"].encode("utf-8")))
+        if "revisions" in props:
+            revision = {"revid": page["revid"], "parentid": 0}
+            if content:
+                revision.update({"contentformat": "text/x-wiki", "contentmodel": "wikitext", "*": page["wikitext"]})
+            entry["revisions"] = [revision]
+        return entry
+
+    def query(self, params: Dict[str, str]) -> dict:
+        props = params.get("prop", "").split("|")
+        content = "content" in params.get("rvprop", "").split("|")
+        pages: Dict[str, dict] = {}
+        normalized = []
+        warnings = []
+        for key in ("pageids", "titles"):
+            values = [value for value in params.get(key, "").split("|") if value]
+            if len(values) > MAX_TITLES:
+                warnings.append(f"Too many values supplied for parameter \"{key}\". The limit is {MAX_TITLES}.")
+                values = values[:MAX_TITLES]
+            for value in values:
+                if key == "pageids":
+                    page = self.by_id.get(int(value)) if value.isdigit() else None
+                    pages[value] = self.view(page, props, content) if page else {"pageid": int(value) if value.isdigit() else value, "missing": ""}
+                    continue
+                title = value.replace("_", " ").strip()
+                title = title[:1].upper() + title[1:]
+                if title != value:
+                    normalized.append({"from": value, "to": title})
+                page = self.by_title.get(title)
+                if page:
+                    pages[str(page["pageid"])] = self.view(page, props, content)
+                else:
+                    pages[str(-1 - len(pages))] = {"ns": 0, "title": title, "missing": ""}
+        result: dict = {"batchcomplete": "", "query": {"pages": pages}}
+        if normalized:
+            result["query"]["normalized"] = normalized
+        if warnings:
+            result["warnings"] = {"main": {"*": "\n".join(warnings)}}
+        return result
+
+    def answer(self, params: Dict[str, str]) -> dict:
+        action = params.get("action")
+        if action == "query":
+            return self.query(params)
+        if action == "parse" and params.get("page") in self.links:
+            titles = self.links[params["page"]]
+            return {"parse": {"title": params["page"], "links": [{"ns": 0, "exists": "", "*": title} for title in titles]}}
+        if action == "parse":
+            return {"error": {"code": "missingtitle", "info": "The page you specified doesn't exist."}}
+        return {"error": {"code": "badvalue", "info": f"Unrecognized value for parameter \"action\": {action}."}}
+
+
+def make_server(wiki: StandInWiki, host: str = "127.0.0.1", port: int = 0, latency: float = 0.0, fail_rate: float = 0.0, seed: int = 0) -> ThreadingHTTPServer:
+    """Bind (``port=0`` picks a free one) without serving; call ``serve_forever`` yourself."""
+    rng = random.Random(seed)
+    lock = threading.Lock()
+    stats = {"requests": 0, "failed": 0}
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self) -> None:  # noqa: N802 - http.server naming
+            url = urlsplit(self.path)
+            with lock:
+                stats["requests"] += 1
+                fail = rng.random() < fail_rate
+                stats["failed"] += fail
+            if latency:
+                time.sleep(latency)
+            if not url.path.endswith("api.php"):
+                return self.send_body(404, b"Not Found", "text/plain")
+            if fail:
+                return self.send_body(503, b"Service Unavailable", "text/plain", retry_after="0")
+            params = {key: values[-1] for key, values in parse_qs(url.query).items()}
+            self.send_body(200, json.dumps(wiki.answer(params)).encode("utf-8"), "application/json; charset=utf-8")
+
+        def send_body(self, status: int, body: bytes, content_type: str, retry_after: Optional[str] = None) -> None:
+            self.send_response(status)
+            self.send_header("Content-Type", content_type)
+            if retry_after is not None:
+                self.send_header("Retry-After", retry_after)
+            if "gzip" in self.headers.get("Accept-Encoding", ""):
+                body = gzip.compress(body, 6)
+                self.send_header("Content-Encoding", "gzip")
+            if len(body) > CHUNK_THRESHOLD:
+                self.send_header("Transfer-Encoding", "chunked")
+                self.end_headers()
+                for start in range(0, len(body), CHUNK_THRESHOLD // 2):
+                    chunk = body[start:start + CHUNK_THRESHOLD // 2]
+                    self.wfile.write(b"%x\r\n%s\r\n" % (len(chunk), chunk))
+                self.wfile.write(b"0\r\n\r\n")
+            else:
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+        def log_message(self, format: str, *args) -> None:  # noqa: A002 - http.server signature
+            pass
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    server.daemon_threads = True
+    server.stats = stats  # type: ignore[attr-defined]
+    return server
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1", help="Interface to bind.")
+    parser.add_argument("--port", type=int, default=8765, help="Port to listen on.")
+    parser.add_argument("--species-raw", type=Path, default=SPECIES_RAW_DIR, help="Species page dumps to serve.")
+    parser.add_argument("--starship-raw", type=Path, default=STARSHIP_RAW_DIR, help="Starship page dumps to serve.")
+    parser.add_argument("--bump", type=int, default=0, help="Give this many random pages a new revision.")
+    parser.add_argument("--seed", type=int, default=22, help="Random seed for --bump and --fail-rate.")
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds to sleep before each response.")
+    parser.add_argument("--fail-rate", type=float, default=0.0, help="Share of requests answered with 503.")
+    args = parser.parse_args()
+
+    wiki = StandInWiki.from_dumps(args.species_raw, args.starship_raw)
+    for title in wiki.bump(args.bump, args.seed):
+        print(f"  bumped {title}")
+    server = make_server(wiki, args.host, args.port, args.latency, args.fail_rate, args.seed)
+    print(f"✅ Serving {len(wiki.by_id)} pages at http://{args.host}:{server.server_address[1]}/api.php")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        print(f"{server.stats['requests']} requests, {server.stats['failed']} answered 503")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,364 @@
+#!/usr/bin/env python3
+"""Stream d6holocron wikitext dumps (Source Data/d6holocron/raw/*.json) into species records."""
+from __future__ import annotations
+
+import argparse
+import json
+import re
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+import metrics
+from metrics import count, timed
+from species_store import ROOT, write_atomic
+
+RAW_DIR = ROOT / "Source Data" / "d6holocron" / "raw"
+
+# One alternation, tried left to right at each offset: the whole page is
+# tokenized in a single re.finditer pass.
+TOKEN_RE = re.compile(
+    r"""
+      (?P<file>\[\[(?:File|Image):(?P<file_name>[^|\]]+)(?:[^\[\]]|\[\[[^\]]*\]\])*\]\])
+    | (?P<link>\[\[(?P<link_target>[^|\]]+)(?:\|(?P<link_text>[^\]]*))?\]\])
+    | (?P<br><br\s*/?>)
+    | (?P<template>\{\{[^}]*\}\})
+    | (?P<heading>^[ \t]*=+[ \t]*(?P<heading_text>[^\n]*?)[ \t]*=+[ \t]*$)
+    | (?P<bold>'{3,5}(?P<bold_text>[^'\n]*(?:'(?!'')[^'\n]*)*)'{3,5}(?P<bold_colon>[ \t]*:)?)
+    | (?P<italic>''(?P<italic_text>[^'\n]*(?:'(?!')[^'\n]*)*)''(?P<italic_colon>[ \t]*:)?)
+    | (?P<entity>&(?:nbsp|amp|quot|lt|gt);)
+    | (?P<newline>\n)
+    | (?P<text>[^\[<{'&\n=]+|.)
+    """,
+    re.I | re.M | re.X,
+)
+ENTITIES = {"&nbsp;": " ", "&amp;": "&", "&quot;": '"', "&lt;": "<", "&gt;": ">"}
+MARKUP_RE = re.compile(r"\[\[(?:[^|\]]*\|)?([^\]]*)\]\]|'{2,}|:")
+WHITESPACE_RE = re.compile(r"\s+")
+
+ATTRIBUTE_KEYS = {
+    "DEXTERITY": "dexterity",
+    "KNOWLEDGE": "knowledge",
+    "MECHANICAL": "mechanical",
+    "PERCEPTION": "perception",
+    "STRENGTH": "strength",
+    "TECHNICAL": "technical",
+    "DEX": "dexterity",
+    "KNO": "knowledge",
+    "MEC": "mechanical",
+    "PER": "perception",
+    "STR": "strength",
+    "TEC": "technical",
+    # misspellings that occur in the dumps
+    "MECHANCIAL": "mechanical",
+    "PERCETION": "perception",
+}
+ATTRIBUTE_RE = re.compile(
+    r"\b(DEXTERITY|KNOWLEDGE|MECHANICAL|PERCEPTION|STRENGTH|TECHNICAL|MECHANCIAL|PERCETION|DEX|KNO|MEC|PER|STR|TEC)"
+    r"\s*:?\s*([0-9]D(?:[+\-][0-9])?)\s*/\s*([0-9]D(?:[+\-][0-9])?)",
+    re.I,
+)
+LIST_MARKERS = "*#: "
+
+# Labels whose value is the rest of their line.
+INLINE_FIELDS = {
+    "species": "name",
+    "home planet": "homeworld",
+    "homeworld": "homeworld",
+    "attribute dice": "attributeDice",
+    "move": "move",
+    "size": "size",
+    "average height": "size",
+    "source": "source",
+    "sources": "source",
+}
+# Labels and headings that open a prose or list section.
+SECTION_FIELDS = {
+    "description": "description",
+    "personality": "personality",
+    "physical description": "physicalDescription",
+    "biology & appearance": "physicalDescription",
+    "biology and appearance": "physicalDescription",
+    "language": "languages",
+    "languages": "languages",
+    "names": "names",
+    "example names": "names",
+    "adventurers": "adventurers",
+    "special abilities": "specialAbilities",
+    "story factors": "storyFactors",
+    "attributes & abilities": "attributes",
+}
+ENTRY_SECTIONS = {"specialAbilities", "storyFactors"}
+OTHER = "_other"
+
+
+def canonical_label(value: str) -> str:
+    return WHITESPACE_RE.sub(" ", MARKUP_RE.sub(r"\1", value)).strip(" '").lower()
+
+
+def tokenize(wikitext: str) -> Iterator[Tuple[str, str]]:
+    """Yield ``(kind, value)`` tokens: ``text``, ``emphasis``, ``label``, ``heading``, ``break``, ``file``.
+
+    Links collapse to their display text, ``<br />`` and newlines become
+    breaks, bold/italic runs containing a colon become labels ('''Move: 10/12'''
+    is a label plus its text) and any other emphasis is ``emphasis``.
+    """
+    for match in TOKEN_RE.finditer(wikitext):
+        kind = match.lastgroup
+        if kind == "text":
+            yield "text", match.group()
+        elif kind in ("newline", "br"):
+            yield "break", ""
+        elif kind == "link":
+            yield "text", match.group("link_text") or match.group("link_target")
+        elif kind in ("bold", "italic"):
+            inner = match.group(f"{kind}_text")
+            label, colon, rest = inner.partition(":")
+            if colon:
+                yield "label", label.strip()
+                if rest.strip():
+                    yield "text", f" {rest}"
+            elif match.group(f"{kind}_colon"):
+                yield "label", inner.strip()
+            else:
+                yield "emphasis", inner
+        elif kind == "heading":
+            yield "heading", match.group("heading_text")
+        elif kind == "entity":
+            yield "text", ENTITIES[match.group().lower()]
+        elif kind == "file":
+            yield "file", match.group("file_name").strip()
+        # templates are dropped
+
+
+class _RecordBuilder:
+    """Consume tokens for one page and collect lines per section."""
+
+    def __init__(self, title: str) -> None:
+        self.title = title
+        self.title_key = title.lower()
+        self.inline: Dict[str, str] = {}
+        self.sections: Dict[str, List[str]] = {}
+        self.entries: Dict[str, List[Dict[str, str]]] = {key: [] for key in ENTRY_SECTIONS}
+        self.attributes: Dict[str, Dict[str, str]] = {}
+        self.images: List[str] = []
+        self.section = "description"
+        self.inline_field: Optional[str] = None
+        self.line: List[str] = []
+        self.line_label: Optional[str] = None
+
+    def section_for(self, label: str) -> Optional[str]:
+        key = canonical_label(label)
+        if key in SECTION_FIELDS:
+            return SECTION_FIELDS[key]
+        if key == self.title_key:
+            return "description"
+        if key.endswith(" in the galaxy"):
+            return "adventurers"
+        return None
+
+    def feed(self, kind: str, value: str) -> None:
+        if kind == "text":
+            self.line.append(value)
+        elif kind == "emphasis":
+            # '''Attribute Dice''' 12D or a bare '''Species name''' heading line
+            key = canonical_label(value)
+            if (key in INLINE_FIELDS or self.section_for(key)) and self.at_line_start():
+                self.label(value)
+            else:
+                self.line.append(value)
+        elif kind == "break":
+            self.flush()
+        elif kind == "label":
+            self.label(value)
+        elif kind == "heading":
+            self.flush()
+            self.open(canonical_label(value))
+        elif kind == "file":
+            self.images.append(value)
+
+    def open(self, key: str) -> None:
+        if key in INLINE_FIELDS:
+            self.inline_field = INLINE_FIELDS[key]
+        else:
+            self.inline_field = None
+            self.section = self.section_for(key) or OTHER
+
+    def label(self, value: str) -> None:
+        key = canonical_label(value)
+        if key.upper() in ATTRIBUTE_KEYS:
+            self.line.append(f" {key.upper()} ")
+            return
+        if not self.at_line_start():
+            self.line.append(f"{value}: ")
+        elif key in INLINE_FIELDS or self.section_for(key):
+            self.flush()
+            self.open(key)
+        elif self.section in ENTRY_SECTIONS:
+            self.line_label = WHITESPACE_RE.sub(" ", value).strip()
+        else:
+            self.flush()
+            self.inline_field = None
+            self.section = OTHER
+
+    def at_line_start(self) -> bool:
+        return not "".join(self.line).strip(LIST_MARKERS)
+
+    def flush(self) -> None:
+        text = " ".join("".join(self.line).split()).lstrip(LIST_MARKERS)
+        label, self.line, self.line_label = self.line_label, [], None
+        if "/" in text and self.collect_attributes(text):
+            return
+        if self.inline_field:
+            if text:
+                self.inline.setdefault(self.inline_field, text)
+                self.inline_field = None
+            return
+        if self.section in ENTRY_SECTIONS:
+            entries = self.entries[self.section]
+            if label:
+                entries.append({"name": label, "description": text})
+            elif text and entries:
+                entries[-1]["description"] = f"{entries[-1]['description']} {text}".strip()
+            elif text:
+                entries.append({"name": "", "description": text})
+        elif text and self.section != OTHER:
+            self.sections.setdefault(self.section, []).append(text)
+
+    def collect_attributes(self, text: str) -> bool:
+        matches = list(ATTRIBUTE_RE.finditer(text))
+        if not matches:
+            return False
+        for match in matches:
+            key = ATTRIBUTE_KEYS[match.group(1).upper()]
+            self.attributes.setdefault(key, {"min": match.group(2).upper(), "max": match.group(3).upper()})
+        remainder = ATTRIBUTE_RE.sub("", text).strip(" ,;")
+        return not remainder
+
+    def text(self, section: str) -> str:
+        return " ".join(self.sections.get(section, []))
+
+
+def derive_plural(name: str) -> str:
+    if not name or name.endswith("s") or "'" in name or "-" in name:
+        return name
+    if name.endswith("y"):
+        return f"{name[:-1]}ies"
+    return f"{name}s"
+
+
+NATIVE_LANGUAGE_RE = re.compile(r"speaks?(?: their)?(?: own)?(?: native)? ([A-Za-z' -]+)", re.I)
+QUOTED_RE = re.compile(r"\"([A-Za-z' -]+)\"")
+
+
+def infer_native_language(notes: str, name: str) -> str:
+    match = NATIVE_LANGUAGE_RE.search(notes)
+    if match:
+        parts = [re.sub(r"language", "", part, flags=re.I).strip() for part in re.split(r"\bor\b", match.group(1), flags=re.I)]
+        parts = [part for part in parts if part]
+        return parts[-1] if parts else match.group(1).strip()
+    match = QUOTED_RE.search(notes)
+    if match:
+        return match.group(1).strip()
+    return f"{name} language" if notes else ""
+
+
+def parse_names(text: str) -> List[str]:
+    names: List[str] = []
+    for entry in re.split(r"[,;*]", text):
+        entry = entry.strip()
+        if entry and entry not in names and "names are" not in entry.lower():
+            names.append(entry)
+    return names[:6]
+
+
+@timed("parse_species_wikitext")
+def parse_wikitext(wikitext: str, title: str) -> dict:
+    """Parse one holocron page into an ALIENS.json-shaped species record."""
+    builder = _RecordBuilder(title)
+    for kind, value in tokenize(wikitext.replace("\r\n", "\n")):
+        builder.feed(kind, value)
+    builder.flush()
+
+    name = builder.inline.get("name") or title
+    languages = builder.text("languages")
+    count("records_parsed")
+    return {
+        "name": name,
+        "plural": derive_plural(name),
+        "description": builder.text("description"),
+        "personality": builder.text("personality"),
+        "physicalDescription": builder.text("physicalDescription"),
+        "homeworld": builder.inline.get("homeworld", ""),
+        "languages": {"native": infer_native_language(languages, name), "description": languages},
+        "exampleNames": parse_names(builder.text("names")),
+        "adventurers": builder.text("adventurers"),
+        "imageUrl": "",
+        "stats": {
+            "attributeDice": builder.inline.get("attributeDice", "").upper(),
+            "attributes": builder.attributes,
+            "move": builder.inline.get("move", ""),
+            "size": builder.inline.get("size", ""),
+        },
+        "specialAbilities": builder.entries["specialAbilities"],
+        "storyFactors": [
+            entry for entry in builder.entries["storyFactors"]
+            if entry["name"] and entry["name"].lower() not in {"size", "move", "source"}
+        ],
+        "sources": [builder.inline["source"]] if builder.inline.get("source") else [],
+    }
+
+
+def has_stats(record: dict) -> bool:
+    """The same completeness gate fetch-holocron.js applies before import."""
+    stats = record["stats"]
+    return bool(stats["attributeDice"] and stats["attributes"] and stats["move"] and stats["size"])
+
+
+def iter_raw_pages(paths: Iterable[Path]) -> Iterator[dict]:
+    """Load raw page dumps one file at a time."""
+    for path in paths:
+        yield json.loads(path.read_text(encoding="utf-8"))
+
+
+def iter_species(pages: Iterable[dict]) -> Iterator[dict]:
+    """Lazily turn ``{title, wikitext, ...}`` pages into species records."""
+    for page in pages:
+        yield parse_wikitext(page.get("wikitext", ""), page.get("title", ""))
+
+
+def export(args: argparse.Namespace) -> None:
+    paths = args.paths or sorted(args.raw.glob("*.json"))
+    counts = {"parsed": 0, "complete": 0}
+
+    def records() -> Iterator[dict]:
+        for record in iter_species(iter_raw_pages(paths)):
+            counts["parsed"] += 1
+            complete = has_stats(record)
+            counts["complete"] += complete
+            if complete or not args.complete_only:
+                yield record
+
+    if args.out:
+        write_atomic(args.out, (json.dumps(record, ensure_ascii=False) + "\n" for record in records()))
+    else:
+        for _ in records():
+            pass
+    print(f"✅ Parsed {counts['parsed']} pages ({counts['complete']} with full stats).")
+    if args.out:
+        print(f"Wrote {args.out}")
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("paths", nargs="*", type=Path, help="Raw page JSON files (default: every file in --raw).")
+    parser.add_argument("--raw", type=Path, default=RAW_DIR, help="Directory of raw page dumps.")
+    parser.add_argument("--out", type=Path, help="Write records as JSON lines to this path.")
+    parser.add_argument("--complete-only", action="store_true", help="Skip records missing attribute dice, move or size.")
+    metrics.add_arguments(parser)
+    args = parser.parse_args(argv)
+    with metrics.session("holocron_wikitext", args.metrics, args.profile):
+        export(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,20 +1,61 @@
 #!/usr/bin/env python3
+"""Bulk-import ALIENS.json into the Firestore ``species`` collection over the REST API.
+
+Requests go through one keep-alive connection per worker thread with a
+bounded concurrency window, retry 429/5xx responses with exponential
+backoff, and record failed slugs in a checkpoint file that ``--resume``
+picks up. ``--batch-size`` switches to ``documents:batchWrite`` so thousands
+of documents go out in a handful of requests. Point ``--base-url`` (or
+``FIRESTORE_BASE_URL``) at a local stand-in to exercise it offline.
+
+``--sync`` compares per-record content hashes (ignoring ``updatedAt``)
+against the state file from the last successful push and only sends new
+documents in full and changed ones as ``updateMask`` partial updates.
+"""
+import argparse
+import hashlib
+import http.client
 import json
-import subprocess
+import random
+import threading
+import time
 import unicodedata
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+from urllib.parse import quote, urlencode, urlsplit
 
 import os
 
+import metrics
+from firestore_values import encode, encode_fields
+from metrics import count, timed
+from species_store import ALIENS_PATH, ROOT, SpeciesStore, write_atomic
+
 API_KEY = os.environ.get('FIRESTORE_API_KEY', '')
 PROJECT_ID = os.environ.get('FIREBASE_PROJECT_ID', 'star-wars-d6-species')
-CREATE_URL = f"https://firestore.googleapis.com/v1/projects/{PROJECT_ID}/databases/(default)/documents/species"
+BASE_URL = os.environ.get('FIRESTORE_BASE_URL', 'https://firestore.googleapis.com')
+CHECKPOINT_PATH = ROOT / ".cache" / "import_species_checkpoint.json"
+SYNC_STATE_PATH = ROOT / ".cache" / "firestore_sync_state.json"
+
+# Fields that change on every build and must not count as content changes.
+VOLATILE_FIELDS = {"updatedAt"}
 
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+# Firestore rejects batchWrite requests with more than 500 writes.
+MAX_BATCH_SIZE = 500
 
-def load_records():
-    payload = json.loads(Path("ALIENS.json").read_text())
-    records = payload if isinstance(payload, list) else payload.get("races", [])
+
+class FirestoreError(RuntimeError):
+    def __init__(self, message: str, status: Optional[int] = None) -> None:
+        super().__init__(message)
+        self.status = status
+
+
+def load_records(path: Path = ALIENS_PATH):
+    records = SpeciesStore.load(path).races
     if not records:
         raise SystemExit("ALIENS.json must contain races array")
     return records
@@ -57,25 +98,11 @@ def tokenize(*parts) -> list[str]:
 
 
 def to_value(value):
-    if value is None:
-        return {"nullValue": None}
-    if isinstance(value, bool):
-        return {"booleanValue": value}
-    if isinstance(value, int):
-        return {"integerValue": str(value)}
-    if isinstance(value, float):
-        return {"doubleValue": value}
-    if isinstance(value, str):
-        return {"stringValue": value}
-    if isinstance(value, list):
-        return {"arrayValue": {"values": [to_value(item) for item in value]}}
-    if isinstance(value, dict):
-        fields = {k: to_value(v) for k, v in value.items() if v is not None}
-        return {"mapValue": {"fields": fields}}
-    raise TypeError(f"Unsupported value type: {type(value)}")
+    return encode(value, drop_none=True)
 
 
-def build_payload(record: dict, index: int) -> tuple[str, bytes]:
+@timed()
+def build_document(record: dict, index: int) -> tuple[str, dict]:
     name = record.get("name", f"species-{index}")
     slug = slugify(name, f"species-{index}")
 
@@ -97,43 +124,358 @@ def build_payload(record: dict, index: int) -> tuple[str, bytes]:
         "imagePath": f"aliens/{slug}.webp" if record.get("imageUrl") else None,
         "updatedAt": datetime.now(timezone.utc).isoformat(),
     }
+    return slug, doc
 
-    payload = json.dumps({"fields": to_value(doc)["mapValue"]["fields"]}).encode()
+
+@timed()
+def build_payload(record: dict, index: int) -> tuple[str, bytes]:
+    slug, doc = build_document(record, index)
+    payload = json.dumps({"fields": encode_fields(doc, drop_none=True)}).encode()
     return slug, payload
 
 
-def import_record(slug: str, payload: bytes):
-    url = f"{CREATE_URL}/{slug}?key={API_KEY}"
-    result = subprocess.run(
-        [
-            "curl",
-            "-sS",
-            "-X",
-            "PATCH",
-            "-H",
-            "Content-Type: application/json",
-            url,
-            "--data-binary",
-            "@-",
-        ],
-        input=payload,
-        stdout=subprocess.PIPE,
-        stderr=subprocess.PIPE,
+class FirestoreClient:
+    """Minimal Firestore REST client with per-thread keep-alive connections and retries."""
+
+    def __init__(
+        self,
+        base_url: str = BASE_URL,
+        project_id: str = PROJECT_ID,
+        api_key: str = API_KEY,
+        timeout: float = 30.0,
+        max_retries: int = 5,
+        backoff: float = 0.5,
+    ) -> None:
+        parts = urlsplit(base_url)
+        self.scheme = parts.scheme or "https"
+        self.netloc = parts.netloc
+        self.prefix = parts.path.rstrip("/")
+        self.database = f"projects/{project_id}/databases/(default)"
+        self.api_key = api_key
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self._local = threading.local()
+        self.requests = 0
+        self._lock = threading.Lock()
+
+    def _connection(self, fresh: bool = False) -> http.client.HTTPConnection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None or fresh:
+            if conn is not None:
+                conn.close()
+            factory = http.client.HTTPSConnection if self.scheme == "https" else http.client.HTTPConnection
+            conn = factory(self.netloc, timeout=self.timeout)
+            self._local.conn = conn
+        return conn
+
+    def _url(self, path: str, mask: Optional[List[str]] = None) -> str:
+        params = [("key", self.api_key)] if self.api_key else []
+        params.extend(("updateMask.fieldPaths", field_path) for field_path in mask or [])
+        query = f"?{urlencode(params)}" if params else ""
+        return f"{self.prefix}/v1/{self.database}/documents{path}{query}"
+
+    def request(self, method: str, path: str, body: Optional[bytes], mask: Optional[List[str]] = None) -> bytes:
+        """Send one request, retrying 429/5xx and dropped connections with jittered backoff."""
+        url = self._url(path, mask)
+        reconnect = False
+        for attempt in range(self.max_retries + 1):
+            retry_after: Optional[float] = None
+            try:
+                conn = self._connection(fresh=reconnect)
+                reconnect = False
+                conn.request(method, url, body=body, headers={"Content-Type": "application/json"})
+                response = conn.getresponse()
+                data = response.read()
+                with self._lock:
+                    self.requests += 1
+                count("http_requests")
+                count("http_bytes", len(body or b"") + len(data))
+                if 200 <= response.status < 300:
+                    return data
+                if response.status not in RETRY_STATUSES:
+                    raise FirestoreError(f"HTTP {response.status}: {data.decode(errors='replace')[:300]}", response.status)
+                error = FirestoreError(f"HTTP {response.status}", response.status)
+                header = response.getheader("Retry-After")
+                if header and header.isdigit():
+                    retry_after = float(header)
+            except (http.client.HTTPException, OSError) as exc:
+                error = FirestoreError(f"{type(exc).__name__}: {exc}")
+                reconnect = True
+            if attempt == self.max_retries:
+                raise error
+            delay = retry_after if retry_after is not None else self.backoff * (2 ** attempt)
+            time.sleep(delay * (0.5 + random.random() / 2))
+        raise AssertionError("unreachable")
+
+    def patch_document(self, slug: str, payload: bytes, mask: Optional[List[str]] = None) -> None:
+        """PATCH a document; with ``mask`` only those fields are written (absent ones are removed)."""
+        self.request("PATCH", f"/species/{quote(slug)}", payload, mask)
+
+    def delete_document(self, slug: str) -> None:
+        self.request("DELETE", f"/species/{quote(slug)}", None)
+
+    @timed()
+    def batch_write(self, documents: List[Tuple[str, dict]], masks: Optional[Dict[str, List[str]]] = None) -> Dict[str, str]:
+        """Upsert documents in one ``batchWrite`` call; returns ``{slug: error}`` for rejected writes."""
+        writes = []
+        for slug, doc in documents:
+            write: dict = {
+                "update": {
+                    "name": f"{self.database}/documents/species/{slug}",
+                    "fields": encode_fields(doc, drop_none=True),
+                }
+            }
+            if masks and slug in masks:
+                write["updateMask"] = {"fieldPaths": masks[slug]}
+            writes.append(write)
+        body = json.dumps({"writes": writes}).encode()
+        response = json.loads(self.request("POST", ":batchWrite", body) or b"{}")
+        failures: Dict[str, str] = {}
+        for (slug, _), status in zip(documents, response.get("status", [])):
+            if status.get("code", 0):
+                failures[slug] = status.get("message") or f"code {status['code']}"
+        return failures
+
+
+_default_client: Optional[FirestoreClient] = None
+
+
+@timed()
+def import_record(slug: str, payload: bytes, client: Optional[FirestoreClient] = None, mask: Optional[List[str]] = None):
+    global _default_client
+    if client is None:
+        if _default_client is None:
+            _default_client = FirestoreClient()
+        client = _default_client
+    client.patch_document(slug, payload, mask)
+
+
+def digest(value) -> str:
+    canonical = json.dumps(value, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+    return hashlib.blake2b(canonical.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def content_hashes(doc: dict) -> Dict[str, str]:
+    """Per-field hashes of everything that is actually sent, minus volatile fields."""
+    return {key: digest(value) for key, value in doc.items() if value is not None and key not in VOLATILE_FIELDS}
+
+
+def document_hash(field_hashes: Dict[str, str]) -> str:
+    return digest(field_hashes)
+
+
+@dataclass
+class SyncPlan:
+    creates: List[Tuple[str, dict]] = field(default_factory=list)
+    updates: List[Tuple[str, dict]] = field(default_factory=list)
+    masks: Dict[str, List[str]] = field(default_factory=dict)
+    hashes: Dict[str, Dict[str, str]] = field(default_factory=dict)
+    unchanged: int = 0
+    deleted: List[str] = field(default_factory=list)
+
+    @property
+    def writes(self) -> List[Tuple[str, dict]]:
+        return self.creates + self.updates
+
+
+def load_sync_state(path: Path, project_id: str = PROJECT_ID) -> Dict[str, dict]:
+    if not path.exists():
+        return {}
+    state = json.loads(path.read_text(encoding="utf-8"))
+    if state.get("project") != project_id:
+        return {}
+    return state.get("documents", {})
+
+
+def save_sync_state(path: Path, documents: Dict[str, dict], project_id: str = PROJECT_ID) -> None:
+    payload = {"version": 1, "project": project_id, "documents": dict(sorted(documents.items()))}
+    write_atomic(path, [json.dumps(payload, ensure_ascii=False, indent=2), "\n"])
+
+
+def latest_per_slug(documents: Iterable[Tuple[str, dict]]) -> List[Tuple[str, dict]]:
+    """Keep the last record per slug, as the old sequential import left it in Firestore.
+
+    Concurrent PATCHes of one slug race, and ``batchWrite`` rejects a whole
+    batch that writes one document twice.
+    """
+    latest: Dict[str, dict] = {}
+    for slug, doc in documents:
+        if slug in latest:
+            print(f"⚠️  {slug} appears more than once in the catalog; importing the last record")
+        latest[slug] = doc
+    return list(latest.items())
+
+
+@timed()
+def plan_sync(documents: Iterable[Tuple[str, dict]], state: Dict[str, dict]) -> SyncPlan:
+    """Split documents into creates, masked updates and no-ops against the last pushed state."""
+    plan = SyncPlan()
+    latest = dict(documents)  # duplicate slugs: the last record wins, as in Firestore
+    for slug, doc in latest.items():
+        fields = content_hashes(doc)
+        plan.hashes[slug] = {"hash": document_hash(fields), "fields": fields}
+        previous = state.get(slug)
+        if previous is None:
+            plan.creates.append((slug, doc))
+        elif previous.get("hash") != plan.hashes[slug]["hash"]:
+            old_fields = previous.get("fields", {})
+            changed = sorted(key for key in fields.keys() | old_fields.keys() if fields.get(key) != old_fields.get(key))
+            plan.masks[slug] = changed + sorted(VOLATILE_FIELDS & doc.keys())
+            plan.updates.append((slug, {key: doc[key] for key in plan.masks[slug] if key in doc}))
+        else:
+            plan.unchanged += 1
+    plan.deleted = sorted(slug for slug in state if slug not in latest)
+    return plan
+
+
+def load_checkpoint(path: Path) -> Dict[str, str]:
+    if not path.exists():
+        return {}
+    return json.loads(path.read_text(encoding="utf-8")).get("failed", {})
+
+
+def save_checkpoint(path: Path, failed: Dict[str, str]) -> None:
+    if not failed:
+        if path.exists():
+            path.unlink()
+        return
+    payload = {"savedAt": datetime.now(timezone.utc).isoformat(), "failed": dict(sorted(failed.items()))}
+    write_atomic(path, [json.dumps(payload, ensure_ascii=False, indent=2), "\n"])
+
+
+def run_import(
+    documents: List[Tuple[str, dict]],
+    client: FirestoreClient,
+    concurrency: int,
+    batch_size: int,
+    masks: Optional[Dict[str, List[str]]] = None,
+) -> Dict[str, str]:
+    """Push documents through the bounded worker pool; returns ``{slug: error}`` for failures."""
+    failed: Dict[str, str] = {}
+    masks = masks or {}
+    with ThreadPoolExecutor(max_workers=max(1, concurrency)) as pool:
+        if batch_size:
+            chunks = [documents[i:i + batch_size] for i in range(0, len(documents), batch_size)]
+            futures = {pool.submit(client.batch_write, chunk, masks): chunk for chunk in chunks}
+            for future in as_completed(futures):
+                chunk = futures[future]
+                try:
+                    rejected = future.result()
+                except FirestoreError as exc:
+                    rejected = {slug: str(exc) for slug, _ in chunk}
+                failed.update(rejected)
+                print(f"Imported batch of {len(chunk) - len(rejected)}/{len(chunk)} documents")
+        else:
+            futures = {
+                pool.submit(
+                    import_record,
+                    slug,
+                    json.dumps({"fields": encode_fields(doc, drop_none=True)}).encode(),
+                    client,
+                    masks.get(slug),
+                ): slug
+                for slug, doc in documents
+            }
+            for future in as_completed(futures):
+                slug = futures[future]
+                try:
+                    future.result()
+                    print(f"Imported {slug}")
+                except FirestoreError as exc:
+                    failed[slug] = str(exc)
+                    print(f"❌ {slug}: {exc}")
+    return failed
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--aliens", type=Path, default=ALIENS_PATH, help="Catalog to import (default: ALIENS.json).")
+    parser.add_argument("--base-url", default=BASE_URL, help="Firestore REST origin, e.g. a local mock server.")
+    parser.add_argument("--concurrency", type=int, default=8, help="Requests in flight at once.")
+    parser.add_argument("--batch-size", type=int, default=0, help=f"Use batchWrite with up to {MAX_BATCH_SIZE} docs per request.")
+    parser.add_argument("--max-retries", type=int, default=5, help="Retries for 429/5xx and connection errors.")
+    parser.add_argument("--checkpoint", type=Path, default=CHECKPOINT_PATH, help="Where failed slugs are recorded.")
+    parser.add_argument("--resume", action="store_true", help="Only import slugs that failed in the last run.")
+    parser.add_argument("--sync", action="store_true", help="Only push new or changed documents (diff against --state).")
+    parser.add_argument("--state", type=Path, default=SYNC_STATE_PATH, help="Content hashes from the last successful sync.")
+    parser.add_argument("--delete-removed", action="store_true", help="With --sync, delete documents no longer in the catalog.")
+    metrics.add_arguments(parser)
+    return parser.parse_args(argv)
+
+
+def sync(
+    args: argparse.Namespace, documents: List[Tuple[str, dict]], client: FirestoreClient
+) -> Tuple[Dict[str, str], List[str]]:
+    """Diff-based push; updates the state file for every document that landed.
+
+    Returns the failures and the slugs that were written (unchanged ones are not).
+    """
+    state = load_sync_state(args.state)
+    plan = plan_sync(documents, state)
+    if args.resume:
+        plan.deleted = []  # a resumed run only sees the failed subset of the catalog
+    print(
+        f"Sync plan: {len(plan.creates)} new, {len(plan.updates)} changed, "
+        f"{plan.unchanged} unchanged, {len(plan.deleted)} removed from catalog."
     )
-    if result.returncode != 0:
-        raise RuntimeError(result.stderr.decode().strip())
-
-
-def main():
-    records = load_records()
-    for index, record in enumerate(records):
-        slug, payload = build_payload(record, index)
-        try:
-            import_record(slug, payload)
-            print(f"Imported {slug}")
-        except Exception as exc:  # noqa: BLE001
-            raise SystemExit(f"Import failed on {slug}: {exc}")
-    print(f"✅ Imported {len(records)} species documents.")
+    for slug in plan.deleted:
+        print(f"🗑️  {slug} is in Firestore state but no longer in the catalog")
+
+    failed = run_import(plan.writes, client, args.concurrency, args.batch_size, plan.masks) if plan.writes else {}
+    for slug, _ in plan.writes:
+        if slug not in failed:
+            state[slug] = plan.hashes[slug]
+
+    if args.delete_removed:
+        for slug in plan.deleted:
+            try:
+                client.delete_document(slug)
+                state.pop(slug, None)
+                print(f"Deleted {slug}")
+            except FirestoreError as exc:
+                failed[slug] = str(exc)
+
+    if plan.writes or (args.delete_removed and plan.deleted) or not args.state.exists():
+        save_sync_state(args.state, state)
+    return failed, [slug for slug, _ in plan.writes]
+
+
+def run(args: argparse.Namespace) -> None:
+    if not 0 <= args.batch_size <= MAX_BATCH_SIZE:
+        raise SystemExit(f"--batch-size must be between 0 and {MAX_BATCH_SIZE}")
+
+    records = load_records(args.aliens)
+    documents = latest_per_slug(build_document(record, index) for index, record in enumerate(records))
+    if args.resume:
+        pending = load_checkpoint(args.checkpoint)
+        if not pending:
+            raise SystemExit(f"No failed slugs recorded in {args.checkpoint}; nothing to resume.")
+        documents = [(slug, doc) for slug, doc in documents if slug in pending]
+
+    client = FirestoreClient(base_url=args.base_url, max_retries=args.max_retries)
+    start = time.perf_counter()
+    if args.sync:
+        failed, written = sync(args, documents, client)
+    else:
+        failed = run_import(documents, client, args.concurrency, args.batch_size)
+        written = [slug for slug, _ in documents]
+    elapsed = time.perf_counter() - start
+    save_checkpoint(args.checkpoint, failed)
+
+    imported = sum(1 for slug in written if slug not in failed)
+    print(f"{imported} documents in {elapsed:.2f}s over {client.requests} HTTP requests.")
+    if failed:
+        raise SystemExit(
+            f"{len(failed)} imports failed; slugs saved to {args.checkpoint}. Rerun with --resume to retry them."
+        )
+    print(f"✅ Imported {imported} species documents.")
+
+
+def main(argv: Optional[List[str]] = None):
+    args = parse_args(argv)
+    with metrics.session("import_species_firehose", args.metrics, args.profile):
+        run(args)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,259 @@
+"""Stage timers, counters and optional profiling shared by the Python data tools.
+
+Library functions are wrapped with :func:`timed` and bump :func:`count`;
+both record into the process-wide :data:`METRICS` and cost two
+``perf_counter`` calls when nobody reads them. A script's ``main`` opens a
+:func:`session`, which appends one JSON line per run to the metrics file
+(``--metrics``, default ``$PIPELINE_METRICS`` or ``.cache/metrics.jsonl``)
+and prints a one-line breakdown of where the time went. With ``--profile``
+the session also runs under cProfile and tracemalloc, saves the ``.prof``
+under ``profiles/`` next to the metrics file, and adds the top functions
+and allocation sites to the line. cProfile only sees the main thread;
+pool threads still show up in the stage timers.
+
+Stage times are inclusive (``build_payload`` contains ``build_document``)
+and summed across threads, so they can exceed the wall time.
+
+Process-pool workers record into their own copy: start the pool with
+``initializer=reset_worker``, return :meth:`Metrics.drain` alongside the
+worker's result and :meth:`Metrics.merge` it in the parent.
+
+Counters in use: ``records_parsed``, ``images_converted``, ``bytes_written``,
+``http_requests``, ``http_bytes``.
+
+Every data tool under ``scripts/`` (and ``Add_New_Aliens.py``) runs in a
+session. The exceptions are the ``bench_*`` scripts, which do their own
+timing and would otherwise time the timer. ``synthetic_data``, their
+fixture generator, is also left out, as is ``holocron_standin``, a local
+server that runs until interrupted.
+"""
+from __future__ import annotations
+
+import argparse
+import cProfile
+import functools
+import json
+import os
+import pstats
+import sys
+import threading
+import time
+import tracemalloc
+import uuid
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional, TypeVar
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+ROOT = Path(__file__).resolve().parent.parent
+DEFAULT_METRICS_PATH = ROOT / ".cache" / "metrics.jsonl"
+PROFILE_TOP = 15
+SUMMARY_STAGES = 5
+
+F = TypeVar("F", bound=Callable)
+
+
+@dataclass
+class StageStats:
+    calls: int = 0
+    seconds: float = 0.0
+    max_seconds: float = 0.0
+
+
+class Metrics:
+    """Thread-safe stage timings and counters for one process."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.stages: Dict[str, StageStats] = {}
+        self.counters: Dict[str, int] = {}
+
+    def record(self, name: str, seconds: float, calls: int = 1, max_seconds: Optional[float] = None) -> None:
+        with self._lock:
+            stats = self.stages.get(name)
+            if stats is None:
+                stats = self.stages[name] = StageStats()
+            stats.calls += calls
+            stats.seconds += seconds
+            stats.max_seconds = max(stats.max_seconds, seconds if max_seconds is None else max_seconds)
+
+    def count(self, name: str, amount: int = 1) -> None:
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - start)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            stages = {
+                name: {"calls": stats.calls, "seconds": round(stats.seconds, 6), "max_seconds": round(stats.max_seconds, 6)}
+                for name, stats in sorted(self.stages.items(), key=lambda item: item[1].seconds, reverse=True)
+            }
+            return {"stages": stages, "counters": dict(sorted(self.counters.items()))}
+
+    def drain(self) -> dict:
+        """Snapshot and reset; what a pool worker hands back to the parent."""
+        snapshot = self.snapshot()
+        self.reset()
+        return snapshot
+
+    def merge(self, snapshot: Optional[dict]) -> None:
+        if not snapshot:
+            return
+        for name, stats in snapshot["stages"].items():
+            self.record(name, stats["seconds"], stats["calls"], stats["max_seconds"])
+        for name, amount in snapshot["counters"].items():
+            self.count(name, amount)
+
+    def reset(self) -> None:
+        with self._lock:
+            self.stages.clear()
+            self.counters.clear()
+
+
+METRICS = Metrics()
+count = METRICS.count
+stage = METRICS.stage
+
+
+def reset_worker() -> None:
+    """Pool ``initializer``: forked workers start with a copy of the parent's numbers."""
+    METRICS.reset()
+
+
+def timed(name: Optional[str] = None) -> Callable[[F], F]:
+    """Record every call of the decorated function as a stage (default: its ``__name__``)."""
+    def decorate(fn: F) -> F:
+        label = name or fn.__name__
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                METRICS.record(label, time.perf_counter() - start)
+        return wrapper  # type: ignore[return-value]
+    return decorate
+
+
+def max_rss_kib() -> Optional[int]:
+    """This process's RSS high-water mark.
+
+    Linux keeps ``ru_maxrss`` across ``execve``, so a child would report the
+    parent's peak; ``VmHWM`` belongs to the new address space alone.
+    """
+    try:
+        for line in Path("/proc/self/status").read_text().splitlines():
+            if line.startswith("VmHWM:"):
+                return int(line.split()[1])
+    except OSError:
+        pass
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak // 1024 if sys.platform == "darwin" else peak
+
+
+def add_arguments(parser: argparse.ArgumentParser) -> None:
+    """Add ``--metrics``, ``--no-metrics`` and ``--profile`` to a script's parser."""
+    default = Path(os.environ["PIPELINE_METRICS"]) if os.environ.get("PIPELINE_METRICS") else DEFAULT_METRICS_PATH
+    group = parser.add_argument_group("metrics")
+    group.add_argument("--metrics", type=Path, default=default, help="JSON-lines file each run appends its timings and counters to.")
+    group.add_argument("--no-metrics", dest="metrics", action="store_const", const=None, help="Don't write a metrics line.")
+    group.add_argument("--profile", action="store_true", help="Also capture cProfile and tracemalloc top entries (slower).")
+
+
+def profile_top(profiler: cProfile.Profile) -> List[dict]:
+    stats = pstats.Stats(profiler)
+    rows = sorted(stats.stats.items(), key=lambda item: item[1][3], reverse=True)[:PROFILE_TOP]  # type: ignore[attr-defined]
+    top = []
+    for (filename, line, function), (_, calls, own, cumulative, _) in rows:
+        where = function if filename == "~" else f"{Path(filename).name}:{line}:{function}"
+        top.append({"function": where, "calls": calls, "own_seconds": round(own, 6), "cumulative_seconds": round(cumulative, 6)})
+    return top
+
+
+def allocation_top(snapshot: tracemalloc.Snapshot) -> List[dict]:
+    top = []
+    for statistic in snapshot.statistics("lineno")[:PROFILE_TOP]:
+        frame = statistic.traceback[0]
+        top.append({"site": f"{Path(frame.filename).name}:{frame.lineno}", "kib": round(statistic.size / 1024, 1), "blocks": statistic.count})
+    return top
+
+
+def format_bytes(size: float) -> str:
+    for unit in ("B", "KiB", "MiB"):
+        if size < 1024:
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} GiB"
+
+
+def summary(entry: dict) -> str:
+    stages = ", ".join(
+        f"{name} {stats['seconds']:.2f}s/{stats['calls']}" for name, stats in list(entry["stages"].items())[:SUMMARY_STAGES]
+    )
+    counters = ", ".join(
+        f"{name}={format_bytes(value) if 'bytes' in name else value}"
+        for name, value in entry["counters"].items()
+    )
+    return f"⏱️  {entry['script']} {entry['seconds']:.2f}s" + (f" | {stages}" if stages else "") + (f" | {counters}" if counters else "")
+
+
+@contextmanager
+def session(script: str, path: Optional[Path] = DEFAULT_METRICS_PATH, profile: bool = False) -> Iterator[Metrics]:
+    """Time one script run and append its metrics line to ``path`` (``None``: print only).
+
+    The line is written however the run ends; ``status`` is ``ok``,
+    ``exit <code>`` for ``SystemExit`` or the exception type.
+    """
+    METRICS.reset()
+    run_id = uuid.uuid4().hex[:12]
+    started = datetime.now(timezone.utc).isoformat(timespec="seconds")
+    profiler = cProfile.Profile() if profile else None
+    if profile:
+        tracemalloc.start()
+        profiler.enable()
+    status = "ok"
+    start = time.perf_counter()
+    try:
+        yield METRICS
+    except SystemExit as exc:
+        status = "ok" if exc.code in (None, 0) else f"exit {exc.code if isinstance(exc.code, int) else 1}"
+        raise
+    except BaseException as exc:
+        status = type(exc).__name__
+        raise
+    finally:
+        seconds = time.perf_counter() - start
+        entry = {"script": script, "run": run_id, "started": started, "seconds": round(seconds, 6), "status": status,
+                 "argv": sys.argv[1:], **METRICS.snapshot(), "peak_rss_kib": max_rss_kib()}
+        if profiler is not None:
+            profiler.disable()
+            snapshot = tracemalloc.take_snapshot()
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            entry["profile"] = {"top": profile_top(profiler), "alloc_peak_kib": round(peak / 1024), "allocations": allocation_top(snapshot)}
+            if path is not None:
+                prof_path = path.parent / "profiles" / f"{script}-{run_id}.prof"
+                prof_path.parent.mkdir(parents=True, exist_ok=True)
+                profiler.dump_stats(str(prof_path))
+                entry["profile"]["file"] = str(prof_path)
+        if path is not None:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with path.open("a", encoding="utf-8") as handle:
+                handle.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        print(summary(entry) + (f" → {path}" if path is not None else ""), file=sys.stderr)
@@ -0,0 +1,260 @@
+#!/usr/bin/env python3
+"""Resolve species names from section headers, image filenames and holocron titles to catalog records."""
+from __future__ import annotations
+
+import argparse
+import json
+import re
+import unicodedata
+from dataclasses import dataclass
+from typing import Dict, Generic, Iterable, List, Optional, Tuple, TypeVar
+
+import metrics
+from species_store import ROOT, SpeciesStore
+
+T = TypeVar("T")
+
+NON_ALNUM_RE = re.compile(r"[^a-z0-9]+")
+# Headers such as "GEONOSIAN WORKER" fall back to their first word.
+HEAD_WORD_CONFIDENCE = 0.8
+SINGULAR_CONFIDENCE = 0.95
+MIN_FUZZY_LENGTH = 5
+
+C4_SOURCE_PATH = ROOT / "Source Data" / "C4_Universe_Section.txt"
+IMAGE_DIR = ROOT / "Source Data" / "Aliens"
+RACES_INDEX_PATH = ROOT / "Source Data" / "d6holocron" / "races-index.json"
+
+
+def fold(value: str) -> str:
+    """Casefold and strip accents, curly quotes and dashes: "Twi’Lek" -> "twi'lek"."""
+    decomposed = unicodedata.normalize("NFKD", value)
+    return "".join(ch for ch in decomposed if not unicodedata.combining(ch)).casefold()
+
+
+def words(value: str) -> List[str]:
+    return [word for word in NON_ALNUM_RE.split(fold(value)) if word]
+
+
+def singular(word: str) -> str:
+    if len(word) > 4 and word.endswith("ies"):
+        return word[:-3] + "y"
+    if len(word) > 4 and word.endswith(("ses", "xes", "zes", "ches", "shes")):
+        return word[:-2]
+    if len(word) > 3 and word.endswith("s") and not word.endswith(("ss", "us", "is")):
+        return word[:-1]
+    return word
+
+
+def normalize_key(value: str) -> str:
+    """Compact key with the last word singularised: "Wookiees" and "wookiee.jpg" both give "wookiee"."""
+    parts = words(value)
+    if parts:
+        parts[-1] = singular(parts[-1])
+    return "".join(parts)
+
+
+def levenshtein(a: str, b: str, limit: int) -> int:
+    """Edit distance, giving up (returning ``limit + 1``) once it must exceed ``limit``."""
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, 1):
+        current = [i]
+        best = i
+        for j, char_b in enumerate(b, 1):
+            cost = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (char_a != char_b))
+            current.append(cost)
+            best = min(best, cost)
+        if best > limit:
+            return limit + 1
+        previous = current
+    return previous[-1]
+
+
+def max_distance(key: str) -> int:
+    return 0 if len(key) < MIN_FUZZY_LENGTH else max(1, len(key) // 6)
+
+
+class BKTree:
+    """Burkhard-Keller tree over keys; radius searches only visit children whose edge can qualify."""
+
+    def __init__(self) -> None:
+        self.root: Optional[Tuple[str, Dict[int, tuple]]] = None
+
+    def add(self, key: str) -> None:
+        if self.root is None:
+            self.root = (key, {})
+            return
+        node = self.root
+        while True:
+            distance = levenshtein(key, node[0], len(key) + len(node[0]))
+            if distance == 0:
+                return
+            child = node[1].get(distance)
+            if child is None:
+                node[1][distance] = (key, {})
+                return
+            node = child
+
+    def search(self, key: str, radius: int) -> List[Tuple[int, str]]:
+        """``(distance, key)`` pairs within ``radius``, closest first."""
+        if self.root is None:
+            return []
+        found: List[Tuple[int, str]] = []
+        stack = [self.root]
+        while stack:
+            node_key, children = stack.pop()
+            distance = levenshtein(key, node_key, len(key) + len(node_key))
+            if distance <= radius:
+                found.append((distance, node_key))
+            for edge, child in children.items():
+                if distance - radius <= edge <= distance + radius:
+                    stack.append(child)
+        return sorted(found)
+
+
+@dataclass
+class Match(Generic[T]):
+    query: str
+    value: T
+    key: str
+    confidence: float
+    method: str  # exact | singular | head | fuzzy
+
+
+class NameResolver(Generic[T]):
+    """Map free-form names onto a fixed set of targets.
+
+    Lookups go exact key, then singular/plural-insensitive key, then the
+    first word of a multi-word name, then an edit-distance search in a
+    BK-tree. Each method has a lower confidence than the one before it.
+    Explicit :meth:`add_alias` entries count as exact.
+    """
+
+    def __init__(self, entries: Iterable[Tuple[str, T]] = (), min_confidence: float = 0.85) -> None:
+        self.min_confidence = min_confidence
+        self.exact: Dict[str, T] = {}
+        self.by_key: Dict[str, T] = {}
+        self.tree = BKTree()
+        for name, value in entries:
+            self.add(name, value)
+
+    def add(self, name: str, value: T) -> None:
+        self.exact.setdefault("".join(words(name)), value)
+        key = normalize_key(name)
+        if key and key not in self.by_key:
+            self.by_key[key] = value
+            self.tree.add(key)
+
+    def add_alias(self, alias: str, value: T) -> None:
+        self.exact["".join(words(alias))] = value
+
+    def resolve(self, query: str) -> Optional[Match[T]]:
+        compact = "".join(words(query))
+        if not compact:
+            return None
+        if compact in self.exact:
+            return Match(query, self.exact[compact], compact, 1.0, "exact")
+        key = normalize_key(query)
+        if key in self.by_key:
+            return Match(query, self.by_key[key], key, SINGULAR_CONFIDENCE, "singular")
+        parts = words(query)
+        if len(parts) > 1:
+            head = singular(parts[0])
+            if head in self.by_key:
+                return Match(query, self.by_key[head], head, HEAD_WORD_CONFIDENCE, "head")
+        radius = max_distance(key)
+        if radius:
+            hits = self.tree.search(key, radius)
+            if hits:
+                distance, found = hits[0]
+                confidence = round(1 - distance / max(len(key), len(found)), 3)
+                if confidence >= self.min_confidence:
+                    return Match(query, self.by_key[found], found, confidence, "fuzzy")
+        return None
+
+    def resolve_all(self, queries: Iterable[str]) -> Tuple[List[Match[T]], List[str]]:
+        matches: List[Match[T]] = []
+        unmatched: List[str] = []
+        for query in queries:
+            match = self.resolve(query)
+            if match is None:
+                unmatched.append(query)
+            else:
+                matches.append(match)
+        return matches, unmatched
+
+
+def catalog_resolver(store: SpeciesStore, min_confidence: float = 0.85) -> NameResolver[dict]:
+    """Resolver over catalog records by name and plural."""
+    resolver: NameResolver[dict] = NameResolver(min_confidence=min_confidence)
+    for record in store:
+        if record.get("name"):
+            resolver.add(record["name"], record)
+    for record in store:
+        if record.get("plural"):
+            resolver.add(record["plural"], record)
+    return resolver
+
+
+def print_report(label: str, matches: List[Match[dict]], unmatched: List[str], limit: int) -> None:
+    approximate = [match for match in matches if match.method != "exact"]
+    print(f"\n{label}: {len(matches)} matched ({len(approximate)} approximate), {len(unmatched)} unmatched")
+    for match in sorted(approximate, key=lambda m: m.confidence):
+        print(f"  ~ {match.query!r} → {match.value.get('name')} ({match.method}, {match.confidence:.2f})")
+    for query in unmatched[:limit]:
+        print(f"  ✗ {query!r}")
+    if len(unmatched) > limit:
+        print(f"  … {len(unmatched) - limit} more")
+
+
+def report_unresolved(args: argparse.Namespace) -> None:
+    from enrich_species_from_source import load_sections
+
+    store = SpeciesStore.load()
+    resolver = catalog_resolver(store, args.min_confidence)
+    sources = {
+        "C4 section headers": list(load_sections()) if C4_SOURCE_PATH.exists() else [],
+        "Source Data/Aliens images": sorted(path.stem for path in IMAGE_DIR.glob("*.*")),
+        "holocron titles": (
+            json.loads(RACES_INDEX_PATH.read_text(encoding="utf-8")).get("titles", []) if RACES_INDEX_PATH.exists() else []
+        ),
+    }
+    report = {}
+    for label, names in sources.items():
+        matches, unmatched = resolver.resolve_all(names)
+        report[label] = {
+            "matched": len(matches),
+            "approximate": [
+                {"query": m.query, "name": m.value.get("name"), "method": m.method, "confidence": m.confidence}
+                for m in matches if m.method != "exact"
+            ],
+            "unmatched": unmatched,
+        }
+        if not args.json:
+            print_report(label, matches, unmatched, args.limit)
+
+    images: NameResolver[str] = NameResolver(((stem, stem) for stem in sources["Source Data/Aliens images"]), args.min_confidence)
+    missing = [record.get("name", "") for record in store if images.resolve(record.get("name", "")) is None]
+    report["catalog records without an image"] = missing
+    if args.json:
+        print(json.dumps(report, ensure_ascii=False, indent=2))
+    else:
+        print(f"\nCatalog records without an image: {len(missing)}")
+        for name in missing[:args.limit]:
+            print(f"  ✗ {name}")
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--min-confidence", type=float, default=0.85, help="Reject fuzzy matches below this score.")
+    parser.add_argument("--limit", type=int, default=25, help="Unmatched names to list per source.")
+    parser.add_argument("--json", action="store_true", help="Print the unmatched report as JSON.")
+    metrics.add_arguments(parser)
+    args = parser.parse_args(argv)
+    with metrics.session("name_resolver", args.metrics, args.profile):
+        report_unresolved(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,18 +1,19 @@
-import json
-from pathlib import Path
+import argparse
 
-ALIENS = Path(r"c:\\Users\\skunian\\OneDrive\\MyCode\\Star Wars Races\\ALIENS.json")
-REPORT = Path(r"c:\\Users\\skunian\\OneDrive\\MyCode\\Star Wars Races\\ALIENS_missing_fields.md")
+import metrics
+from species_store import ALIENS_PATH as ALIENS, ROOT, SpeciesStore
+
+REPORT = ROOT / "ALIENS_missing_fields.md"
 
 FIELDS = ["description","personality","physicalDescription","homeworld"]
 LANG_FIELDS = ["native","description"]
 
 
-def main():
-    data = json.loads(ALIENS.read_text(encoding="utf-8"))
+def report():
+    store = SpeciesStore.load(ALIENS)
     lines = ["# Missing fields in ALIENS.json\n"]
     total_missing = 0
-    for r in data.get("races", []):
+    for r in store:
         missing = []
         for f in FIELDS:
             if not r.get(f):
@@ -28,5 +29,13 @@ def main():
     REPORT.write_text("\n".join(lines), encoding="utf-8")
     print(f"Wrote report to {REPORT}")
 
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="List empty species fields in ALIENS_missing_fields.md.")
+    metrics.add_arguments(parser)
+    args = parser.parse_args(argv)
+    with metrics.session("report_missing_fields", args.metrics, args.profile):
+        report()
+
 if __name__ == "__main__":
     main()
@@ -0,0 +1,285 @@
+#!/usr/bin/env python3
+"""Compile ALIENS.json and the starship import-ready files into a versioned search index."""
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import re
+import time
+from bisect import bisect_left
+from itertools import islice
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import metrics
+from metrics import timed
+from species_store import ALIENS_PATH, ROOT, SpeciesStore, slugify, write_atomic
+
+INDEX_VERSION = 1
+INDEX_PATH = ROOT / "web" / "public" / "data" / "search-index.json"
+STARSHIP_DATA_DIR = ROOT / "Source Data" / "d6holocron" / "starships"
+STARSHIP_FILES = (
+    "starfighters-import-ready.json",
+    "starfighters-variants-import-ready.json",
+    "transports-import-ready.json",
+    "transports-variants-import-ready.json",
+    "capital-import-ready.json",
+)
+
+SORT_KEYS = ("name", "homeworld", "attributeDice")
+TYPEAHEAD_LIMIT = 10
+TOKEN_RE = re.compile(r"[a-z0-9]+")
+DICE_RE = re.compile(r"(\d+)\s*D(?:\s*([+-])\s*(\d+))?", re.I)
+
+
+def tokens(text: str) -> List[str]:
+    return TOKEN_RE.findall(text.casefold())
+
+
+def dice_pips(code: str) -> Optional[int]:
+    """``"2D+2"`` -> 8 pips, so dice codes sort numerically."""
+    match = DICE_RE.search(code or "")
+    if not match:
+        return None
+    pips = int(match.group(1)) * 3
+    if match.group(3):
+        pips += int(match.group(3)) * (1 if match.group(2) == "+" else -1)
+    return pips
+
+
+def species_entries(store: SpeciesStore) -> Iterable[Tuple[dict, List[str]]]:
+    for record in store:
+        name = record.get("name") or ""
+        entry = {
+            "type": "species",
+            "slug": slugify(name),
+            "name": name,
+            "homeworld": record.get("homeworld") or "",
+            "attributeDice": (record.get("stats") or {}).get("attributeDice") or "",
+        }
+        text = [name, record.get("plural") or "", entry["homeworld"], *(record.get("sources") or [])]
+        yield entry, text
+
+
+def starship_entries(paths: Iterable[Path]) -> Iterable[Tuple[dict, List[str]]]:
+    for path in paths:
+        if not path.exists():
+            continue
+        payload = json.loads(path.read_text(encoding="utf-8"))
+        for ship in payload.get("starships", []) if isinstance(payload, dict) else payload:
+            name = ship.get("name") or ship.get("craft") or ""
+            entry = {
+                "type": "starship",
+                "slug": slugify(name),
+                "name": name,
+                "category": ship.get("category") or "",
+            }
+            text = [name, ship.get("craft") or "", ship.get("category") or "", ship.get("affiliation") or "", ship.get("type") or ""]
+            yield entry, text
+
+
+def source_digest(paths: Sequence[Path]) -> str:
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(str(INDEX_VERSION).encode())
+    for path in paths:
+        if path.exists():
+            digest.update(path.name.encode())
+            digest.update(path.read_bytes())
+    return digest.hexdigest()
+
+
+def delta_encode(ids: List[int]) -> List[int]:
+    return [ids[0], *(b - a for a, b in zip(ids, ids[1:]))] if ids else []
+
+
+def delta_decode(deltas: List[int]) -> List[int]:
+    ids, total = [], 0
+    for delta in deltas:
+        total += delta
+        ids.append(total)
+    return ids
+
+
+def sort_text(value: str) -> str:
+    """Collation key that ignores case, punctuation and stray wiki bold markup."""
+    return " ".join(tokens(value))
+
+
+def sort_order(docs: List[dict], key: str) -> List[int]:
+    """Doc ids ordered by ``key``; records without the field go last."""
+    names = [sort_text(doc["name"]) for doc in docs]
+    if key == "attributeDice":
+        def sort_key(doc_id: int):
+            pips = dice_pips(docs[doc_id].get(key, ""))
+            return (pips is None, pips or 0, names[doc_id])
+    else:
+        def sort_key(doc_id: int):
+            value = sort_text(docs[doc_id].get(key) or "")
+            return (not value, value, names[doc_id])
+    return sorted(range(len(docs)), key=sort_key)
+
+
+def build_trie(docs: List[dict], name_rank: List[int], limit: int = TYPEAHEAD_LIMIT) -> List[list]:
+    """Flattened prefix trie: ``[[{char: child}, [top doc ids by name]], ...]`` rooted at node 0.
+
+    Every node stores its best ``limit`` completions, so typeahead is a walk
+    down the prefix with no subtree scan. Both the full name and each word
+    in it are inserted, so "wing" finds "X-wing".
+    """
+    nodes: List[list] = [[{}, []]]
+    for doc_id in sorted(range(len(docs)), key=name_rank.__getitem__):
+        keys = {sort_text(docs[doc_id]["name"])}
+        keys.update(tokens(docs[doc_id]["name"]))
+        for key in keys:
+            node = nodes[0]
+            for char in key:
+                child = node[0].get(char)
+                if child is None:
+                    child = node[0][char] = len(nodes)
+                    nodes.append([{}, []])
+                node = nodes[child]
+                if len(node[1]) < limit and doc_id not in node[1]:
+                    node[1].append(doc_id)
+    return nodes
+
+
+@timed()
+def build_index(records: Iterable[Tuple[dict, List[str]]], digest: str = "") -> dict:
+    docs: List[dict] = []
+    postings: Dict[str, List[int]] = {}
+    for doc_id, (entry, text) in enumerate(records):
+        docs.append(entry)
+        for token in {token for part in text if part for token in tokens(part)}:
+            postings.setdefault(token, []).append(doc_id)
+
+    vocabulary = sorted(postings)
+    sorts = {key: sort_order(docs, key) for key in SORT_KEYS}
+    name_rank = [0] * len(docs)
+    for rank, doc_id in enumerate(sorts["name"]):
+        name_rank[doc_id] = rank
+    return {
+        "version": INDEX_VERSION,
+        "sourceHash": digest,
+        "docs": docs,
+        "tokens": vocabulary,
+        "postings": [delta_encode(postings[token]) for token in vocabulary],
+        "trie": build_trie(docs, name_rank),
+        "sorts": sorts,
+    }
+
+
+class SearchIndex:
+    """Query API over a compiled index (the same structure the web layer loads)."""
+
+    def __init__(self, data: dict) -> None:
+        if data.get("version") != INDEX_VERSION:
+            raise RuntimeError(f"Search index version {data.get('version')} is not supported (expected {INDEX_VERSION})")
+        self.docs: List[dict] = data["docs"]
+        self.tokens: List[str] = data["tokens"]
+        self.postings: List[List[int]] = [delta_decode(deltas) for deltas in data["postings"]]
+        self.trie: List[list] = data["trie"]
+        self.sorts: Dict[str, List[int]] = data["sorts"]
+        self.ranks: Dict[str, List[int]] = {}
+        for key, order in self.sorts.items():
+            rank = [0] * len(order)
+            for position, doc_id in enumerate(order):
+                rank[doc_id] = position
+            self.ranks[key] = rank
+
+    @classmethod
+    def load(cls, path: Path = INDEX_PATH) -> "SearchIndex":
+        return cls(json.loads(path.read_text(encoding="utf-8")))
+
+    def _prefix_ids(self, prefix: str) -> set:
+        ids: set = set()
+        start = bisect_left(self.tokens, prefix)
+        for position in range(start, len(self.tokens)):
+            if not self.tokens[position].startswith(prefix):
+                break
+            ids.update(self.postings[position])
+        return ids
+
+    def search(self, query: str, doc_type: Optional[str] = None, sort: str = "name", limit: Optional[int] = 20) -> List[dict]:
+        """AND-match every query token; the last one is a prefix (search-as-you-type)."""
+        terms = tokens(query)
+        if not terms:
+            matches = list(self.sorts[sort])
+        else:
+            candidate: Optional[set] = None
+            for position, term in enumerate(terms):
+                if position == len(terms) - 1:
+                    ids = self._prefix_ids(term)
+                else:
+                    index = bisect_left(self.tokens, term)
+                    found = index < len(self.tokens) and self.tokens[index] == term
+                    ids = set(self.postings[index]) if found else set()
+                candidate = ids if candidate is None else candidate & ids
+                if not candidate:
+                    return []
+            matches = sorted(candidate, key=self.ranks[sort].__getitem__)
+        if doc_type:
+            matches = [doc_id for doc_id in matches if self.docs[doc_id]["type"] == doc_type]
+        return [self.docs[doc_id] for doc_id in matches[:limit]]
+
+    def complete(self, prefix: str, limit: int = TYPEAHEAD_LIMIT) -> List[dict]:
+        """Typeahead: walk the trie and return its precomputed completions."""
+        node = self.trie[0]
+        for char in " ".join(tokens(prefix)):
+            child = node[0].get(char)
+            if child is None:
+                return []
+            node = self.trie[child]
+        return [self.docs[doc_id] for doc_id in node[1][:limit]]
+
+    def ordered(self, by: str, doc_type: Optional[str] = None, offset: int = 0, limit: Optional[int] = None) -> List[dict]:
+        """One page of the precomputed ``name``/``homeworld``/``attributeDice`` order."""
+        docs = (self.docs[doc_id] for doc_id in self.sorts[by])
+        matching = (doc for doc in docs if doc_type is None or doc["type"] == doc_type)
+        stop = None if limit is None else offset + limit
+        return list(islice(matching, offset, stop))
+
+
+def refresh(args: argparse.Namespace) -> None:
+    sources = [args.aliens, *(STARSHIP_DATA_DIR / name for name in STARSHIP_FILES)]
+    digest = source_digest(sources)
+    existing = None
+    if args.out.exists():
+        try:
+            existing = json.loads(args.out.read_text(encoding="utf-8"))
+        except json.JSONDecodeError:
+            existing = None
+
+    if not args.force and existing and existing.get("version") == INDEX_VERSION and existing.get("sourceHash") == digest:
+        print(f"⏭️  {args.out.relative_to(ROOT) if args.out.is_relative_to(ROOT) else args.out} is up to date.")
+        index = existing
+    else:
+        start = time.perf_counter()
+        records = [*species_entries(SpeciesStore.load(args.aliens)), *starship_entries(sources[1:])]
+        index = build_index(records, digest)
+        write_atomic(args.out, [json.dumps(index, ensure_ascii=False, separators=(",", ":")), "\n"])
+        print(
+            f"✅ Indexed {len(index['docs'])} records, {len(index['tokens'])} tokens, "
+            f"{len(index['trie'])} trie nodes in {time.perf_counter() - start:.2f}s → {args.out} "
+            f"({args.out.stat().st_size / 1024:.0f} KiB)"
+        )
+
+    if args.query is not None:
+        for doc in SearchIndex(index).search(args.query):
+            print(f"  {doc['type']:<8} {doc['name']}")
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--aliens", type=Path, default=ALIENS_PATH, help="Species catalog to index.")
+    parser.add_argument("--out", type=Path, default=INDEX_PATH, help="Where to write the index.")
+    parser.add_argument("--force", action="store_true", help="Rebuild even if the sources are unchanged.")
+    parser.add_argument("--query", help="Search the built index and print matching names.")
+    metrics.add_arguments(parser)
+    args = parser.parse_args(argv)
+    with metrics.session("search_index", args.metrics, args.profile):
+        refresh(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,338 @@
+#!/usr/bin/env python3
+"""Indexed, memory-mapped access to large source dumps (C4 text, rulebook PDFs).
+
+The first read of a text dump scans it once for section headers and stores
+``header -> [start, end]`` byte offsets under ``.cache/source-index``. Later
+runs map the file and decode only the sections they ask for. PDFs are
+extracted by page range across a process pool, and each page's text is cached
+under ``.cache/pdf-pages`` keyed by the PDF's content hash.
+
+Cache entries are valid while the file's size and mtime are unchanged; if
+only the mtime moved (a checkout, a copy) the content hash decides.
+"""
+from __future__ import annotations
+
+import argparse
+import hashlib
+import io
+import json
+import mmap
+import re
+import time
+from collections.abc import Mapping
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+import metrics
+from species_store import ROOT, write_atomic
+
+CACHE_VERSION = 1
+CACHE_DIR = ROOT / ".cache" / "source-index"
+PAGE_CACHE_DIR = ROOT / ".cache" / "pdf-pages"
+# Consecutive pages per pool task: enough to amortise reparsing the page tree.
+PAGES_PER_TASK = 16
+C4_SOURCE_PATH = ROOT / "Source Data" / "C4_Universe_Section.txt"
+
+# An all-caps line between blank lines, e.g. "\nWOOKIEE\n\n". Matched on raw
+# bytes, so CRLF and LF dumps index the same way.
+SECTION_HEADER = re.compile(rb"\r?\n([A-Z][A-Z\s\-']+)\r?\n\r?\n")
+HASH_CHUNK = 1 << 20
+
+
+def file_digest(path: Path) -> str:
+    digest = hashlib.blake2b(digest_size=16)
+    with path.open("rb") as handle:
+        for chunk in iter(lambda: handle.read(HASH_CHUNK), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def cache_path(source: Path, kind: str, cache_dir: Path = CACHE_DIR) -> Path:
+    # Same file name in different directories must not share an entry.
+    location = hashlib.blake2b(str(source.resolve()).encode("utf-8"), digest_size=4).hexdigest()
+    return cache_dir / f"{source.name}.{location}.{kind}.json"
+
+
+def load_entry(path: Path, source: Path, **key) -> Tuple[Optional[dict], bool]:
+    """Return ``(entry, stale_stamp)`` for a cache file that still describes ``source``.
+
+    ``stale_stamp`` is true when the entry was accepted on its content hash
+    after the size/mtime check failed, so the caller should rewrite it.
+    """
+    try:
+        entry = json.loads(path.read_text(encoding="utf-8"))
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None, False
+    if entry.get("version") != CACHE_VERSION or any(entry.get(name) != value for name, value in key.items()):
+        return None, False
+    stat = source.stat()
+    if entry.get("size") == stat.st_size and entry.get("mtimeNs") == stat.st_mtime_ns:
+        return entry, False
+    if entry.get("hash") != file_digest(source):
+        return None, False
+    entry.update(size=stat.st_size, mtimeNs=stat.st_mtime_ns)
+    return entry, True
+
+
+def new_entry(source: Path, **fields) -> dict:
+    stat = source.stat()
+    return {
+        "version": CACHE_VERSION,
+        "source": source.name,
+        "size": stat.st_size,
+        "mtimeNs": stat.st_mtime_ns,
+        "hash": file_digest(source),
+        **fields,
+    }
+
+
+def save_entry(path: Path, entry: dict) -> None:
+    write_atomic(path, [json.dumps(entry, ensure_ascii=False, separators=(",", ":")), "\n"])
+
+
+def scan_sections(data: bytes, pattern: re.Pattern = SECTION_HEADER) -> Dict[str, List[int]]:
+    """``{header: [start, end]}`` byte ranges for the body following each header.
+
+    A repeated header keeps its last occurrence, as a dict built in file
+    order would.
+    """
+    matches = list(pattern.finditer(data))
+    sections: Dict[str, List[int]] = {}
+    for index, match in enumerate(matches):
+        header = match.group(1).decode("utf-8").replace("\r\n", "\n").strip()
+        end = matches[index + 1].start() if index + 1 < len(matches) else len(data)
+        sections[header] = [match.end(), end]
+    return sections
+
+
+class SourceText(Mapping):
+    """Read-only ``{header: section text}`` view of a text dump.
+
+    Sections are decoded (with CRLF normalised and whitespace stripped) on
+    access, straight from a memory map of the file.
+    """
+
+    def __init__(self, path: Path = C4_SOURCE_PATH, pattern: re.Pattern = SECTION_HEADER, cache_dir: Path = CACHE_DIR) -> None:
+        self.path = path
+        self._handle = path.open("rb")
+        size = path.stat().st_size
+        self._data = mmap.mmap(self._handle.fileno(), 0, access=mmap.ACCESS_READ) if size else b""
+
+        index_path = cache_path(path, "sections", cache_dir)
+        entry, stale = load_entry(index_path, path, pattern=pattern.pattern.decode("ascii"))
+        self.rebuilt = entry is None
+        if entry is None:
+            entry = new_entry(path, pattern=pattern.pattern.decode("ascii"), sections=scan_sections(self._data, pattern))
+        if self.rebuilt or stale:
+            save_entry(index_path, entry)
+        self.digest: str = entry["hash"]
+        self.offsets: Dict[str, List[int]] = entry["sections"]
+
+    def __getitem__(self, header: str) -> str:
+        start, end = self.offsets[header]
+        return self._data[start:end].decode("utf-8").replace("\r\n", "\n").strip()
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.offsets)
+
+    def __len__(self) -> int:
+        return len(self.offsets)
+
+    def __contains__(self, header: object) -> bool:
+        return header in self.offsets
+
+    def close(self) -> None:
+        if isinstance(self._data, mmap.mmap):
+            self._data.close()
+        self._handle.close()
+
+    def __enter__(self) -> "SourceText":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def require_pdfminer():
+    try:
+        from pdfminer.converter import TextConverter
+        from pdfminer.layout import LAParams
+        from pdfminer.pdfinterp import PDFPageInterpreter, PDFResourceManager
+        from pdfminer.pdfpage import PDFPage
+    except ImportError as exc:  # pragma: no cover
+        raise SystemExit(
+            "pdfminer.six is required. Install with `python3 -m pip install pdfminer.six` and rerun."
+        ) from exc
+    return TextConverter, LAParams, PDFPageInterpreter, PDFResourceManager, PDFPage
+
+
+def count_pages(path: Path) -> int:
+    PDFPage = require_pdfminer()[-1]
+    with path.open("rb") as handle:
+        return sum(1 for _ in PDFPage.get_pages(handle))
+
+
+def extract_page_texts(path: Path, wanted: Iterable[int]) -> Dict[int, str]:
+    """Run pdfminer once over ``path`` and return ``{page number: text}`` for ``wanted``.
+
+    Each text ends in the form feed pdfminer writes after a page, so joining
+    the pages reproduces ``pdfminer.high_level.extract_text``.
+    """
+    TextConverter, LAParams, PDFPageInterpreter, PDFResourceManager, PDFPage = require_pdfminer()
+    wanted_set = set(wanted)
+    last = max(wanted_set, default=-1)
+    texts: Dict[int, str] = {}
+    output = io.StringIO()
+    manager = PDFResourceManager()
+    device = TextConverter(manager, output, laparams=LAParams())
+    try:
+        interpreter = PDFPageInterpreter(manager, device)
+        with path.open("rb") as handle:
+            for number, page in enumerate(PDFPage.get_pages(handle)):
+                if number > last:
+                    break
+                if number not in wanted_set:
+                    continue
+                interpreter.process_page(page)
+                texts[number] = output.getvalue()
+                output.seek(0)
+                output.truncate()
+    finally:
+        device.close()
+    return texts
+
+
+def extract_range(path: Path, numbers: List[int], page_dir: Path) -> Dict[int, str]:
+    """Process-pool task: extract ``numbers`` and write each page to the cache as it is known."""
+    texts = extract_page_texts(path, numbers)
+    for number, text in texts.items():
+        write_atomic(page_dir / page_name(number), [text])
+    return texts
+
+
+def page_name(number: int) -> str:
+    return f"{number:05d}.txt"
+
+
+def page_ranges(numbers: List[int], size: int) -> List[List[int]]:
+    """Split sorted page numbers into runs of at most ``size`` consecutive pages."""
+    ranges: List[List[int]] = []
+    for number in numbers:
+        if ranges and len(ranges[-1]) < size and ranges[-1][-1] == number - 1:
+            ranges[-1].append(number)
+        else:
+            ranges.append([number])
+    return ranges
+
+
+class SourcePdf:
+    """Per-page text of a PDF, extracted in parallel and cached by content hash.
+
+    Pages live in ``.cache/pdf-pages/<hash>/NNNNN.txt``, one file each, so an
+    interrupted run keeps what it finished and a later run extracts only the
+    pages still missing.
+    """
+
+    def __init__(self, path: Path, cache_dir: Path = CACHE_DIR, page_root: Path = PAGE_CACHE_DIR) -> None:
+        self.path = path
+        self.cache_file = cache_path(path, "pdf", cache_dir)
+        entry, stale = load_entry(self.cache_file, path)
+        self.entry = entry or new_entry(path, pageCount=None)
+        if entry is None or stale:
+            save_entry(self.cache_file, self.entry)
+        self.page_dir = page_root / self.entry["hash"]
+
+    @property
+    def page_count(self) -> int:
+        if self.entry["pageCount"] is None:
+            self.entry["pageCount"] = count_pages(self.path)
+            save_entry(self.cache_file, self.entry)
+        return self.entry["pageCount"]
+
+    def cached(self, number: int) -> Optional[str]:
+        try:
+            return (self.page_dir / page_name(number)).read_bytes().decode("utf-8")
+        except FileNotFoundError:
+            return None
+
+    def iter_pages(
+        self,
+        numbers: Optional[Iterable[int]] = None,
+        workers: Optional[int] = None,
+        pages_per_task: int = PAGES_PER_TASK,
+    ) -> Iterator[Tuple[int, str]]:
+        """Yield ``(page number, text)`` in page order, zero-based.
+
+        Cached pages come straight from disk; missing ones are split into
+        runs of ``pages_per_task`` and extracted across a process pool.
+        Pages are yielded as soon as the run containing them finishes.
+        """
+        numbers = sorted(set(range(self.page_count) if numbers is None else numbers))
+        texts = {number: self.cached(number) for number in numbers}
+        missing = [number for number, text in texts.items() if text is None]
+        if not missing:
+            for number in numbers:
+                yield number, texts[number]
+            return
+
+        self.page_dir.mkdir(parents=True, exist_ok=True)
+        ranges = page_ranges(missing, pages_per_task)
+        if len(ranges) == 1 or workers == 1:
+            pending = {number: index for index, run in enumerate(ranges) for number in run}
+            done: Dict[int, str] = {}
+            for number in numbers:
+                if texts[number] is None:
+                    if number not in done:
+                        done.update(extract_range(self.path, ranges[pending[number]], self.page_dir))
+                    texts[number] = done.pop(number)
+                yield number, texts[number]
+            return
+
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(extract_range, self.path, run, self.page_dir) for run in ranges]
+            owner = {number: future for future, run in zip(futures, ranges) for number in run}
+            for number in numbers:
+                text = texts[number]
+                if text is None:
+                    text = owner.pop(number).result()[number]
+                yield number, text
+
+    def pages(self, numbers: Optional[Iterable[int]] = None, workers: Optional[int] = None) -> List[str]:
+        return [text for _, text in self.iter_pages(numbers, workers)]
+
+    def text(self, workers: Optional[int] = None) -> str:
+        return "".join(self.pages(workers=workers))
+
+
+def index_sources(args: argparse.Namespace) -> None:
+    for path in args.paths:
+        if not path.exists():
+            raise SystemExit(f"Missing source file: {path}")
+        start = time.perf_counter()
+        if path.suffix.lower() == ".pdf":
+            pages = SourcePdf(path).pages(workers=args.workers)
+            print(f"✅ {path.name}: {len(pages)} pages cached in {time.perf_counter() - start:.2f}s")
+            continue
+        with SourceText(path) as document:
+            action = "indexed" if document.rebuilt else "loaded index for"
+            print(f"✅ {path.name}: {action} {len(document)} sections in {(time.perf_counter() - start) * 1000:.1f} ms")
+            if args.section is not None:
+                if args.section not in document:
+                    raise SystemExit(f"No section {args.section!r} in {path.name}")
+                print(document[args.section])
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("paths", nargs="*", type=Path, default=[C4_SOURCE_PATH], help="Text dumps or PDFs to index.")
+    parser.add_argument("--section", help="Print one section (text dumps) by header.")
+    parser.add_argument("--workers", type=int, help="Processes for PDF extraction (default: CPU count).")
+    metrics.add_arguments(parser)
+    args = parser.parse_args(argv)
+    with metrics.session("source_documents", args.metrics, args.profile):
+        index_sources(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""Single-pass splitter for species source text into labeled sections."""
+from __future__ import annotations
+
+import re
+from bisect import bisect_left
+from functools import lru_cache
+from typing import Dict, Iterable, Iterator, List, Tuple
+
+# Labels recognised in C4 text and holocron wikitext, in canonical spelling.
+SECTION_LABELS: Tuple[str, ...] = (
+    "Personality",
+    "Physical Description",
+    "Home Planet",
+    "Homeworld",
+    "Languages",
+    "Example Names",
+    "Adventurers",
+    "Attribute Dice",
+    "Special Abilities",
+    "Story Factors",
+    "Move",
+    "Size",
+)
+
+# Labels that terminate the preceding section when they start a line.
+SECTION_FOLLOWERS: Tuple[str, ...] = (
+    "Personality",
+    "Physical Description",
+    "Homeworld",
+    "Languages",
+    "Example Names",
+    "Adventurers",
+    "Attribute Dice",
+    "Special Abilities",
+    "Story Factors",
+    "Move",
+    "Size",
+)
+
+
+@lru_cache(maxsize=None)
+def compile_labels(labels: Tuple[str, ...]) -> Tuple[Dict[str, str], Tuple[int, ...]]:
+    """Return ``({lowercased label: label}, label lengths longest-first)`` for colon probing."""
+    keys = {label.lower(): label for label in labels}
+    return keys, tuple(sorted({len(label) for label in labels}, reverse=True))
+
+
+LABEL_KEYS, LABEL_LENGTHS = compile_labels(SECTION_LABELS)
+WHITESPACE_RE = re.compile(r"\s*")
+
+
+def find_labels(text: str, labels: Tuple[str, ...] = SECTION_LABELS) -> Iterator[Tuple[str, int, int]]:
+    """Yield ``(label, start, end)`` for every ``Label:`` in ``text``, case-insensitively.
+
+    Every label ends in a colon, so instead of running a case-insensitive
+    alternation at every offset we jump between colons with ``str.find`` and
+    probe the few label lengths that could end there (longest wins).
+    """
+    keys, lengths = (LABEL_KEYS, LABEL_LENGTHS) if labels == SECTION_LABELS else compile_labels(labels)
+    colon = text.find(":")
+    while colon != -1:
+        for length in lengths:
+            if length <= colon:
+                label = keys.get(text[colon - length:colon].lower())
+                if label:
+                    yield label, colon - length, colon + 1
+                    break
+        colon = text.find(":", colon + 1)
+
+
+def split_sections(
+    text: str,
+    labels: Iterable[str] = SECTION_LABELS,
+    followers: Iterable[str] = SECTION_FOLLOWERS,
+) -> Dict[str, str]:
+    """Return ``{label: body}`` for the first occurrence of every label in ``text``.
+
+    A section runs from its ``Label:`` to the next line that starts with a
+    follower label (or the end of the text), matching what
+    ``Add_New_Aliens.extract_block`` produced, but from one scan of the text.
+    """
+    follower_set = set(followers)
+
+    firsts: Dict[str, int] = {}
+    boundaries: List[int] = []
+    for label, start, end in find_labels(text, tuple(labels)):
+        if label not in firsts:
+            firsts[label] = WHITESPACE_RE.match(text, end).end()
+        if label in follower_set and start > 0 and text[start - 1] == "\n":
+            boundaries.append(start - 1)
+
+    sections: Dict[str, str] = {}
+    for label, start in firsts.items():
+        index = bisect_left(boundaries, start)
+        end = boundaries[index] if index < len(boundaries) else len(text)
+        sections[label] = text[start:end].strip()
+    return sections
+
+
+def first_line(value: str) -> str:
+    return value.splitlines()[0] if value else ""
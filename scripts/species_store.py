@@ -0,0 +1,203 @@
+"""Shared in-memory view of ALIENS.json with hash indexes for the Python tools."""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import re
+import tempfile
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Union
+
+from metrics import count
+
+ROOT = Path(__file__).resolve().parent.parent
+ALIENS_PATH = ROOT / "ALIENS.json"
+
+SLUG_RE = re.compile(r"[^a-z0-9]+")
+
+
+def slugify(value: str, fallback: str = "") -> str:
+    """Slug rules shared by Add_New_Aliens and convert_images_to_webp."""
+    return SLUG_RE.sub("-", value.lower()).strip("-") or fallback
+
+
+def normalize_name(value: str) -> str:
+    return " ".join(value.split()).casefold()
+
+
+def fingerprint(record: dict) -> bytes:
+    """Cheap change detector: digest of the compact (C-encoder) serialization."""
+    compact = json.dumps(record, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.blake2b(compact.encode("utf-8"), digest_size=16).digest()
+
+
+def write_atomic(path: Path, chunks: Iterable[str]) -> None:
+    """Stream ``chunks`` into a sibling temp file, fsync it, then rename over ``path``.
+
+    Readers (the frontend build, MySQL imports) see either the old file or the
+    complete new one, never a truncated write.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(prefix=f".{path.name}.", suffix=".tmp", dir=path.parent)
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8", newline="") as handle:
+            for chunk in chunks:
+                handle.write(chunk)
+            handle.flush()
+            os.fsync(handle.fileno())
+            count("bytes_written", os.fstat(handle.fileno()).st_size)
+        try:
+            os.chmod(tmp_name, path.stat().st_mode & 0o777)
+        except FileNotFoundError:
+            umask = os.umask(0)
+            os.umask(umask)
+            os.chmod(tmp_name, 0o666 & ~umask)
+        os.replace(tmp_name, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_name)
+        except FileNotFoundError:
+            pass
+        raise
+
+
+def iter_document(races: List[dict], wrapped: bool) -> Iterator[str]:
+    """Yield ``json.dumps(doc, ensure_ascii=False, indent=2) + "\\n"`` one record at a time."""
+    if not races:
+        yield '{\n  "races": []\n}\n' if wrapped else "[]\n"
+        return
+    indent = "    " if wrapped else "  "
+    yield '{\n  "races": [\n' if wrapped else "[\n"
+    for index, record in enumerate(races):
+        body = json.dumps(record, ensure_ascii=False, indent=2).replace("\n", "\n" + indent)
+        yield (",\n" if index else "") + indent + body
+    yield "\n  ]\n}\n" if wrapped else "\n]\n"
+
+
+class SpeciesStore:
+    """Load the ``{"races": [...]}`` document once and index it by id, slug, name and alias.
+
+    Indexes are kept in step by :meth:`add`/:meth:`add_alias`; when a key is
+    duplicated in the catalog (e.g. the two Verpine entries) the first record
+    wins, matching what the old linear scans returned.
+
+    Scripts mutate the record dicts in place; :meth:`save` compares each
+    record against its fingerprint from load time and skips the write
+    entirely when nothing changed.
+    """
+
+    def __init__(self, races: List[dict], path: Path = ALIENS_PATH, wrapped: bool = True) -> None:
+        self.path = path
+        self.races = races
+        self.wrapped = wrapped
+        self.by_id: Dict[int, dict] = {}
+        self.by_slug: Dict[str, dict] = {}
+        self.by_name: Dict[str, dict] = {}
+        self.by_alias: Dict[str, dict] = {}
+        self.next_id = 1
+        for record in races:
+            self._index(record)
+        self.mark_clean()
+
+    @classmethod
+    def load(cls, path: Path = ALIENS_PATH) -> "SpeciesStore":
+        raw = json.loads(path.read_text(encoding="utf-8"))
+        if isinstance(raw, dict) and "races" in raw:
+            return cls(raw["races"], path=path, wrapped=True)
+        if isinstance(raw, list):
+            return cls(raw, path=path, wrapped=False)
+        raise RuntimeError(f"{path.name} must contain either top-level list or {{\"races\": []}}")
+
+    def _index(self, record: dict) -> None:
+        record_id = record.get("id")
+        if isinstance(record_id, int):
+            self.by_id.setdefault(record_id, record)
+            self.next_id = max(self.next_id, record_id + 1)
+        name = record.get("name") or ""
+        if name:
+            self.by_name.setdefault(normalize_name(name), record)
+            self.by_slug.setdefault(slugify(name), record)
+        plural = record.get("plural") or ""
+        if plural:
+            self.by_alias.setdefault(normalize_name(plural), record)
+
+    def __iter__(self) -> Iterator[dict]:
+        return iter(self.races)
+
+    def __len__(self) -> int:
+        return len(self.races)
+
+    def __contains__(self, name: str) -> bool:
+        return normalize_name(name) in self.by_name
+
+    def get(self, record_id: int) -> Optional[dict]:
+        return self.by_id.get(record_id)
+
+    def get_by_slug(self, slug: str) -> Optional[dict]:
+        return self.by_slug.get(slug)
+
+    def get_by_name(self, name: str) -> Optional[dict]:
+        return self.by_name.get(normalize_name(name))
+
+    def find(self, key: Union[int, str]) -> Optional[dict]:
+        """Resolve an id, name, alias or slug to a record."""
+        if isinstance(key, int):
+            return self.get(key)
+        normalized = normalize_name(key)
+        return (
+            self.by_name.get(normalized)
+            or self.by_alias.get(normalized)
+            or self.by_slug.get(slugify(key))
+        )
+
+    def add_alias(self, alias: str, record: dict) -> None:
+        self.by_alias[normalize_name(alias)] = record
+
+    def add_aliases(self, aliases: Dict[str, str]) -> None:
+        """Register ``{alias: species name}`` pairs, ignoring names not in the catalog."""
+        for alias, name in aliases.items():
+            record = self.get_by_name(name)
+            if record is not None:
+                self.add_alias(alias, record)
+
+    def allocate_id(self) -> int:
+        record_id = self.next_id
+        self.next_id += 1
+        return record_id
+
+    def add(self, record: dict) -> dict:
+        """Append a record, assigning the next id when it has none."""
+        if not isinstance(record.get("id"), int):
+            record["id"] = self.allocate_id()
+        self.races.append(record)
+        self._index(record)
+        return record
+
+    def extend(self, records: Iterable[dict]) -> List[dict]:
+        return [self.add(record) for record in records]
+
+    def mark_clean(self) -> None:
+        self._saved_order = [id(record) for record in self.races]
+        self._fingerprints = {id(record): fingerprint(record) for record in self.races}
+
+    def dirty_records(self) -> List[dict]:
+        """Records added or modified since load (or the last save)."""
+        return [record for record in self.races if self._fingerprints.get(id(record)) != fingerprint(record)]
+
+    @property
+    def is_dirty(self) -> bool:
+        return bool(self.dirty_records()) or self._saved_order != [id(record) for record in self.races]
+
+    def to_document(self) -> Union[dict, list]:
+        return {"races": self.races} if self.wrapped else self.races
+
+    def save(self, path: Optional[Path] = None, force: bool = False) -> bool:
+        """Atomically rewrite the catalog if anything changed; return whether a write happened."""
+        target = path or self.path
+        if not force and target == self.path and not self.is_dirty:
+            return False
+        write_atomic(target, iter_document(self.races, self.wrapped))
+        if target == self.path:
+            self.mark_clean()
+        return True
@@ -0,0 +1,328 @@
+#!/usr/bin/env python3
+"""Compute an N×N starship duel matrix and per-ship rival lists from the import-ready data.
+
+Each ship's combat stats are packed into pip arrays (maneuverability, hull,
+shields, scale, and per-weapon fire control and damage). For every attacker
+and defender pair the engine takes, per weapon,
+
+    P(gunnery + fire control >= piloting + maneuverability)     to hit
+  × P(damage > hull + shields)                                  to damage
+
+using exact Wild Die distributions from ``dice_rolls``, with the usual scale
+modifiers (the smaller craft adds the difference to dodge and to-hit, the
+larger to damage and resistance). The best weapon gives the per-round chance
+``p[i, j]``; ``win[i, j]`` is the chance ``i`` lands the first damaging hit
+when both fire every round.
+
+Output is a little-endian uint16 matrix (``win * 65535``, row = attacker) plus
+a JSON sidecar with ship names and the top-K rivals and threats per ship.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+try:
+    import numpy as np
+except ImportError as exc:  # pragma: no cover
+    raise SystemExit(
+        "NumPy is required. Install with `python3 -m pip install numpy` and rerun."
+    ) from exc
+
+import metrics
+from dice_codes import PIPS_PER_DIE, format_code, to_pips
+from dice_rolls import exact, leading_code
+from metrics import timed
+from search_index import STARSHIP_DATA_DIR, STARSHIP_FILES
+from species_store import ROOT, slugify, write_atomic
+
+MATRIX_VERSION = 1
+OUT_DIR = ROOT / "web" / "public" / "data"
+MATRIX_NAME = "starship-matchups"
+# Pip totals covered by the opposed-roll tables (40D); larger pools are clipped.
+MAX_PIPS = 120
+DEFAULT_CREW = "4D"
+TOP_K = 5
+# Scale dice from the rulebook scale chart, in pips.
+SCALE_PIPS: Dict[str, int] = {"speeder": 2 * PIPS_PER_DIE, "starfighter": 6 * PIPS_PER_DIE, "capital": 12 * PIPS_PER_DIE}
+GUNNERY_RE = re.compile(r"gunnery\W*(\d+\s*D(?:\s*[+-]\s*\d)?)", re.I)
+PILOTING_RE = re.compile(r"pilot(?:ing)?\W*(\d+\s*D(?:\s*[+-]\s*\d)?)", re.I)
+ALL_SKILLS_RE = re.compile(r"^\s*(\d+\s*D(?:\s*[+-]\s*\d)?)\s+in all", re.I)
+
+
+@dataclass
+class Fleet:
+    """Combat stats of N ships as pip arrays; weapon columns are padded and masked."""
+
+    names: List[str]
+    scale: np.ndarray  # (N,)
+    gunnery: np.ndarray  # (N,)
+    piloting: np.ndarray  # (N,)
+    maneuverability: np.ndarray  # (N,)
+    resistance: np.ndarray  # (N,) hull + shields
+    fire_control: np.ndarray  # (N, W)
+    damage: np.ndarray  # (N, W)
+    armed: np.ndarray  # (N, W) bool
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+
+def stat_pips(value: object) -> int:
+    code = leading_code(value)
+    return max(to_pips(code), 0) if code else 0
+
+
+def scale_of(ship: dict) -> str:
+    scale = (ship.get("scale") or ship.get("category") or "").strip().lower()
+    if scale.startswith(("capital", "capitol")):
+        return "capital"
+    if scale.startswith("speeder"):
+        return "speeder"
+    return "starfighter"
+
+
+def crew_pips(ship: dict, default: int) -> Tuple[int, int]:
+    """``(gunnery, piloting)`` from ``crewSkill`` text, falling back to ``default``."""
+    text = ship.get("crewSkill") or ""
+    every = ALL_SKILLS_RE.search(text)
+    if every:
+        pips = to_pips(every.group(1))
+        return pips, pips
+    gunnery, piloting = GUNNERY_RE.search(text), PILOTING_RE.search(text)
+    return (
+        to_pips(gunnery.group(1)) if gunnery else default,
+        to_pips(piloting.group(1)) if piloting else default,
+    )
+
+
+def completeness(ship: dict) -> int:
+    return sum(bool(ship.get(field)) for field in ("maneuverability", "hull", "shields", "crewSkill")) + len(ship.get("weapons") or [])
+
+
+def load_ships(paths: Iterable[Path]) -> List[dict]:
+    """Ships from the import-ready files, one per name (variants files repeat their parents)."""
+    ships: Dict[str, dict] = {}
+    for path in paths:
+        if not path.exists():
+            continue
+        for ship in json.loads(path.read_text(encoding="utf-8")).get("starships", []):
+            name = (ship.get("name") or "").strip()
+            if name and (name not in ships or completeness(ship) > completeness(ships[name])):
+                ships[name] = ship
+    return [ships[name] for name in sorted(ships, key=str.casefold)]
+
+
+def build_fleet(ships: List[dict], crew: str = DEFAULT_CREW) -> Fleet:
+    default = to_pips(crew)
+    weapons = [
+        [(stat_pips(w.get("fireControl")), stat_pips(w.get("damage"))) for w in ship.get("weapons") or [] if leading_code(w.get("damage"))]
+        for ship in ships
+    ]
+    width = max((len(row) for row in weapons), default=0) or 1
+    fire_control = np.zeros((len(ships), width), dtype=np.int16)
+    damage = np.zeros((len(ships), width), dtype=np.int16)
+    armed = np.zeros((len(ships), width), dtype=bool)
+    for row, entries in enumerate(weapons):
+        for column, (control, dice) in enumerate(entries):
+            fire_control[row, column], damage[row, column], armed[row, column] = control, dice, True
+    crews = [crew_pips(ship, default) for ship in ships]
+    return Fleet(
+        names=[ship["name"].strip() for ship in ships],
+        scale=np.array([SCALE_PIPS[scale_of(ship)] for ship in ships], dtype=np.int16),
+        gunnery=np.array([gunnery for gunnery, _ in crews], dtype=np.int16),
+        piloting=np.array([piloting for _, piloting in crews], dtype=np.int16),
+        maneuverability=np.array([stat_pips(ship.get("maneuverability")) for ship in ships], dtype=np.int16),
+        resistance=np.array([stat_pips(ship.get("hull")) + stat_pips(ship.get("shields")) for ship in ships], dtype=np.int16),
+        fire_control=fire_control,
+        damage=damage,
+        armed=armed,
+    )
+
+
+def opposed_tables(max_pips: int = MAX_PIPS) -> Tuple[np.ndarray, np.ndarray]:
+    """``(ge, gt)``: ``ge[a, d]`` = P(roll of ``a`` pips >= roll of ``d`` pips), ``gt`` likewise for >.
+
+    Every distribution is laid on one grid of totals so both tables are a
+    single matrix product.
+    """
+    dists = [exact(pips) for pips in range(max_pips + 1)]
+    width = max(d.offset + len(d.probabilities) for d in dists) + 1
+    grid = np.zeros((max_pips + 1, width))
+    for pips, dist in enumerate(dists):
+        grid[pips, dist.offset: dist.offset + len(dist.probabilities)] = dist.probabilities
+    cdf = np.cumsum(grid, axis=1)
+    # below[d, t] = P(defender < t); at_or_below[d, t] = P(defender <= t).
+    below = np.concatenate((np.zeros((max_pips + 1, 1)), cdf[:, :-1]), axis=1)
+    return grid @ cdf.T, grid @ below.T
+
+
+# Set in each worker by ``init_worker`` so row blocks do not re-send the arrays.
+_FLEET: Optional[Fleet] = None
+_TABLES: Optional[Tuple[np.ndarray, np.ndarray]] = None
+
+
+def init_worker(fleet: Fleet, tables: Tuple[np.ndarray, np.ndarray]) -> None:
+    global _FLEET, _TABLES
+    _FLEET, _TABLES = fleet, tables
+
+
+def round_block(start: int, stop: int) -> Tuple[int, np.ndarray]:
+    """Per-round damage chance ``p[start:stop, :]`` for attackers ``start..stop``."""
+    fleet, (hit_table, damage_table) = _FLEET, _TABLES
+    attackers = slice(start, stop)
+    # diff > 0: the defender is the larger craft.
+    diff = fleet.scale[None, :] - fleet.scale[attackers, None]  # (B, N)
+    larger_target = np.maximum(diff, 0)[:, None, :]
+    smaller_target = np.maximum(-diff, 0)[:, None, :]
+
+    to_hit = fleet.gunnery[attackers, None, None] + fleet.fire_control[attackers, :, None] + larger_target
+    dodge = (fleet.piloting + fleet.maneuverability)[None, None, :] + smaller_target
+    damage = fleet.damage[attackers, :, None] + smaller_target
+    resist = fleet.resistance[None, None, :] + larger_target
+
+    hit = hit_table[np.minimum(to_hit, MAX_PIPS), np.minimum(dodge, MAX_PIPS)]
+    hurt = damage_table[np.minimum(damage, MAX_PIPS), np.minimum(resist, MAX_PIPS)]
+    chance = np.where(fleet.armed[attackers, :, None], hit * hurt, 0.0)
+    return start, chance.max(axis=1)
+
+
+@timed()
+def round_matrix(fleet: Fleet, workers: Optional[int] = None) -> np.ndarray:
+    tables = opposed_tables()
+    workers = workers or os.cpu_count() or 1
+    size = len(fleet)
+    if workers == 1 or size < 2 * workers:
+        init_worker(fleet, tables)
+        return round_block(0, size)[1]
+    step = -(-size // workers)
+    chance = np.empty((size, size))
+    with ProcessPoolExecutor(max_workers=workers, initializer=init_worker, initargs=(fleet, tables)) as pool:
+        for start, block in pool.map(round_block, range(0, size, step), [min(s + step, size) for s in range(0, size, step)]):
+            chance[start:start + len(block)] = block
+    return chance
+
+
+def duel_matrix(chance: np.ndarray) -> np.ndarray:
+    """``win[i, j]``: P(``i`` lands the first damaging hit), simultaneous fire, ties split."""
+    p, q = chance, chance.T
+    either = p + q - p * q
+    with np.errstate(invalid="ignore", divide="ignore"):
+        win = np.where(either > 0, (p * (1 - q) + p * q / 2) / either, 0.5)
+    np.fill_diagonal(win, 0.5)
+    return win
+
+
+def rivals(win: np.ndarray, chance: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Per ship: the ``k`` most even matchups and the ``k`` opponents it is least likely to beat.
+
+    Pairs where neither side can hurt the other are not rivals.
+    """
+    size = len(win)
+    k = min(k, size - 1)
+    if k <= 0:
+        empty = np.zeros((size, 0), dtype=np.int64)
+        return empty, empty
+    engaged = (chance > 0) | (chance.T > 0)
+    np.fill_diagonal(engaged, False)
+    evenness = np.where(engaged, np.abs(win - 0.5), np.inf)
+    threat = np.where(engaged, win, np.inf)
+    even = np.argpartition(evenness, k - 1, axis=1)[:, :k]
+    worst = np.argpartition(threat, k - 1, axis=1)[:, :k]
+    rows = np.arange(size)[:, None]
+    even = np.take_along_axis(even, np.argsort(evenness[rows, even], axis=1), axis=1)
+    worst = np.take_along_axis(worst, np.argsort(threat[rows, worst], axis=1), axis=1)
+    return np.where(np.isfinite(evenness[rows, even]), even, -1), np.where(np.isfinite(threat[rows, worst]), worst, -1)
+
+
+@timed()
+def write_outputs(out_dir: Path, fleet: Fleet, ships: List[dict], win: np.ndarray, chance: np.ndarray, k: int) -> Tuple[Path, Path]:
+    matrix_path = out_dir / f"{MATRIX_NAME}.bin"
+    meta_path = out_dir / f"{MATRIX_NAME}.json"
+    out_dir.mkdir(parents=True, exist_ok=True)
+    quantized = np.round(win * 65535).astype("<u2")
+    tmp = matrix_path.with_name(f".{matrix_path.name}.tmp")
+    quantized.tofile(tmp)
+    os.replace(tmp, matrix_path)
+
+    even, worst = rivals(win, chance, k)
+    entries = []
+    for row, ship in enumerate(ships):
+        entries.append({
+            "name": fleet.names[row],
+            "slug": slugify(fleet.names[row]),
+            "scale": scale_of(ship),
+            "weapons": int(fleet.armed[row].sum()),
+            "rivals": [int(col) for col in even[row] if col >= 0],
+            "threats": [int(col) for col in worst[row] if col >= 0],
+        })
+    meta = {
+        "version": MATRIX_VERSION,
+        "matrix": matrix_path.name,
+        "shape": list(quantized.shape),
+        "dtype": "uint16le",
+        "scale": 65535,
+        "ships": entries,
+    }
+    write_atomic(meta_path, [json.dumps(meta, ensure_ascii=False, separators=(",", ":")), "\n"])
+    return matrix_path, meta_path
+
+
+def matchups(args: argparse.Namespace) -> None:
+    if to_pips(args.crew) < 0:
+        raise SystemExit(f"Not a dice code: {args.crew!r}")
+
+    start = time.perf_counter()
+    ships = load_ships(STARSHIP_DATA_DIR / name for name in STARSHIP_FILES)
+    if not ships:
+        raise SystemExit(f"No starships found in {STARSHIP_DATA_DIR}")
+    fleet = build_fleet(ships, args.crew)
+    loaded = time.perf_counter()
+    chance = round_matrix(fleet, args.workers)
+    win = duel_matrix(chance)
+    computed = time.perf_counter()
+    matrix_path, meta_path = write_outputs(args.out_dir, fleet, ships, win, chance, args.top)
+    print(
+        f"✅ {len(fleet)} ships ({int(fleet.armed.any(axis=1).sum())} armed): loaded in {loaded - start:.2f}s, "
+        f"{len(fleet) ** 2:,} matchups in {computed - loaded:.2f}s → {matrix_path.name} "
+        f"({matrix_path.stat().st_size / 1024:.0f} KiB) + {meta_path.name}"
+    )
+
+    if args.ship:
+        lookup = {name.casefold(): row for row, name in enumerate(fleet.names)}
+        row = lookup.get(args.ship.casefold())
+        if row is None:
+            raise SystemExit(f"No starship named {args.ship!r}")
+        even, worst = rivals(win, chance, args.top)
+        print(
+            f"\n{fleet.names[row]}: maneuverability {format_code(fleet.maneuverability[row])}, "
+            f"hull+shields {format_code(fleet.resistance[row])}, {int(fleet.armed[row].sum())} weapons"
+        )
+        for label, columns in (("Closest rivals", even[row]), ("Biggest threats", worst[row])):
+            print(f"  {label}:")
+            for col in columns[columns >= 0]:
+                print(f"    {fleet.names[col]:<40} win {win[row, col]:6.1%}  (hits/round {chance[row, col]:5.1%} vs {chance[col, row]:5.1%})")
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--out-dir", type=Path, default=OUT_DIR, help="Where to write the matrix and its JSON sidecar.")
+    parser.add_argument("--top", type=int, default=TOP_K, help="Rivals and threats to list per ship.")
+    parser.add_argument("--crew", default=DEFAULT_CREW, help="Gunnery/piloting for ships without crewSkill.")
+    parser.add_argument("--workers", type=int, help="Processes for the row blocks (default: CPU count).")
+    parser.add_argument("--ship", help="Print the matchups of one ship.")
+    metrics.add_arguments(parser)
+    args = parser.parse_args(argv)
+    with metrics.session("starship_matchups", args.metrics, args.profile):
+        matchups(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,548 @@
+#!/usr/bin/env python3
+"""Stream raw holocron starship pages and the import-ready files into rows for dev/sql/schema.sql.
+
+Each stage handles one ship at a time:
+
+  parse      raw page wikitext or an import-ready record -> ship dict
+  normalize  markup-free names, blanks -> None, numeric length / cost / speed
+  link       ``parent`` / ``variantOf`` resolved through a name -> slug index
+  dedupe     one row per slug: the newest, most complete record, gaps filled
+             from the other copies (variants files repeat their parents, raw
+             pages recover fields the import-ready extraction dropped)
+  emit       JSON lines and/or ``REPLACE INTO`` statements in schema order
+
+parse and normalize results are cached per ship under .cache/starship-pipeline,
+keyed by a hash of the stage input, so editing one ship re-runs only that
+ship. link and dedupe are dictionary passes over the whole fleet.
+"""
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import re
+import time
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import metrics
+from holocron_wikitext import canonical_label, tokenize
+from metrics import count, timed
+from search_index import STARSHIP_DATA_DIR, STARSHIP_FILES
+from species_store import ROOT, slugify, write_atomic
+
+PIPELINE_VERSION = 2
+RAW_DIR = STARSHIP_DATA_DIR / "raw"
+CACHE_PATH = ROOT / ".cache" / "starship-pipeline" / "stages.json"
+OUT_PATH = ROOT / ".cache" / "starship-pipeline" / "starships.jsonl"
+
+# dev/sql/schema.sql column order.
+COLUMNS: Tuple[str, ...] = (
+    "slug", "name", "craft", "affiliation", "type", "category", "scale", "length", "skill", "crew",
+    "crewSkill", "passengers", "cargoCapacity", "consumables", "cost", "hyperdrive", "navComputer",
+    "maneuverability", "space", "atmosphere", "hull", "shields", "sensors", "weapons", "description",
+    "imageFilename", "imageUrl", "notes", "sources", "pageId", "revisionId",
+    "parent", "isVariant", "variantOf", "lengthMeters", "costNew", "costUsed", "spaceSpeed", "atmosphereKmh",
+)
+JSON_COLUMNS = frozenset({"sensors", "weapons", "sources"})
+TEXT_COLUMNS = tuple(column for column in COLUMNS[1:29] if column not in JSON_COLUMNS)
+
+# Wikitext labels (after canonical_label) -> record field; misspellings occur in the dumps.
+SHIP_FIELDS = {
+    "name": "name",
+    "craft": "craft",
+    "affiliation": "affiliation",
+    "type": "type",
+    "scale": "scale",
+    "length": "length",
+    "lenght": "length",
+    "skill": "skill",
+    "crew": "crew",
+    "crew skill": "crewSkill",
+    "crew skills": "crewSkill",
+    "passengers": "passengers",
+    "passangers": "passengers",
+    "cargo capacity": "cargoCapacity",
+    "cargo": "cargoCapacity",
+    "consumables": "consumables",
+    "cost": "cost",
+    "hyperdrive multiplier": "hyperdrive",
+    "hyderdrive multiplier": "hyperdrive",
+    "hyperdrive": "hyperdrive",
+    "nav computer": "navComputer",
+    "maneuverability": "maneuverability",
+    "manuverability": "maneuverability",
+    "maneuvreability": "maneuverability",
+    "space": "space",
+    "atmosphere": "atmosphere",
+    "hull": "hull",
+    "shields": "shields",
+    "shield": "shields",
+    "capsule": "description",
+    "description": "description",
+}
+LIST_FIELDS = {"sensors": "sensors", "weapons": "weapons"}
+SENSOR_KEYS = ("passive", "scan", "search", "focus")
+WEAPON_KEYS = {
+    "fire arc": "fireArc",
+    "skill": "skill",
+    "fire control": "fireControl",
+    "space range": "spaceRange",
+    "atmosphere range": "atmosphereRange",
+    "damage": "damage",
+    "crew": "crew",
+    "scale": "scale",
+}
+# Family pages the variants files name as a parent, and the ship that heads each family.
+FAMILY_BASES = {"tie-fighter": "tie-starfighter"}
+FAMILY_SUFFIXES = ("-starfighters", "-starfighter", "-series", "-family")
+# Section headings the variant scrape mistook for ships ("B-Wing Description").
+HEADING_NAME_RE = re.compile(r"\s(?:description|history|game notes)$", re.I)
+
+NUMBER_RE = re.compile(r"\d[\d,]*(?:\.\d+)?")
+LENGTH_RE = re.compile(r"(\d[\d,]*(?:\.\d+)?)\s*(km|kilomet(?:er|re)s?|m\b|met(?:er|re)s?)?", re.I)
+COST_RE = re.compile(r"(\d[\d,]*(?:\.\d+)?)\s*(million|billion)?", re.I)
+KMH_RE = re.compile(r"(\d[\d,.]*)\s*(?:km\s*/\s*h|kmh|kph|km\b)", re.I)
+# "415; 1,200" or "450/1300": space move, then km/h with the unit left off.
+MOVE_KMH_PAIR_RE = re.compile(r"^\s*\d[\d,.]*\s*[;/]\s*(\d[\d,.]*)\s*$")
+MARKUP_RE = re.compile(r"\[\[(?:[^|\]]*\|)?([^\]]*)\]\]|'{2,}")
+WHITESPACE_RE = re.compile(r"\s+")
+SCALES = {"million": 1_000_000, "billion": 1_000_000_000}
+
+
+# -- parse ---------------------------------------------------------------------------------------
+
+
+@timed("parse_starship_wikitext")
+def parse_wikitext(wikitext: str, title: str) -> dict:
+    """Parse one holocron starship page (``'''Label''': value<br />`` lines) into a ship dict."""
+    ship: Dict[str, object] = {"name": title}
+    sensors: Dict[str, str] = {}
+    weapons: List[Dict[str, str]] = []
+    images: List[str] = []
+    field: Optional[str] = None
+    line: List[str] = []
+
+    def flush() -> None:
+        nonlocal field
+        text = " ".join("".join(line).split())
+        line.clear()
+        if field == "sensors":
+            key, colon, value = text.lstrip("*: ").partition(":")
+            if colon and key.strip().lower() in SENSOR_KEYS:
+                sensors[key.strip().lower()] = value.strip()
+        elif field == "weapons":
+            if text.startswith(("*", "#")):
+                name, _, remark = text.lstrip("*# ").partition("(")
+                weapon = {"name": name.strip()}
+                if remark:
+                    weapon["notes"] = remark.rstrip(")").strip()
+                weapons.append(weapon)
+            elif weapons:
+                key, colon, value = text.lstrip(": ").partition(":")
+                if colon and key.strip():
+                    label = key.strip().lower()
+                    weapons[-1][WEAPON_KEYS.get(label) or camel_case(label)] = value.strip()
+        elif field and text:
+            if field == "description" and ship.get("description"):
+                ship["description"] = f"{ship['description']} {text}"
+            else:
+                ship.setdefault(field, text)
+            if field != "description":
+                field = None
+
+    for kind, value in tokenize(wikitext.replace("\r\n", "\n")):
+        if kind in ("text", "emphasis"):
+            line.append(value)
+        elif kind == "break":
+            flush()
+        elif kind == "file":
+            images.append(value)
+        elif kind in ("label", "heading"):
+            key = canonical_label(value)
+            if field == "sensors" and key in SENSOR_KEYS:
+                line.append(f"{key}: ")
+                continue
+            flush()
+            field = LIST_FIELDS.get(key) or SHIP_FIELDS.get(key)
+    flush()
+
+    if sensors:
+        ship["sensors"] = sensors
+    if weapons:
+        ship["weapons"] = weapons
+    if images:
+        ship["imageFilename"] = images[0]
+    count("records_parsed")
+    return ship
+
+
+def camel_case(label: str) -> str:
+    first, *rest = re.findall(r"[a-z0-9]+", label) or ["value"]
+    return first + "".join(word.title() for word in rest)
+
+
+def parse_page(page: dict) -> dict:
+    ship = parse_wikitext(page.get("wikitext") or "", page.get("title") or "")
+    ship.update(
+        category=page.get("category"),
+        pageId=page.get("pageId"),
+        revisionId=page.get("revisionId"),
+        sources=[page["sourceUrl"]] if page.get("sourceUrl") else [],
+        notes=f"Source text {page.get('license') or 'CC-BY-SA 3.0'} from {page['sourceUrl']}" if page.get("sourceUrl") else None,
+    )
+    return ship
+
+
+# -- normalize -----------------------------------------------------------------------------------
+
+
+def strip_markup(value: str) -> str:
+    return WHITESPACE_RE.sub(" ", MARKUP_RE.sub(r"\1", value)).strip()
+
+
+def to_number(text: str) -> float:
+    return float(text.replace(",", ""))
+
+
+def length_meters(text: Optional[str]) -> Optional[float]:
+    """``"1,600 meters"`` -> 1600.0, ``"1.2 km"`` -> 1200.0; lengths without a number -> None."""
+    match = LENGTH_RE.search(text or "")
+    if not match:
+        return None
+    meters = to_number(match.group(1))
+    unit = (match.group(2) or "").lower()
+    return meters * 1000 if unit.startswith("k") else meters
+
+
+def cost_credits(text: Optional[str]) -> Tuple[Optional[int], Optional[int]]:
+    """``(new, used)`` prices: ``"250,000 (new), 112,000 (used)"``, ``"12 million (new)"``, ``"42,000 Credits"``.
+
+    A price without "new" or "used" after it counts as new.
+    """
+    new = used = None
+    text = text or ""
+    matches = list(COST_RE.finditer(text))
+    for index, match in enumerate(matches):
+        end = matches[index + 1].start() if index + 1 < len(matches) else len(text)
+        amount = int(to_number(match.group(1)) * SCALES.get((match.group(2) or "").lower(), 1))
+        qualifier = text[match.end():end].lower()
+        if "used" in qualifier and used is None:
+            used = amount
+        elif "used" not in qualifier and new is None:
+            new = amount
+    return new, used
+
+
+def space_speed(text: Optional[str]) -> Optional[float]:
+    """The first Space move: ``"9 (12 when engaging SLAM)"`` -> 9.0."""
+    match = NUMBER_RE.search(text or "")
+    return to_number(match.group()) if match else None
+
+
+def atmosphere_kmh(text: Optional[str]) -> Optional[int]:
+    """``"415; 1,180 kmh"`` -> 1180. A three-digit group after a dot is a thousands separator (``1.200 km/h``).
+
+    Without a unit, the second number of a ``move; kmh`` or ``move/kmh`` pair is taken.
+    """
+    match = KMH_RE.search(text or "") or MOVE_KMH_PAIR_RE.match(text or "")
+    if not match:
+        return None
+    digits = match.group(1).strip(".,")
+    if re.fullmatch(r"\d{1,3}(?:\.\d{3})+", digits):
+        digits = digits.replace(".", "")
+    try:
+        return int(round(to_number(digits)))
+    except ValueError:
+        return None
+
+
+def normalize_ship(ship: dict) -> dict:
+    """Clean one ship and add the numeric columns; ``slug`` comes from the cleaned name."""
+    row: Dict[str, object] = {}
+    for column in TEXT_COLUMNS:
+        value = ship.get(column)
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            value = str(value)
+        value = strip_markup(value) if isinstance(value, str) else None
+        row[column] = value or None
+    row["name"] = row["name"] or row["craft"] or ""
+    row["slug"] = slugify(row["name"]) or (str(ship.get("pageId")) if ship.get("pageId") else "")
+    if row["category"]:
+        row["category"] = row["category"].lower()
+
+    sensors = ship.get("sensors")
+    row["sensors"] = {key: strip_markup(str(value)) for key, value in sensors.items() if value} if isinstance(sensors, dict) and sensors else None
+    weapons = [
+        {key: strip_markup(str(value)) for key, value in weapon.items() if value not in (None, "")}
+        for weapon in ship.get("weapons") or [] if isinstance(weapon, dict)
+    ]
+    row["weapons"] = [weapon for weapon in weapons if weapon.get("name")] or None
+    row["sources"] = list(ship.get("sources") or []) or None
+    for column in ("pageId", "revisionId"):
+        value = ship.get(column)
+        row[column] = int(value) if isinstance(value, (int, str)) and str(value).isdigit() else None
+
+    parent = ship.get("parent")
+    row["parent"] = strip_markup(parent) or None if isinstance(parent, str) else None
+    variant_of = ship.get("variantOf")
+    row["variantOf"] = strip_markup(variant_of) or None if isinstance(variant_of, str) else None
+    row["isVariant"] = bool(ship.get("isVariant") or row["parent"] or row["variantOf"])
+
+    row["lengthMeters"] = length_meters(row["length"])
+    row["costNew"], row["costUsed"] = cost_credits(row["cost"])
+    row["spaceSpeed"] = space_speed(row["space"])
+    row["atmosphereKmh"] = atmosphere_kmh(row["atmosphere"])
+    return row
+
+
+# -- cache ---------------------------------------------------------------------------------------
+
+
+class StageCache:
+    """Per-ship stage results keyed by a hash of the stage input; entries not used in a run are dropped on save."""
+
+    def __init__(self, path: Optional[Path]) -> None:
+        self.path = path
+        self.stages: Dict[str, Dict[str, object]] = {}
+        self.used: Dict[str, Dict[str, object]] = {}
+        self.hits: Dict[str, int] = {}
+        self.misses: Dict[str, int] = {}
+        if path and path.exists():
+            try:
+                payload = json.loads(path.read_text(encoding="utf-8"))
+            except json.JSONDecodeError:
+                payload = {}
+            if payload.get("version") == PIPELINE_VERSION:
+                self.stages = payload.get("stages") or {}
+
+    @staticmethod
+    def key(value: object) -> str:
+        blob = json.dumps(value, sort_keys=True, ensure_ascii=False).encode("utf-8")
+        return hashlib.blake2b(blob, digest_size=16).hexdigest()
+
+    def run(self, stage: str, value: object, fn: Callable[..., dict]) -> dict:
+        key = self.key(value)
+        cached = self.stages.get(stage, {}).get(key)
+        if cached is None:
+            self.misses[stage] = self.misses.get(stage, 0) + 1
+            cached = fn(value)
+        else:
+            self.hits[stage] = self.hits.get(stage, 0) + 1
+        self.used.setdefault(stage, {})[key] = cached
+        return cached
+
+    def save(self) -> None:
+        changed = any(self.misses.values()) or any(len(self.stages.get(stage, {})) != len(entries) for stage, entries in self.used.items())
+        if self.path and (changed or set(self.stages) != set(self.used)):
+            payload = {"version": PIPELINE_VERSION, "stages": self.used}
+            write_atomic(self.path, [json.dumps(payload, ensure_ascii=False)])
+
+    def summary(self) -> str:
+        stages = sorted(set(self.hits) | set(self.misses))
+        return ", ".join(f"{stage} {self.hits.get(stage, 0)} cached / {self.misses.get(stage, 0)} run" for stage in stages)
+
+
+# -- stages --------------------------------------------------------------------------------------
+
+
+def iter_sources(import_paths: Iterable[Path], raw_dir: Optional[Path]) -> Iterator[Tuple[str, dict]]:
+    """``(origin, item)`` pairs, one file at a time: import-ready records first, then raw pages."""
+    for path in import_paths:
+        if not path.exists():
+            continue
+        payload = json.loads(path.read_text(encoding="utf-8"))
+        for ship in payload.get("starships", []) if isinstance(payload, dict) else payload:
+            yield "import", ship
+    if raw_dir and raw_dir.is_dir():
+        for path in sorted(raw_dir.glob("*.json")):
+            yield "raw", json.loads(path.read_text(encoding="utf-8"))
+
+
+def parse_stage(items: Iterable[Tuple[str, dict]], cache: StageCache) -> Iterator[Tuple[str, dict]]:
+    for origin, item in items:
+        yield origin, cache.run("parse", item, parse_page) if origin == "raw" else item
+
+
+def normalize_stage(ships: Iterable[Tuple[str, dict]], cache: StageCache) -> Iterator[Tuple[str, dict]]:
+    for origin, ship in ships:
+        row = cache.run("normalize", ship, normalize_ship)
+        if row["slug"]:
+            yield origin, row
+
+
+def completeness(row: dict) -> int:
+    return sum(row.get(column) not in (None, "", [], {}) for column in COLUMNS)
+
+
+def dedupe_stage(rows: Iterable[Tuple[str, dict]], counts: Dict[str, int]) -> List[dict]:
+    """One row per slug.
+
+    Raw pages join the import-ready row with the same ``pageId`` (their own
+    title can differ from the record name); a page the import split into
+    several ships only fills rows by slug. The primary copy is the
+    import-ready one with the newest revision, then the most fields; empty
+    columns are filled from the others.
+    """
+    rows = list(rows)
+    slugs_by_page: Dict[int, set] = {}
+    for origin, row in rows:
+        if origin == "import" and row["pageId"] is not None:
+            slugs_by_page.setdefault(row["pageId"], set()).add(row["slug"])
+
+    groups: Dict[str, List[Tuple[str, dict]]] = {}
+    for origin, row in rows:
+        if origin == "raw":
+            slugs = slugs_by_page.get(row["pageId"], set())
+            if len(slugs) == 1:
+                row = {**row, "slug": next(iter(slugs))}
+            elif slugs and row["slug"] not in slugs:
+                counts["raw skipped"] = counts.get("raw skipped", 0) + 1
+                continue
+        groups.setdefault(row["slug"], []).append((origin, row))
+
+    merged: List[dict] = []
+    for slug, copies in groups.items():
+        copies.sort(key=lambda pair: (pair[0] == "import", pair[1]["revisionId"] or 0, completeness(pair[1])), reverse=True)
+        row = dict(copies[0][1])
+        for _, other in copies[1:]:
+            for column in COLUMNS:
+                if row.get(column) in (None, "", [], {}) and other.get(column) not in (None, "", [], {}):
+                    row[column] = other[column]
+                    counts["fields filled"] = counts.get("fields filled", 0) + 1
+        counts["duplicates"] = counts.get("duplicates", 0) + len(copies) - 1
+        merged.append(row)
+    merged.sort(key=lambda row: row["slug"])
+    return merged
+
+
+def family_key(name: str) -> str:
+    """Slug with a trailing family word dropped: ``"Y-Wing Starfighters"`` -> ``"y-wing"``."""
+    key = slugify(name)
+    for suffix in FAMILY_SUFFIXES:
+        if key.endswith(suffix):
+            return key[: -len(suffix)]
+    return key
+
+
+def link_stage(rows: List[dict], counts: Dict[str, int]) -> List[dict]:
+    """Resolve each variant's parent to a ship slug via a name/craft hash index.
+
+    ``parent`` (a page title such as "Running the B-wing", or a family name)
+    and ``variantOf`` are tried in turn. A resolved variant gets the base
+    ship's name and slug; an unresolved one keeps the family name with its
+    slug, so the frontend can still group it; a ship whose parent resolves
+    to itself is a base, not a variant. Variant rows named after a page
+    section are dropped.
+    """
+    index: Dict[str, str] = {}
+    by_slug = {row["slug"]: row for row in rows}
+    for row in rows:
+        for name in (row["name"], row["craft"]):
+            if name:
+                index.setdefault(slugify(name), row["slug"])
+                index.setdefault(family_key(name), row["slug"])
+
+    def resolve(name: str) -> Optional[str]:
+        slug = slugify(name)
+        return FAMILY_BASES.get(slug) or index.get(slug) or index.get(family_key(name))
+
+    linked: List[dict] = []
+    for row in rows:
+        if row["parent"] and HEADING_NAME_RE.search(row["name"]):
+            counts["headings dropped"] = counts.get("headings dropped", 0) + 1
+            continue
+        linked.append(row)
+        names = [name for name in (row["parent"], row["variantOf"]) if name]
+        base = next((slug for slug in map(resolve, names) if slug), None)
+        if not names or base == row["slug"]:
+            counts["self parents"] = counts.get("self parents", 0) + bool(names)
+            row.update(parent=None, variantOf=None, isVariant=False)
+        elif base:
+            counts["linked"] = counts.get("linked", 0) + 1
+            row.update(parent=by_slug[base]["name"], variantOf=base, isVariant=True)
+        else:
+            family = row["variantOf"] or row["parent"]
+            counts["family only"] = counts.get("family only", 0) + 1
+            row.update(parent=family, variantOf=family_key(family), isVariant=True)
+    return linked
+
+
+# -- emit ----------------------------------------------------------------------------------------
+
+
+def sql_value(value: object, column: str) -> str:
+    if value is None:
+        return "NULL"
+    if column in JSON_COLUMNS:
+        value = json.dumps(value, ensure_ascii=False)
+    if isinstance(value, bool):
+        return "1" if value else "0"
+    if isinstance(value, (int, float)):
+        return repr(value)
+    return "'" + str(value).replace("'", "''") + "'"
+
+
+def sql_lines(rows: Iterable[dict]) -> Iterator[str]:
+    yield "-- Generated by scripts/starship_pipeline.py\n\n"
+    columns = ",".join(COLUMNS)
+    for row in rows:
+        values = ",".join(sql_value(row.get(column), column) for column in COLUMNS)
+        yield f"REPLACE INTO starships ({columns}) VALUES ({values});\n"
+
+
+def json_lines(rows: Iterable[dict]) -> Iterator[str]:
+    for row in rows:
+        yield json.dumps({column: row.get(column) for column in COLUMNS}, ensure_ascii=False) + "\n"
+
+
+def run_pipeline(
+    import_paths: Iterable[Path],
+    raw_dir: Optional[Path],
+    cache: StageCache,
+    counts: Optional[Dict[str, int]] = None,
+) -> List[dict]:
+    counts = {} if counts is None else counts
+    ships = normalize_stage(parse_stage(iter_sources(import_paths, raw_dir), cache), cache)
+    return link_stage(dedupe_stage(ships, counts), counts)
+
+
+def build(args: argparse.Namespace) -> None:
+    started = time.perf_counter()
+    cache = StageCache(None if args.no_cache else args.cache)
+    counts: Dict[str, int] = {}
+    rows = run_pipeline(
+        (STARSHIP_DATA_DIR / name for name in STARSHIP_FILES),
+        None if args.no_raw else args.raw,
+        cache,
+        counts,
+    )
+    cache.save()
+
+    write_atomic(args.out, json_lines(rows))
+    if args.sql:
+        write_atomic(args.sql, sql_lines(rows))
+
+    variants = sum(row["isVariant"] for row in rows)
+    print(f"✅ {len(rows)} starships ({variants} variants) in {time.perf_counter() - started:.2f}s")
+    print(f"   stages: {cache.summary() or 'nothing cached'}")
+    print("   " + ", ".join(f"{name}: {value}" for name, value in sorted(counts.items())))
+    print(f"Wrote {args.out}" + (f" and {args.sql}" if args.sql else ""))
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--raw", type=Path, default=RAW_DIR, help="Directory of raw starship page dumps.")
+    parser.add_argument("--no-raw", action="store_true", help="Use the import-ready files only.")
+    parser.add_argument("--out", type=Path, default=OUT_PATH, help="JSON lines output, one row per ship.")
+    parser.add_argument("--sql", type=Path, help="Also write REPLACE INTO statements for dev/sql/schema.sql here.")
+    parser.add_argument("--cache", type=Path, default=CACHE_PATH, help="Per-ship stage cache.")
+    parser.add_argument("--no-cache", action="store_true", help="Run every stage for every ship.")
+    metrics.add_arguments(parser)
+    args = parser.parse_args(argv)
+    with metrics.session("starship_pipeline", args.metrics, args.profile):
+        build(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,370 @@
+#!/usr/bin/env python3
+"""Generate seeded synthetic species catalogs, C4 source text, holocron wikitext and images at any scale.
+
+Scale 1 matches the real inputs: a 50-record catalog like ALIENS.json, a C4
+section dump covering it, 100 holocron species pages, 538 starship pages
+and 47 portraits at the ``Source Data/Aliens`` size. Scale 10 and 100
+multiply every count. The same seed and scale always produce
+byte-identical files, so two benchmark runs on one machine time the same
+work.
+
+Records come out in the shapes the real tools read:
+
+* ``aliens.json``: ``{"races": [...]}`` with every ALIENS.json field, plus a
+  few deliberate gaps (missing move, the "Special" placeholder ability,
+  invalid dice, min above max) so the audit has something to report.
+* ``c4.txt``: one uppercase-headed section per species with wrapped prose
+  and the ``Label:`` blocks ``split_sections`` understands, CRLF like the
+  PDF dump.
+* ``species-wikitext.jsonl`` / ``starship-wikitext.jsonl``: one holocron
+  page dump per line (``title``, ``pageId``, ``revisionId``, ``wikitext``).
+* ``images/``: PNG portraits for the WebP encoder.
+
+Every ``bench_*`` script takes its records from :func:`synthetic_catalog`
+and :func:`synthetic_starships`, and its timings from :func:`time_runs` /
+:func:`best_of`.
+
+Usage:
+    python3 scripts/synthetic_data.py --scale 10 --out .cache/synthetic
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import shutil
+import textwrap
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Iterable, Iterator, List, Tuple
+
+from dice_codes import ATTRIBUTES, format_code
+from species_store import ROOT, iter_document, slugify, write_atomic
+
+BASE_SPECIES = 50
+BASE_WIKI_SPECIES = 100
+BASE_STARSHIPS = 538
+BASE_IMAGES = 47
+IMAGE_SIZE = (256, 400)
+DEFAULT_OUT = ROOT / ".cache" / "synthetic"
+# Bump when the generated content changes, so cached datasets are regenerated.
+DATASET_VERSION = 2
+
+SYLLABLES = ("ar", "bo", "cor", "dra", "el", "fen", "gor", "ith", "jav", "ka", "lor", "mon", "nak", "or", "pha", "qua", "ro", "sul", "tor", "ul", "vo", "wook", "xan", "yu", "zel")
+WORDS = (
+    "the", "of", "and", "their", "clans", "homeworld", "are", "known", "for", "hunters", "traders", "nomadic",
+    "telepathic", "amphibious", "venom", "gills", "claws", "pheromones", "ritual", "elders", "swamp", "desert",
+    "spacers", "honor", "guild", "bioluminescent", "carapace", "tusks", "Empire", "Republic", "colonies", "trade",
+)
+ABILITY_NAMES = ("Claws", "Darkvision", "Thick Hide", "Pheromones", "Amphibious", "Telepathy", "Keen Smell", "Venom", "Leap", "Camouflage")
+FACTORS = ("Reputation", "Clan Loyalty", "Enslaved", "Isolationist", "Honor Code", "Curious")
+SHIP_TYPES = (("starfighter", "Starfighter"), ("transport", "Starfighter"), ("capital", "Capital"))
+AFFILIATIONS = ("Rebel Alliance", "Empire", "Hutt Cartel", "General")
+EPOCHS = ("Rise of the Empire", "Rebellion", "New Republic")
+
+
+@dataclass
+class Dataset:
+    """Paths and counts of one generated dataset."""
+
+    root: Path
+    scale: int
+    seed: int
+    species: int
+    wiki_species: int
+    starships: int
+    images: int
+    version: int = DATASET_VERSION
+
+    @property
+    def catalog(self) -> Path:
+        return self.root / "aliens.json"
+
+    @property
+    def c4(self) -> Path:
+        return self.root / "c4.txt"
+
+    @property
+    def species_wikitext(self) -> Path:
+        return self.root / "species-wikitext.jsonl"
+
+    @property
+    def starship_wikitext(self) -> Path:
+        return self.root / "starship-wikitext.jsonl"
+
+    @property
+    def image_dir(self) -> Path:
+        return self.root / "images"
+
+    @classmethod
+    def open(cls, root: Path) -> "Dataset":
+        return cls(root=root, **json.loads((root / "dataset.json").read_text(encoding="utf-8")))
+
+
+def prose(rng: random.Random, words: int) -> str:
+    text = " ".join(rng.choice(WORDS) for _ in range(words))
+    return text[:1].upper() + text[1:] + "."
+
+
+def unique_names(count: int, rng: random.Random) -> List[str]:
+    """Letter-only names (C4 headers must match ``[A-Z\\s\\-']+``), unique per dataset."""
+    names: List[str] = []
+    seen = set()
+    while len(names) < count:
+        name = "".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4))).capitalize()
+        if rng.random() < 0.1:
+            name += " " + "".join(rng.choice(SYLLABLES) for _ in range(2)).capitalize()
+        if name.upper() not in seen:
+            seen.add(name.upper())
+            names.append(name)
+    return names
+
+
+def synthetic_record(rng: random.Random, name: str, record_id: int) -> dict:
+    attributes = {}
+    for attribute in ATTRIBUTES:
+        low = rng.randint(3, 9)
+        high = low + rng.randint(3, 12)
+        attributes[attribute] = {"min": format_code(low), "max": format_code(high)}
+    low_size = rng.uniform(0.5, 2.5)
+    abilities = [{"name": rng.choice(ABILITY_NAMES), "description": prose(rng, rng.randint(15, 45))} for _ in range(rng.randint(1, 3))]
+    record = {
+        "id": record_id,
+        "name": name,
+        "plural": name + "s",
+        "description": "\n".join(prose(rng, rng.randint(40, 90)) for _ in range(rng.randint(1, 3))),
+        "personality": prose(rng, rng.randint(15, 30)),
+        "physicalDescription": prose(rng, rng.randint(20, 40)),
+        "homeworld": "".join(rng.choice(SYLLABLES) for _ in range(2)).capitalize(),
+        "languages": {"native": name + "ese", "description": prose(rng, 12)},
+        "exampleNames": ["".join(rng.choice(SYLLABLES) for _ in range(2)).capitalize() for _ in range(rng.randint(2, 5))],
+        "adventurers": prose(rng, rng.randint(15, 35)),
+        "imageUrl": f"/aliens/{slugify(name)}.webp" if rng.random() < 0.7 else "",
+        "stats": {
+            "attributeDice": rng.choice(("11D", "12D", "12D", "12D", "13D")),
+            "attributes": attributes,
+            "move": f"{rng.randint(6, 12)}/{rng.randint(12, 16)}",
+            "size": f"{low_size:.1f}-{low_size + rng.uniform(0.2, 1.0):.1f} meters tall",
+        },
+        "specialAbilities": abilities,
+        "storyFactors": [{"name": rng.choice(FACTORS), "description": prose(rng, rng.randint(10, 25))} for _ in range(rng.randint(0, 2))],
+        "notes": "",
+        "sources": ["Star Wars REUP Section 16"],
+    }
+    record["imagePath"] = record["imageUrl"].lstrip("/")
+    record["hasImage"] = bool(record["imageUrl"])
+
+    # Roughly the share of gaps the real catalog had before the enrich pass.
+    roll = rng.random()
+    if roll < 0.05:
+        record["stats"]["move"] = ""
+    elif roll < 0.08:
+        record["specialAbilities"] = [{"name": "Special", "description": ""}]
+    elif roll < 0.10:
+        record["stats"]["attributes"]["strength"]["min"] = "—"
+    elif roll < 0.11:
+        bounds = record["stats"]["attributes"]["dexterity"]
+        bounds["min"], bounds["max"] = bounds["max"], bounds["min"]
+    return record
+
+
+def synthetic_catalog(count: int, seed: int) -> List[dict]:
+    rng = random.Random(seed)
+    return [synthetic_record(rng, name, index + 1) for index, name in enumerate(unique_names(count, rng))]
+
+
+def time_runs(fn: Callable[[], object], repeat: int) -> List[float]:
+    """Seconds taken by each of ``repeat`` calls of ``fn``."""
+    seconds = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        seconds.append(time.perf_counter() - start)
+    return seconds
+
+
+def best_of(fn: Callable[[], object], repeat: int) -> float:
+    return min(time_runs(fn, repeat))
+
+
+def wrap(text: str, width: int = 64) -> str:
+    return "\r\n".join(textwrap.wrap(text, width))
+
+
+def c4_section(record: dict) -> str:
+    """One C4 dump section: header, wrapped body, then the labeled blocks."""
+    stats = record["stats"]
+    lines = [record["name"].upper(), ""]
+    lines += [wrap(paragraph) + "\r\n" for paragraph in record["description"].split("\n")]
+    lines += [
+        wrap(f"Personality: {record['personality']}"),
+        wrap(f"Physical Description: {record['physicalDescription']}"),
+        f"Homeworld: {record['homeworld']}.",
+        wrap(f"Languages: {record['languages']['native']}. {record['languages']['description']}"),
+        "Example Names: " + ", ".join(record["exampleNames"]) + ".",
+        wrap(f"Adventurers: {record['adventurers']}"),
+        "",
+        f"Attribute Dice: {stats['attributeDice']}",
+    ]
+    lines += [f"{attribute.upper()} {bounds['min']}/{bounds['max']}" for attribute, bounds in stats["attributes"].items()]
+    lines.append("Special Abilities:")
+    lines += [wrap(f"{ability['name']}: {ability['description']}") for ability in record["specialAbilities"]]
+    if record["storyFactors"]:
+        lines.append("Story Factors:")
+        lines += [wrap(f"{factor['name']}: {factor['description']}") for factor in record["storyFactors"]]
+    if stats["move"]:
+        lines.append(f"Move: {stats['move']}")
+    lines.append(f"Size: {stats['size']}")
+    return "\r\n".join(lines) + "\r\n"
+
+
+def render_c4(records: List[dict]) -> Iterator[str]:
+    yield "STAR WARS REUP\r\n\r\n"
+    for record in records:
+        yield "\r\n" + c4_section(record) + "\r\n"
+
+
+def species_wikitext(record: dict) -> str:
+    """A holocron species page laid out like the real dumps."""
+    stats = record["stats"]
+    parts = [
+        f"[[File:{slugify(record['name'])}.jpg|thumb|right|500px|A {record['name']}]]\n",
+        f"'''Species:''' {record['name']} <br />",
+        f"'''Home Planet:''' [[{record['homeworld']}]]<br />",
+        f"'''{record['name']}''' <br />",
+        record["description"].replace("\n", " <br />\n") + " <br />\n<br />",
+        f"'''Personality:''' {record['personality']} <br />",
+        f"'''Physical Description:''' {record['physicalDescription']} <br />",
+        f"'''Common {record['name']} Names:''' <br />",
+        *(f"*[[{example}]] " for example in record["exampleNames"]),
+        "<br />",
+        f"'''Attribute Dice''': {stats['attributeDice']}<br />"
+        + "".join(f"'''{attribute.upper()}''' {bounds['min']}/{bounds['max']}<br />" for attribute, bounds in stats["attributes"].items()),
+        "<br />",
+        "'''Special Abilities:'''<br />",
+        *(f"*'''{ability['name']}''': {ability['description']}" for ability in record["specialAbilities"]),
+        "",
+    ]
+    if record["storyFactors"]:
+        parts += ["'''Story Factors:'''<br />", *(f"*'''{factor['name']}''': {factor['description']}" for factor in record["storyFactors"]), ""]
+    parts += [
+        f"'''Move''': {stats['move'] or '10/12'}<br />",
+        f"'''Size''': {stats['size']}<br />",
+        f"'''Source''': {record['sources'][0]}",
+    ]
+    return "\n".join(parts)
+
+
+def starship_wikitext(rng: random.Random, name: str) -> str:
+    category, scale = rng.choice(SHIP_TYPES)
+    fields = [
+        ("Name", name),
+        ("Craft", f"{rng.choice(('Incom', 'Sienar', 'Kuat', 'Corellian'))} {name}"),
+        ("Affiliation", rng.choice(AFFILIATIONS)),
+        ("Era", rng.choice(EPOCHS)),
+        ("Type", f"{category.title()} {rng.choice(('Interceptor', 'Freighter', 'Cruiser', 'Patrol Craft'))}"),
+        ("Scale", scale),
+        ("Length", f"{rng.randint(8, 1600):,} meters"),
+        ("Skill", f"{'Capital ship piloting' if scale == 'Capital' else 'Starfighter Pilot'}: {name}"),
+        ("Crew", f"{rng.randint(1, 4000):,}"),
+        ("Crew Skill", f"Starfighter Pilot: {format_code(rng.randint(9, 18))}; Starship Gunnery: {format_code(rng.randint(9, 18))}"),
+        ("Passengers", str(rng.randint(0, 600))),
+        ("Cargo Capacity", f"{rng.randint(1, 900)} {rng.choice(('kg', 'metric tons'))}"),
+        ("Consumables", f"{rng.randint(1, 12)} {rng.choice(('days', 'weeks', 'months', 'years'))}"),
+        ("Cost", f"{rng.randint(50, 9000) * 1000:,} (new), {rng.randint(20, 4000) * 1000:,} (used)"),
+        ("Hyperdrive Multiplier", f"x{rng.choice((1, 1, 2, 3))}"),
+        ("Hyperdrive Backup", f"x{rng.choice((10, 12, 15))}"),
+        ("Nav Computer", rng.choice(("Yes", "No", "Yes (limited to 2 jumps)"))),
+        ("Maneuverability", format_code(rng.randint(0, 15))),
+        ("Space", str(rng.randint(2, 12))),
+        ("Atmosphere", f"{rng.randint(200, 500)}; {rng.randint(600, 1400):,} km/h"),
+        ("Hull", format_code(rng.randint(6, 20))),
+        ("Shields", format_code(rng.randint(0, 12))),
+    ]
+    body = "".join(f"'''{label}''': {value}<br />" for label, value in fields)
+    sensors = "\n".join(f"*{mode}: {rng.randint(10, 100)} / {format_code(rng.randint(0, 12))}" for mode in ("Passive", "Scan", "Search", "Focus"))
+    weapons = "\n".join(
+        f"*'''{rng.randint(1, 8)} {rng.choice(('Laser Cannons', 'Ion Cannons', 'Proton Torpedo Launchers', 'Turbolasers'))}''' (fire-linked)\n"
+        f": Fire Arc: front<br />Skill: starship gunnery<br />Fire Control: {format_code(rng.randint(3, 12))}<br />"
+        f"Space Range: 1-3/12/25<br />Atmosphere Range: 100-300/1.2/2.5km<br />Damage: {format_code(rng.randint(9, 27))}"
+        for _ in range(rng.randint(1, 3))
+    )
+    return (
+        f"[[File:{slugify(name)}.jpg|thumb|500px]]\n\n{body}'''Sensors'''\n{sensors}\n'''Weapons'''\n{weapons}\n\n"
+        f"'''Description''': {prose(rng, rng.randint(40, 120))}\n\n'''Source''':\n*{rng.choice(EPOCHS)} Sourcebook (page {rng.randint(1, 200)})"
+    )
+
+
+def synthetic_starships(count: int, seed: int) -> Iterator[Tuple[str, str]]:
+    """``(title, wikitext)`` starship pages, generated lazily."""
+    rng = random.Random(seed)
+    for title in [f"{name}-class" for name in unique_names(count, rng)]:
+        yield title, starship_wikitext(rng, title)
+
+
+def wiki_pages(pages: Iterable[Tuple[str, str]], first_id: int) -> Iterator[str]:
+    for offset, (title, wikitext) in enumerate(pages):
+        page = {"title": title, "pageId": first_id + offset, "revisionId": 40_000 + first_id + offset, "wikitext": wikitext}
+        yield json.dumps(page, ensure_ascii=False) + "\n"
+
+
+def write_images(directory: Path, count: int, seed: int) -> None:
+    """Noisy gradients: cheap to make, but not so flat that WebP encoding is trivially fast."""
+    try:
+        from PIL import Image
+    except ImportError:
+        raise SystemExit("Pillow is required for synthetic images. Install with: pip install pillow")
+    shutil.rmtree(directory, ignore_errors=True)
+    directory.mkdir(parents=True)
+    width, height = IMAGE_SIZE
+    for index in range(count):
+        rng = random.Random(seed * 1_000_003 + index)
+        noise = Image.frombytes("L", (width, height), rng.randbytes(width * height))
+        gradient = Image.linear_gradient("L").resize((width, height))
+        channels = [Image.blend(gradient.rotate(rng.choice((0, 90, 180, 270))), noise, rng.uniform(0.1, 0.4)) for _ in range(3)]
+        Image.merge("RGB", channels).save(directory / f"portrait-{index:05d}.png", optimize=False)
+
+
+def write_dataset(out_dir: Path, scale: int, seed: int, images: bool = True) -> Dataset:
+    """Generate (or reuse, when seed and scale match) the dataset in ``out_dir``."""
+    dataset = Dataset(
+        root=out_dir, scale=scale, seed=seed, species=BASE_SPECIES * scale, wiki_species=BASE_WIKI_SPECIES * scale,
+        starships=BASE_STARSHIPS * scale, images=BASE_IMAGES * scale if images else 0,
+    )
+    meta_path = out_dir / "dataset.json"
+    meta = {key: value for key, value in vars(dataset).items() if key != "root"}
+    if meta_path.exists() and json.loads(meta_path.read_text(encoding="utf-8")) == meta:
+        return dataset
+
+    records = synthetic_catalog(dataset.species, seed)
+    write_atomic(dataset.catalog, iter_document(records, wrapped=True))
+    write_atomic(dataset.c4, render_c4(records))
+
+    wiki_records = synthetic_catalog(dataset.wiki_species, seed + 1)
+    species_pages = ((record["name"], species_wikitext(record)) for record in wiki_records)
+    write_atomic(dataset.species_wikitext, wiki_pages(species_pages, 1))
+    ships = synthetic_starships(dataset.starships, seed)
+    write_atomic(dataset.starship_wikitext, wiki_pages(ships, 1 + dataset.wiki_species))
+
+    if dataset.images:
+        write_images(dataset.image_dir, dataset.images, seed)
+    write_atomic(meta_path, [json.dumps(meta, indent=2), "\n"])
+    return dataset
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scale", type=int, default=1, help="Multiplier over the real input sizes (1, 10, 100).")
+    parser.add_argument("--seed", type=int, default=24, help="Random seed.")
+    parser.add_argument("--out", type=Path, default=DEFAULT_OUT, help="Output directory (a scale-N subdirectory is created).")
+    parser.add_argument("--no-images", action="store_true", help="Skip the PNG portraits.")
+    args = parser.parse_args()
+
+    dataset = write_dataset(args.out / f"scale-{args.scale}", args.scale, args.seed, images=not args.no_images)
+    print(f"✅ {dataset.root}: {dataset.species} species, {dataset.wiki_species} species pages, "
+          f"{dataset.starships} starship pages, {dataset.images} images")
+
+
+if __name__ == "__main__":
+    main()